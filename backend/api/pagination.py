@@ -0,0 +1,53 @@
+"""StellarPulse - Keyset Pagination Helpers.
+
+List endpoints page newest-first on ``(created_at, id)``. The cursor is the
+sort key of the last row returned, so each page is one index range scan no
+matter how deep the client has paged. Cursors are returned in the
+``X-Next-Cursor`` response header; the body stays a plain list.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+
+CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor for the position after a row."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Sort key of a cursor; raises HTTP 400 if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(query, created_column, id_column, limit: int, cursor: Optional[str] = None,
+                response: Optional[Response] = None) -> List:
+    """One newest-first page of a query, setting the next cursor header if more rows exist."""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            created_column < created_at,
+            and_(created_column == created_at, id_column < row_id),
+        ))
+    rows = query.order_by(created_column.desc(), id_column.desc()).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if response is not None:
+            last = rows[-1]
+            response.headers[CURSOR_HEADER] = encode_cursor(
+                getattr(last, created_column.key), getattr(last, id_column.key)
+            )
+    return rows
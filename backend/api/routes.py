@@ -2,26 +2,52 @@
 
 import os
 import sys
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List, Optional
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from backend.database import get_db
 from backend import models, schemas
+from backend.api.pagination import keyset_page
+from backend.api.routes_archive import router as archive_router
+from backend.api.routes_events import router as events_router
 from backend.api.routes_monitors import router as monitors_router
+from backend.core.alerting.engine import get_alert_engine, validate_rule
+from backend.core.alerting.state import fingerprint, get_active_alerts
+from backend.core.events.broker import get_broker
+from backend.core.scheduler.executor import get_task_executor
+from backend.core.scheduler.fanout import target_output_limit, validate_targets
+from backend.core.scheduler.runner import get_task_runner
+from backend.core.scheduler.scheduler import get_task_scheduler, next_fire_time, validate_schedule
+from backend.core.scheduler.stats import record_run, task_series, task_stats, task_summary, window_start
+from backend.services.logstore import get_log_store
+from backend.services.notifier import get_notifier
 
 # Create main router
 router = APIRouter()
 
 # Include monitors router
 router.include_router(monitors_router, tags=["monitor"])
+router.include_router(archive_router, tags=["archive"])
+router.include_router(events_router, tags=["events"])
 
 
 # ==================== Alert Routes ====================
 
+def _check_rule(rule: models.AlertRule):
+    """Reject rules the alert engine cannot evaluate."""
+    try:
+        validate_rule(rule)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/alerts/rules", response_model=List[schemas.AlertRuleResponse])
 def get_alert_rules(db: Session = Depends(get_db)):
     """Get all alert rules."""
@@ -32,9 +58,11 @@ def get_alert_rules(db: Session = Depends(get_db)):
 def create_alert_rule(rule: schemas.AlertRuleCreate, db: Session = Depends(get_db)):
     """Create alert rule."""
     db_rule = models.AlertRule(**rule.model_dump())
+    _check_rule(db_rule)
     db.add(db_rule)
     db.commit()
     db.refresh(db_rule)
+    get_alert_engine().upsert(db_rule)
     return db_rule
 
 
@@ -56,9 +84,11 @@ def update_alert_rule(rule_id: int, rule: schemas.AlertRuleUpdate, db: Session =
 
     for key, value in rule.model_dump(exclude_unset=True).items():
         setattr(db_rule, key, value)
+    _check_rule(db_rule)
 
     db.commit()
     db.refresh(db_rule)
+    get_alert_engine().upsert(db_rule)
     return db_rule
 
 
@@ -71,16 +101,72 @@ def delete_alert_rule(rule_id: int, db: Session = Depends(get_db)):
 
     db.delete(db_rule)
     db.commit()
+    get_alert_engine().remove(rule_id)
     return {"message": "Rule deleted"}
 
 
+@router.get("/alerts/engine")
+def get_alert_engine_stats():
+    """Get rule index size, last evaluation timing, open alerts and notification counters."""
+    return {**get_alert_engine().stats(), "alerts": get_active_alerts().stats(),
+            "notifications": get_notifier().stats()}
+
+
+def _filter_alerts(query, status=None, severity=None, target_type=None, target_name=None,
+                   since=None, until=None):
+    """Apply the alert list filters to a query."""
+    for column, value in ((models.Alert.status, status),
+                          (models.Alert.severity, severity),
+                          (models.Alert.target_type, target_type),
+                          (models.Alert.target_name, target_name)):
+        if value:
+            query = query.filter(column == value)
+    if since:
+        query = query.filter(models.Alert.created_at >= since)
+    if until:
+        query = query.filter(models.Alert.created_at < until)
+    return query
+
+
+@router.get("/alerts/summary")
+def get_alerts_summary(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    """Get alert counts by status and severity without loading rows."""
+    query = _filter_alerts(
+        db.query(models.Alert.status, models.Alert.severity, func.count(models.Alert.id)),
+        since=since, until=until,
+    )
+    by_status: Dict[str, int] = {}
+    by_severity: Dict[str, int] = {}
+    matrix: Dict[str, Dict[str, int]] = {}
+    total = 0
+    for status, severity, count in query.group_by(models.Alert.status, models.Alert.severity):
+        total += count
+        by_status[status] = by_status.get(status, 0) + count
+        by_severity[severity] = by_severity.get(severity, 0) + count
+        matrix.setdefault(status, {})[severity] = count
+    return {"total": total, "by_status": by_status, "by_severity": by_severity, "by_status_severity": matrix}
+
+
 @router.get("/alerts", response_model=List[schemas.AlertResponse])
-def get_alerts(status: str = None, db: Session = Depends(get_db)):
-    """Get alerts."""
-    query = db.query(models.Alert)
-    if status:
-        query = query.filter(models.Alert.status == status)
-    return query.order_by(models.Alert.created_at.desc()).all()
+def get_alerts(
+    response: Response,
+    status: Optional[str] = None,
+    severity: Optional[str] = None,
+    target_type: Optional[str] = None,
+    target_name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get alerts newest first, one page at a time (next cursor in the X-Next-Cursor header)."""
+    query = _filter_alerts(db.query(models.Alert), status, severity, target_type, target_name, since, until)
+    return keyset_page(query, models.Alert.created_at, models.Alert.id, limit, cursor, response)
 
 
 @router.post("/alerts/{alert_id}/acknowledge")
@@ -90,32 +176,104 @@ def acknowledge_alert(alert_id: int, data: schemas.AlertAcknowledge, db: Session
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
 
-    alert.status = "acknowledged"
-    alert.acknowledged_by = data.acknowledged_by
-    alert.acknowledged_at = models.func.now()
-
+    # Conditional, so an alert resolved meanwhile by the engine is not reopened
+    now = datetime.utcnow()
+    updated = db.query(models.Alert).filter(
+        models.Alert.id == alert_id, models.Alert.status == "firing"
+    ).update({"status": "acknowledged", "acknowledged_by": data.acknowledged_by, "acknowledged_at": now},
+             synchronize_session=False)
     db.commit()
+    if not updated:
+        db.refresh(alert)
+        raise HTTPException(status_code=409, detail=f"Alert is {alert.status}, only firing alerts can be acknowledged")
+    db.refresh(alert)
+    fp = alert.fingerprint or fingerprint(alert.rule_id, alert.target_type, alert.target_name)
+    get_active_alerts().acknowledge(fp, alert.id)
+    get_broker().publish("alerts", "acknowledged", {
+        "id": alert.id,
+        "fingerprint": alert.fingerprint,
+        "acknowledged_by": alert.acknowledged_by,
+        "acknowledged_at": alert.acknowledged_at,
+    })
     return {"message": "Alert acknowledged"}
 
 
 # ==================== Task Routes ====================
 
+# Task fields that change when a task fires next
+SCHEDULE_FIELDS = {"schedule_type", "cron_expression", "interval_seconds", "enabled"}
+
+# Stored size and returned byte range of a run log response
+LOG_SIZE_HEADER = "X-Log-Size"
+LOG_RANGE_HEADER = "X-Log-Range"
+
+# Longest window of the run statistics endpoints, in hours
+MAX_STATS_HOURS = 24 * 366
+
+
 @router.get("/tasks", response_model=List[schemas.TaskResponse])
 def get_tasks(db: Session = Depends(get_db)):
     """Get all tasks."""
     return db.query(models.Task).all()
 
 
+def _check_targets(task: models.Task):
+    """Reject targets and fan-out settings the executor cannot use."""
+    try:
+        validate_targets(task)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _schedule(task: models.Task):
+    """Reject schedules the scheduler cannot evaluate and set the next fire time."""
+    try:
+        validate_schedule(task)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    task.next_run_at = next_fire_time(task, datetime.utcnow())
+
+
 @router.post("/tasks", response_model=schemas.TaskResponse)
 def create_task(task: schemas.TaskCreate, db: Session = Depends(get_db)):
     """Create task."""
     db_task = models.Task(**task.model_dump())
+    _check_targets(db_task)
+    _schedule(db_task)
     db.add(db_task)
     db.commit()
     db.refresh(db_task)
+    get_task_scheduler().upsert(db_task)
     return db_task
 
 
+@router.get("/tasks/queue")
+def get_task_queue_stats():
+    """Get run queue depth, worker usage and queue/run latency."""
+    stats = get_task_executor().stats()
+    pool = get_task_runner().python_pool
+    if pool is not None:
+        stats["python_pool"] = pool.stats()
+    return stats
+
+
+@router.get("/tasks/scheduler")
+def get_task_scheduler_stats():
+    """Get scheduled task count, next deadline and misfire counters."""
+    return get_task_scheduler().stats()
+
+
+@router.get("/tasks/stats")
+def get_tasks_stats(
+    hours: int = Query(24, ge=1, le=MAX_STATS_HOURS),
+    task_id: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """Get run counts, success rate and p50/p95 duration per task over the last hours, from rollups."""
+    since = window_start(hours)
+    return {"since": since.isoformat(), "hours": hours, "tasks": task_stats(db, since, task_id)}
+
+
 @router.get("/tasks/{task_id}", response_model=schemas.TaskResponse)
 def get_task(task_id: int, db: Session = Depends(get_db)):
     """Get task by ID."""
@@ -132,11 +290,16 @@ def update_task(task_id: int, task: schemas.TaskUpdate, db: Session = Depends(ge
     if not db_task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    for key, value in task.model_dump(exclude_unset=True).items():
+    changes = task.model_dump(exclude_unset=True)
+    for key, value in changes.items():
         setattr(db_task, key, value)
+    _check_targets(db_task)
+    if SCHEDULE_FIELDS.intersection(changes):
+        _schedule(db_task)
 
     db.commit()
     db.refresh(db_task)
+    get_task_scheduler().upsert(db_task)
     return db_task
 
 
@@ -148,7 +311,9 @@ def delete_task(task_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Task not found")
 
     db.delete(db_task)
+    db.query(models.TaskRunRollup).filter(models.TaskRunRollup.task_id == task_id).delete(synchronize_session=False)
     db.commit()
+    get_task_scheduler().remove(task_id)
     return {"message": "Task deleted"}
 
 
@@ -159,29 +324,180 @@ def run_task(task_id: int, db: Session = Depends(get_db)):
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    # Create task run record
+    # Create task run record; the executor picks it up from the queue
     task_run = models.TaskRun(
         task_id=task_id,
-        status="running",
+        status="pending",
         triggered_by="manual"
     )
     db.add(task_run)
     db.commit()
     db.refresh(task_run)
 
-    # TODO: Execute task asynchronously
+    executor = get_task_executor()
+    if not executor.submit(task_run.id, task_id, "manual"):
+        reason = "Run queue is full" if executor.running else "Task executor is not running"
+        task_run.status = "failed"
+        task_run.stderr = reason
+        task_run.finished_at = datetime.utcnow()
+        record_run(db, task_run)
+        db.commit()
+        raise HTTPException(status_code=503, detail=f"{reason}, try again later")
 
     return task_run
 
 
 @router.get("/tasks/{task_id}/runs", response_model=List[schemas.TaskRunResponse])
-def get_task_runs(task_id: int, db: Session = Depends(get_db)):
-    """Get task run history."""
-    runs = db.query(models.TaskRun).filter(
-        models.TaskRun.task_id == task_id
-    ).order_by(models.TaskRun.created_at.desc()).all()
-    return runs
+def get_task_runs(
+    task_id: int,
+    response: Response,
+    status: Optional[str] = None,
+    triggered_by: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get task run history newest first, one page at a time (next cursor in the X-Next-Cursor header)."""
+    query = db.query(models.TaskRun).filter(models.TaskRun.task_id == task_id)
+    for column, value in ((models.TaskRun.status, status), (models.TaskRun.triggered_by, triggered_by)):
+        if value:
+            query = query.filter(column == value)
+    if since:
+        query = query.filter(models.TaskRun.created_at >= since)
+    if until:
+        query = query.filter(models.TaskRun.created_at < until)
+    return keyset_page(query, models.TaskRun.created_at, models.TaskRun.id, limit, cursor, response)
+
+
+@router.get("/tasks/{task_id}/stats")
+def get_task_stats(
+    task_id: int,
+    hours: int = Query(24, ge=1, le=MAX_STATS_HOURS),
+    db: Session = Depends(get_db)
+):
+    """Get a task's run statistics over the last hours plus hourly run counts, from rollups."""
+    if db.query(models.Task.id).filter(models.Task.id == task_id).first() is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    since = window_start(hours)
+    return {**task_summary(db, task_id, since), "since": since.isoformat(), "hours": hours,
+            "series": task_series(db, task_id, since)}
+
+
+def _target_index(task_run: models.TaskRun, target: str, required: bool = True) -> Optional[int]:
+    """Position of a target in a run, which names its log streams."""
+    specs = [result["target"] for result in task_run.target_results or []]
+    if not specs and task_run.task is not None:
+        specs = list(task_run.task.targets or [])
+    if target in specs:
+        return specs.index(target)
+    if required:
+        raise HTTPException(status_code=404, detail="Target not found in this run")
+    return None
+
+
+@router.get("/tasks/runs/{run_id}", response_model=schemas.TaskRunDetailResponse)
+def get_task_run(run_id: int, db: Session = Depends(get_db)):
+    """Get one task run, including the status of each target of a multi-target run."""
+    task_run = db.query(models.TaskRun).filter(models.TaskRun.id == run_id).first()
+    if not task_run:
+        raise HTTPException(status_code=404, detail="Task run not found")
+    return task_run
+
 
+@router.get("/tasks/runs/{run_id}/output")
+async def get_task_run_output(
+    run_id: int,
+    stream: str = Query("stdout", pattern="^(stdout|stderr)$"),
+    offset: int = Query(0, ge=0),
+    wait: float = Query(0, ge=0, le=30),
+    target: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Output of a run (or of one target of a multi-target run) from a character offset, live while it is running.
+
+    With ``wait`` the request blocks up to that many seconds for new output,
+    so clients can follow a run by polling with the returned ``next_offset``.
+    """
+    sink = get_task_runner().get_output(run_id, target)
+    if sink is not None:
+        if wait:
+            await sink.wait(stream, offset, wait)
+        text = sink.read(stream, offset)
+        return {
+            "run_id": run_id,
+            "stream": stream,
+            "text": text,
+            "next_offset": offset + len(text),
+            "running": not sink.finished,
+            "truncated": sink.truncated_bytes > 0,
+        }
+
+    task_run = db.query(models.TaskRun).filter(models.TaskRun.id == run_id).first()
+    if not task_run:
+        raise HTTPException(status_code=404, detail="Task run not found")
+    running = task_run.status in ("pending", "running")
+    if target is None:
+        output = getattr(task_run, stream) or ""
+        truncated = "[output truncated:" in (task_run.stderr or "")
+    else:
+        # A finished target's output is in the run log; return as much as was kept live
+        index = _target_index(task_run, target, required=not running)
+        name = f"targets/{index}/{stream}"
+        store = get_log_store()
+        size = store.size(run_id, name) if index is not None else None
+        limit = target_output_limit()
+        output = b"".join(store.read(run_id, name, 0, limit)).decode("utf-8", errors="replace") if size else ""
+        truncated = (size or 0) > limit
+    text = output[offset:]
+    return {
+        "run_id": run_id,
+        "stream": stream,
+        "text": text,
+        "next_offset": offset + len(text),
+        "running": running,
+        "truncated": truncated,
+    }
+
+
+@router.get("/tasks/runs/{run_id}/log")
+def get_task_run_log(
+    run_id: int,
+    stream: str = Query("stdout", pattern="^(stdout|stderr)$"),
+    target: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    length: Optional[int] = Query(None, ge=1),
+    tail: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db)
+):
+    """Full output of a run as plain text: a byte range (offset/length) or the last ``tail`` bytes.
+
+    The log is read chunk by chunk as the response is sent, so any size can
+    be fetched; ``X-Log-Size`` and ``X-Log-Range`` give the stored size and
+    the bytes returned. Works while the run is still writing.
+    """
+    task_run = db.query(models.TaskRun).filter(models.TaskRun.id == run_id).first()
+    if not task_run:
+        raise HTTPException(status_code=404, detail="Task run not found")
+
+    name = stream if target is None else f"targets/{_target_index(task_run, target)}/{stream}"
+
+    store = get_log_store()
+    size = store.size(run_id, name)
+    legacy = None
+    if size is None:
+        # Runs from before the log store, or that failed before starting
+        legacy = (getattr(task_run, stream) or "").encode() if target is None else b""
+        size = len(legacy)
+
+    start = max(size - tail, 0) if tail is not None else min(offset, size)
+    end = size if length is None or tail is not None else min(start + length, size)
+    body = iter((legacy[start:end],)) if legacy is not None else store.read(run_id, name, start, end)
+    return StreamingResponse(body, media_type="text/plain; charset=utf-8", headers={
+        LOG_SIZE_HEADER: str(size),
+        LOG_RANGE_HEADER: f"{start}-{end}",
+    })
 
 # ==================== Knowledge Routes ====================
 
@@ -0,0 +1,50 @@
+"""StellarPulse - Archive API Routes."""
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from backend.services.retention import KEEP_STATUSES, MAX_QUERY_ROWS, get_retention, naive_utc
+
+router = APIRouter()
+
+
+@router.get("/archive")
+def get_archive_partitions():
+    """List archive files with retention settings and the last run."""
+    retention = get_retention()
+    return {
+        "horizons_days": retention.horizons,
+        "last_run": retention.last_run,
+        "partitions": retention.partitions(),
+    }
+
+
+@router.post("/archive/run")
+def run_retention():
+    """Archive expired rows now."""
+    return {"moved": get_retention().run_once()}
+
+
+@router.get("/archive/{table}")
+def query_archive(
+    table: str,
+    since: datetime,
+    until: datetime,
+    status: Optional[str] = None,
+    severity: Optional[str] = None,
+    target_type: Optional[str] = None,
+    target_name: Optional[str] = None,
+    task_id: Optional[int] = None,
+    limit: int = Query(1000, ge=1, le=MAX_QUERY_ROWS)
+):
+    """Query archived alerts or task runs created in [since, until)."""
+    if table not in KEEP_STATUSES:
+        raise HTTPException(status_code=404, detail=f"Unknown archive table: {table}")
+    since, until = naive_utc(since), naive_utc(until)
+    if until <= since:
+        raise HTTPException(status_code=400, detail="until must be after since")
+    filters = {"status": status, "severity": severity, "target_type": target_type,
+               "target_name": target_name, "task_id": task_id}
+    return get_retention().query(table, since, until, filters, limit)
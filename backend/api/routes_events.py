@@ -0,0 +1,63 @@
+"""StellarPulse - Live Event Stream Routes."""
+
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from backend.core.events.broker import TOPICS, get_broker
+
+router = APIRouter()
+
+# Comment frame sent when idle, keeping proxies from closing the stream
+HEARTBEAT_SECONDS = 15
+# Client reconnect delay announced to EventSource
+RETRY_MS = 3000
+
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    topics: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None)
+):
+    """Stream alert changes, Kubernetes object deltas and overviews as Server-Sent Events.
+
+    ``topics`` is a comma separated subset of alerts, k8s and overview.
+    """
+    selected = [t.strip() for t in topics.split(",") if t.strip()] if topics else list(TOPICS)
+    unknown = set(selected) - set(TOPICS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown topics: {', '.join(sorted(unknown))}")
+    try:
+        last_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_id = None
+
+    broker = get_broker()
+    sub = broker.subscribe(selected, last_id)
+
+    async def stream():
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            while True:
+                try:
+                    frame = await asyncio.wait_for(sub.queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"
+                    continue
+                yield frame
+        finally:
+            broker.unsubscribe(sub)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.get("/events/stats")
+def get_event_stats():
+    """Get subscriber counts and delivery figures."""
+    return get_broker().stats()
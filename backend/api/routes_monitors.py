@@ -1,9 +1,12 @@
 """StellarPulse - Monitor API Routes."""
 
-from fastapi import APIRouter, Query
-from typing import Optional
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import Dict, Optional
+from datetime import datetime, timezone
 import logging
+import time
+
+from backend.schemas import MetricsHistory
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -28,9 +31,9 @@ def _get_mock_pods():
 
 def _get_mock_services():
     return [
-        {"name": "kubernetes", "namespace": "default", "type": "ClusterIP", "cluster_ip": "10.96.0.1", "ports": [{"port": 443, "protocol": "TCP"}], "endpoints": 1},
-        {"name": "nginx-service", "namespace": "default", "type": "LoadBalancer", "cluster_ip": "10.96.100.50", "ports": [{"port": 80, "protocol": "TCP"}], "endpoints": 2},
-        {"name": "redis-service", "namespace": "default", "type": "ClusterIP", "cluster_ip": "10.96.100.51", "ports": [{"port": 6379, "protocol": "TCP"}], "endpoints": 1},
+        {"name": "kubernetes", "namespace": "default", "type": "ClusterIP", "cluster_ip": "10.96.0.1", "ports": [{"port": 443, "protocol": "TCP"}], "endpoints": 1, "ready_endpoints": 1, "not_ready_endpoints": 0},
+        {"name": "nginx-service", "namespace": "default", "type": "LoadBalancer", "cluster_ip": "10.96.100.50", "ports": [{"port": 80, "protocol": "TCP"}], "endpoints": 2, "ready_endpoints": 2, "not_ready_endpoints": 0},
+        {"name": "redis-service", "namespace": "default", "type": "ClusterIP", "cluster_ip": "10.96.100.51", "ports": [{"port": 6379, "protocol": "TCP"}], "endpoints": 1, "ready_endpoints": 1, "not_ready_endpoints": 0},
     ]
 
 
@@ -56,17 +59,46 @@ def _get_mock_overview():
     return {
         "cluster": {"nodes": 3, "pods": 156, "services": 42, "namespaces": 8},
         "resources": {"cpu_cores": 24, "memory_gb": 64},
-        "pods": {"running": 145, "pending": 8, "other": 3},
+        "usage": {"cpu_cores": 9.6, "memory_gb": 38.4, "cpu_percent": 40.0, "memory_percent": 60.0},
+        "pods": {"running": 145, "pending": 8, "other": 3, "by_phase": {"Running": 145, "Pending": 8, "Failed": 3}},
+        "namespaces": {},
         "timestamp": datetime.utcnow().isoformat()
     }
 
 
+def _get_collector(cluster: Optional[str]):
+    """Resolve the collector for a cluster name (the default cluster if None)."""
+    from backend.core.collector.kubernetes import get_k8s_collector
+    try:
+        return get_k8s_collector(cluster)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown cluster: {cluster}")
+
+
+def _get_cluster_name(cluster: Optional[str]) -> str:
+    """Resolve a cluster name (the default cluster if None)."""
+    from backend.core.collector.registry import get_collector_registry
+    registry = get_collector_registry()
+    if cluster is None:
+        return registry.default
+    if cluster not in registry.names():
+        raise HTTPException(status_code=404, detail=f"Unknown cluster: {cluster}")
+    return cluster
+
+
+@router.get("/metrics/clusters")
+async def get_clusters():
+    """List configured clusters."""
+    from backend.core.collector.registry import get_collector_registry
+    registry = get_collector_registry()
+    return [{"name": name, "default": name == registry.default} for name in registry.names()]
+
+
 @router.get("/metrics/nodes")
-async def get_nodes():
+async def get_nodes(cluster: Optional[str] = Query(None)):
     """Get node metrics."""
+    collector = _get_collector(cluster)
     try:
-        from backend.core.collector.kubernetes import get_k8s_collector
-        collector = get_k8s_collector()
         nodes = await collector.get_nodes()
         if not nodes or "error" in nodes[0]:
             logger.warning(f"K8s connection failed, using mock data: {nodes}")
@@ -78,25 +110,39 @@ async def get_nodes():
 
 
 @router.get("/metrics/pods")
-async def get_pods(namespace: Optional[str] = Query(None), limit: int = Query(100)):
-    """Get pod metrics."""
+async def get_pods(
+    response: Response,
+    namespace: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1),
+    continue_token: Optional[str] = Query(None, alias="continue"),
+    phase: Optional[str] = Query(None),
+    node: Optional[str] = Query(None),
+    label_selector: Optional[str] = Query(None),
+    cluster: Optional[str] = Query(None),
+):
+    """Get pod metrics, one page at a time (next cursor in the X-Continue header)."""
+    collector = _get_collector(cluster)
     try:
-        from backend.core.collector.kubernetes import get_k8s_collector
-        collector = get_k8s_collector()
-        pods = await collector.get_pods(namespace)
-        if not pods or "error" in pods[0]:
+        pods, next_token = await collector.get_pods_page(
+            namespace, limit, continue_token, phase=phase, node=node, label_selector=label_selector
+        )
+        # An empty page is a valid answer to a filter; only collector errors fall back to mock data
+        if pods and "error" in pods[0]:
             return _get_mock_pods()[:limit]
-        return pods[:limit]
+        if next_token:
+            response.headers["X-Continue"] = next_token
+        return pods
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception:
         return _get_mock_pods()[:limit]
 
 
 @router.get("/metrics/services")
-async def get_services(namespace: Optional[str] = Query(None)):
+async def get_services(namespace: Optional[str] = Query(None), cluster: Optional[str] = Query(None)):
     """Get service status."""
+    collector = _get_collector(cluster)
     try:
-        from backend.core.collector.kubernetes import get_k8s_collector
-        collector = get_k8s_collector()
         services = await collector.get_services(namespace)
         if not services or "error" in services[0]:
             return _get_mock_services()
@@ -106,11 +152,10 @@ async def get_services(namespace: Optional[str] = Query(None)):
 
 
 @router.get("/metrics/namespaces")
-async def get_namespaces():
+async def get_namespaces(cluster: Optional[str] = Query(None)):
     """Get namespaces."""
+    collector = _get_collector(cluster)
     try:
-        from backend.core.collector.kubernetes import get_k8s_collector
-        collector = get_k8s_collector()
         namespaces = await collector.get_namespaces()
         if not namespaces or "error" in namespaces[0]:
             return _get_mock_namespaces()
@@ -120,11 +165,10 @@ async def get_namespaces():
 
 
 @router.get("/metrics/deployments")
-async def get_deployments(namespace: Optional[str] = Query(None)):
+async def get_deployments(namespace: Optional[str] = Query(None), cluster: Optional[str] = Query(None)):
     """Get deployments."""
+    collector = _get_collector(cluster)
     try:
-        from backend.core.collector.kubernetes import get_k8s_collector
-        collector = get_k8s_collector()
         deployments = await collector.get_deployments(namespace)
         if not deployments or "error" in deployments[0]:
             return _get_mock_deployments()
@@ -134,26 +178,77 @@ async def get_deployments(namespace: Optional[str] = Query(None)):
 
 
 @router.get("/metrics/overview")
-async def get_overview():
+async def get_overview(cluster: Optional[str] = Query(None)):
     """Get cluster overview."""
+    collector = _get_collector(cluster)
     try:
-        from backend.core.collector.kubernetes import get_k8s_collector
-        collector = get_k8s_collector()
-        nodes = await collector.get_nodes()
-        pods = await collector.get_pods()
-        namespaces = await collector.get_namespaces()
-        services = await collector.get_services()
-        if not nodes or "error" in nodes[0]:
+        snapshot = await collector.get_snapshot()
+        if snapshot.failed:
             return _get_mock_overview()
-        total_cpu = sum(n.get("cpu_cores", 0) for n in nodes)
-        total_mem = sum(n.get("memory_bytes", 0) for n in nodes)
-        running_pods = len([p for p in pods if p.get("status") == "Running"])
-        pending_pods = len([p for p in pods if p.get("status") == "Pending"])
-        return {
-            "cluster": {"nodes": len(nodes), "pods": len(pods), "services": len(services), "namespaces": len(namespaces)},
-            "resources": {"cpu_cores": total_cpu, "memory_gb": round(total_mem / (1024**3), 2)},
-            "pods": {"running": running_pods, "pending": pending_pods, "other": len(pods) - running_pods - pending_pods},
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        return snapshot.overview()
     except Exception:
         return _get_mock_overview()
+
+
+@router.get("/metrics/fleet/overview")
+async def get_fleet_overview():
+    """Get an overview aggregated across all clusters, collected in parallel."""
+    from backend.core.collector.registry import get_collector_registry
+    from backend.core.collector.snapshot import fleet_overview
+    results = await get_collector_registry().collect(lambda collector: collector.get_snapshot())
+    return fleet_overview(results)
+
+
+def _utc_timestamp(value: datetime) -> float:
+    # Naive datetimes are UTC throughout the API
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _history_range(start: Optional[datetime], end: Optional[datetime]):
+    end_ts = _utc_timestamp(end) if end else time.time()
+    start_ts = _utc_timestamp(start) if start else end_ts - 3600
+    return start_ts, end_ts
+
+
+def _to_history(points) -> MetricsHistory:
+    timestamps, values = points
+    return MetricsHistory(timestamps=[datetime.utcfromtimestamp(ts) for ts in timestamps], values=values)
+
+
+@router.get("/metrics/history", response_model=MetricsHistory)
+async def get_metrics_history(
+    metric: str = Query(...),
+    target_type: str = Query("cluster"),
+    target_name: Optional[str] = Query(None),
+    cluster: Optional[str] = Query(None),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    resolution: str = Query("auto", pattern="^(auto|raw|1m|5m|1h)$"),
+    agg: str = Query("avg", pattern="^(avg|min|max)$"),
+):
+    """Get one metric series (pods are named namespace/name; clusters by cluster name)."""
+    from backend.core.tsdb.store import get_tsdb
+    cluster = _get_cluster_name(cluster)
+    start_ts, end_ts = _history_range(start, end)
+    key = (cluster, metric, target_type, target_name or cluster)
+    return _to_history(get_tsdb().query(key, start_ts, end_ts, resolution, agg))
+
+
+@router.get("/metrics/history/bulk", response_model=Dict[str, MetricsHistory])
+async def get_metrics_history_bulk(
+    metric: str = Query(...),
+    target_type: str = Query(...),
+    cluster: Optional[str] = Query(None),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    resolution: str = Query("auto", pattern="^(auto|raw|1m|5m|1h)$"),
+    agg: str = Query("avg", pattern="^(avg|min|max)$"),
+):
+    """Get one metric for every target of a type, keyed by target name."""
+    from backend.core.tsdb.store import get_tsdb
+    cluster = _get_cluster_name(cluster)
+    start_ts, end_ts = _history_range(start, end)
+    series = get_tsdb().query_many(cluster, metric, target_type, start_ts, end_ts, resolution, agg)
+    return {name: _to_history(points) for name, points in series.items()}
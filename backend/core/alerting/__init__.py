@@ -0,0 +1 @@
+"""Alerting Package."""
@@ -0,0 +1,394 @@
+"""StellarPulse - Alert Rule Evaluation Engine.
+
+Enabled rules are compiled into groups keyed by ``(metric_name,
+target_type, aggregation, window)``. Inside a group, rules are bucketed by
+condition and sorted by threshold, so evaluating a metric column against N
+rules costs one binary search per target instead of one comparison per rule
+and target. Windowed groups compare the column's sliding-window aggregate
+instead of the instantaneous value.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import timezone
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from backend.core.alerting.matcher import PatternMatcher, validate_pattern
+from backend.core.alerting.state import get_active_alerts
+from backend.core.alerting.window import AGGREGATIONS, WindowSet
+
+logger = logging.getLogger(__name__)
+
+CONDITIONS = ("gt", "gte", "lt", "lte", "eq")
+
+# Rule metric names that are shorthands for collector columns
+METRIC_ALIASES = {
+    "cpu": "cpu_percent",
+    "memory": "memory_percent",
+}
+
+# Phases counted as healthy for pod_status
+HEALTHY_POD_PHASES = ("Running", "Succeeded")
+
+
+def validate_rule(rule):
+    """Raise ValueError if an AlertRule cannot be evaluated."""
+    if rule.condition not in CONDITIONS:
+        raise ValueError(f"Unknown condition {rule.condition!r}")
+    aggregation = getattr(rule, "aggregation", None)
+    if aggregation and aggregation != "last":
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {aggregation!r}")
+        if not getattr(rule, "window_seconds", None) or rule.window_seconds <= 0:
+            raise ValueError(f"Aggregation {aggregation!r} needs a positive window_seconds")
+    if rule.target_name:
+        validate_pattern(rule.target_name)
+
+
+class CompiledRule:
+    """The fields of an AlertRule needed for evaluation."""
+    __slots__ = ("id", "name", "metric_name", "condition", "threshold", "target_type", "target_name",
+                 "severity", "channels", "aggregation", "window")
+
+    def __init__(self, rule):
+        self.id = rule.id
+        self.name = rule.name
+        self.metric_name = METRIC_ALIASES.get(rule.metric_name, rule.metric_name)
+        self.condition = rule.condition
+        self.threshold = float(rule.threshold)
+        self.target_type = rule.target_type or "pod"
+        self.target_name = rule.target_name or None
+        self.severity = rule.severity or "warning"
+        self.channels = list(rule.channels or [])
+        aggregation = getattr(rule, "aggregation", None)
+        # Instantaneous rules have no aggregation and a zero window
+        self.aggregation = aggregation if aggregation in AGGREGATIONS else None
+        self.window = int(rule.window_seconds) if self.aggregation else 0
+
+    @property
+    def key(self) -> Tuple[str, str, Optional[str], int]:
+        return self.metric_name, self.target_type, self.aggregation, self.window
+
+    @property
+    def expression(self) -> str:
+        """Human readable condition, e.g. ``avg(cpu_percent)[300s] gt 80``."""
+        metric = f"{self.aggregation}({self.metric_name})[{self.window}s]" if self.aggregation else self.metric_name
+        return f"{metric} {self.condition} {self.threshold:g}"
+
+
+class Firing:
+    """One (rule, target) pair whose condition holds."""
+    __slots__ = ("rule", "target_type", "target_name", "value")
+
+    def __init__(self, rule: CompiledRule, target_type: str, target_name: str, value: float):
+        self.rule = rule
+        self.target_type = target_type
+        self.target_name = target_name
+        self.value = value
+
+
+class _ThresholdIndex:
+    """Rules of one condition sorted by threshold."""
+    __slots__ = ("thresholds", "rules")
+
+    def __init__(self, rules: List[CompiledRule]):
+        rules = sorted(rules, key=lambda r: r.threshold)
+        self.thresholds = [r.threshold for r in rules]
+        self.rules = rules
+
+    def matching(self, condition: str, value: float) -> Sequence[CompiledRule]:
+        """Rules whose ``value <condition> threshold`` holds."""
+        if condition == "gt":
+            return self.rules[:bisect_left(self.thresholds, value)]
+        if condition == "gte":
+            return self.rules[:bisect_right(self.thresholds, value)]
+        if condition == "lt":
+            return self.rules[bisect_right(self.thresholds, value):]
+        if condition == "lte":
+            return self.rules[bisect_left(self.thresholds, value):]
+        return self.rules[bisect_left(self.thresholds, value):bisect_right(self.thresholds, value)]
+
+
+class RuleGroup:
+    """Rules sharing (metric_name, target_type, aggregation, window), compiled for batch evaluation."""
+
+    def __init__(self, key: Tuple[str, str, Optional[str], int]):
+        self.key = key
+        self.rules: Dict[int, CompiledRule] = {}
+        self._compiled = None
+
+    def add(self, rule: CompiledRule):
+        self.rules[rule.id] = rule
+        self._compiled = None
+
+    def remove(self, rule_id: int):
+        self.rules.pop(rule_id, None)
+        self._compiled = None
+
+    def compiled(self):
+        """Immutable evaluation structures, rebuilt after the rule set changes."""
+        return self._compiled or self._compile()
+
+    def _compile(self):
+        # Rules without a target apply to every row; targeted rules are found by
+        # matching each row name against all target patterns at once
+        untargeted: Dict[str, List[CompiledRule]] = {}
+        targeted: Dict[str, Dict[str, List[CompiledRule]]] = {}
+        for rule in self.rules.values():
+            if rule.target_name:
+                targeted.setdefault(rule.target_name, {}).setdefault(rule.condition, []).append(rule)
+            else:
+                untargeted.setdefault(rule.condition, []).append(rule)
+        matcher = None
+        if targeted:
+            matcher = PatternMatcher({
+                pattern: {cond: _ThresholdIndex(rules) for cond, rules in by_cond.items()}
+                for pattern, by_cond in targeted.items()
+            })
+        self._compiled = ({cond: _ThresholdIndex(rules) for cond, rules in untargeted.items()}, matcher)
+        return self._compiled
+
+    @staticmethod
+    def evaluate(compiled, names: Sequence[str], values: Sequence[float], target_type: str) -> List[Firing]:
+        """Evaluate a group's compiled rules against one metric column."""
+        untargeted, matcher = compiled
+        firing: List[Firing] = []
+
+        for condition, index in untargeted.items():
+            for name, value in zip(names, values):
+                for rule in index.matching(condition, value):
+                    firing.append(Firing(rule, target_type, name, value))
+
+        if matcher is not None:
+            for name, value in zip(names, values):
+                for by_cond in matcher.match(name):
+                    for condition, index in by_cond.items():
+                        for rule in index.matching(condition, value):
+                            firing.append(Firing(rule, target_type, name, value))
+        return firing
+
+
+# ==================== Metric Columns ====================
+
+def pod_target_names(pods) -> List[str]:
+    """Pod target names (``namespace/name``) in column order."""
+    namespaces = pods.namespaces.values
+    return [f"{namespaces[code]}/{name}" for name, code in zip(pods.names, pods.namespace)]
+
+
+def metric_column(snapshot, cluster: str, metric_name: str, target_type: str,
+                  pod_names: Optional[List[str]] = None) -> Optional[Tuple[Sequence[str], Sequence[float]]]:
+    """(target names, values) for one metric of a snapshot, or None if unknown.
+
+    Pods are named ``namespace/name``; the cluster target is the cluster name.
+    """
+    if target_type == "node":
+        nodes = snapshot.nodes
+        if metric_name == "node_status":
+            ready = nodes.statuses.lookup("Ready")
+            return nodes.names, [0.0 if code == ready else 1.0 for code in nodes.status]
+        if metric_name in ("cpu_percent", "memory_percent", "cpu_usage", "memory_usage"):
+            return nodes.names, getattr(nodes, metric_name)
+        return None
+
+    if target_type == "pod":
+        pods = snapshot.pods
+        names = pod_names if pod_names is not None else pod_target_names(pods)
+        if metric_name == "pod_status":
+            healthy = {pods.phases.lookup(phase) for phase in HEALTHY_POD_PHASES}
+            return names, [0.0 if code in healthy else 1.0 for code in pods.phase]
+        if metric_name in ("cpu_percent", "memory_percent", "cpu_usage", "memory_usage", "restarts"):
+            return names, getattr(pods, metric_name)
+        return None
+
+    if target_type == "cluster":
+        overview = snapshot.overview()
+        values = {
+            "cpu_percent": overview["usage"]["cpu_percent"],
+            "memory_percent": overview["usage"]["memory_percent"],
+            "nodes": overview["cluster"]["nodes"],
+            "pods": overview["cluster"]["pods"],
+            "pods_running": overview["pods"]["running"],
+            "pods_pending": overview["pods"]["pending"],
+        }
+        if metric_name in values:
+            return [cluster], [float(values[metric_name])]
+    return None
+
+
+# ==================== Engine ====================
+
+class AlertEngine:
+    """Compiled index of enabled alert rules, evaluated against collector snapshots."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._groups: Dict[Tuple[str, str, Optional[str], int], RuleGroup] = {}
+        self._rule_keys: Dict[int, Tuple[str, str, Optional[str], int]] = {}
+        # (metric_name, target_type, window) -> sliding windows, kept across recompiles
+        self._windows: Dict[Tuple[str, str, int], WindowSet] = {}
+        self._evaluate_lock = threading.Lock()
+        self.last_firing: List[Firing] = []
+        self.last_evaluated_at: Optional[float] = None
+        self.last_duration: float = 0.0
+
+    # ==================== Rule Index ====================
+
+    def load(self, rules):
+        """Replace the index with the given AlertRule rows."""
+        with self._lock:
+            self._groups.clear()
+            self._rule_keys.clear()
+            for rule in rules:
+                self._add(rule)
+
+    def load_from_db(self):
+        """Compile all rules stored in the database."""
+        from backend.database import SessionLocal
+        from backend import models
+
+        db = SessionLocal()
+        try:
+            self.load(db.query(models.AlertRule).filter(models.AlertRule.enabled == True).all())
+        finally:
+            db.close()
+        logger.info(f"Alert engine loaded {len(self._rule_keys)} rules")
+
+    def upsert(self, rule):
+        """Recompile one created or updated rule; only its groups are touched."""
+        with self._lock:
+            self._remove(rule.id)
+            self._add(rule)
+
+    def remove(self, rule_id: int):
+        """Drop a deleted rule from the index."""
+        with self._lock:
+            self._remove(rule_id)
+
+    def _add(self, rule):
+        if not rule.enabled:
+            return
+        try:
+            validate_rule(rule)
+        except ValueError as e:
+            logger.warning(f"Alert rule {rule.id} skipped: {e}")
+            return
+        compiled = CompiledRule(rule)
+        group = self._groups.get(compiled.key)
+        if group is None:
+            group = self._groups[compiled.key] = RuleGroup(compiled.key)
+        group.add(compiled)
+        self._rule_keys[compiled.id] = compiled.key
+
+    def _remove(self, rule_id: int):
+        key = self._rule_keys.pop(rule_id, None)
+        if key is None:
+            return
+        group = self._groups[key]
+        group.remove(rule_id)
+        if not group.rules:
+            del self._groups[key]
+
+    # ==================== Evaluation ====================
+
+    def evaluate(self, snapshot, cluster: str) -> List[Firing]:
+        """Evaluate every rule group against the snapshot's metric columns."""
+        with self._evaluate_lock:
+            return self._evaluate(snapshot, cluster)
+
+    def _evaluate(self, snapshot, cluster: str) -> List[Firing]:
+        started = time.perf_counter()
+        with self._lock:
+            groups = [(group.key, group.compiled()) for group in self._groups.values()]
+
+        ts = snapshot.taken_at.replace(tzinfo=timezone.utc).timestamp()
+        firing: List[Firing] = []
+        pod_names = None
+        windows: Dict[Tuple[str, str, int], WindowSet] = {}
+        for (metric_name, target_type, aggregation, window), compiled in groups:
+            if target_type == "pod" and pod_names is None:
+                pod_names = pod_target_names(snapshot.pods)
+            column = metric_column(snapshot, cluster, metric_name, target_type, pod_names)
+            if column is None:
+                continue
+            names, values = column
+            if aggregation:
+                # Groups with the same metric and window share one sample per cycle
+                window_key = (metric_name, target_type, window)
+                window_set = windows.get(window_key)
+                if window_set is None:
+                    window_set = self._windows.get(window_key)
+                    if window_set is None:
+                        window_set = WindowSet(window)
+                    windows[window_key] = window_set
+                    window_set.update(names, values, ts)
+                names, values = window_set.column(aggregation)
+            firing.extend(RuleGroup.evaluate(compiled, names, values, target_type))
+
+        # Windows no rule reads any more are released
+        self._windows = windows
+        self.last_firing = firing
+        self.last_evaluated_at = time.time()
+        self.last_duration = time.perf_counter() - started
+        return firing
+
+    def on_snapshot(self, cluster: str, snapshot):
+        """Scraper listener: evaluate the default cluster's snapshots and record transitions."""
+        from backend.core.collector.registry import get_collector_registry
+        if cluster != get_collector_registry().default:
+            return
+        # A failed collection must not resolve every open alert
+        if snapshot.failed:
+            return
+        opened, resolved = get_active_alerts().reconcile(self.evaluate(snapshot, cluster))
+        if opened or resolved:
+            self._notify(opened, resolved)
+
+    def rule(self, rule_id: int) -> Optional[CompiledRule]:
+        """The compiled rule with this id, if it is enabled."""
+        with self._lock:
+            key = self._rule_keys.get(rule_id)
+            return self._groups[key].rules.get(rule_id) if key is not None else None
+
+    def _notify(self, opened, resolved):
+        from backend.core.events.broker import get_broker
+        from backend.services.notifier import Notification, get_notifier
+
+        notifier = get_notifier()
+        broker = get_broker()
+        for kind, alerts in (("firing", opened), ("resolved", resolved)):
+            for alert in alerts:
+                broker.publish("alerts", kind, alert.to_dict())
+                rule = self.rule(alert.rule_id)
+                if rule is None or not rule.channels:
+                    continue
+                notifier.submit(Notification(kind, rule.name, alert.severity, alert.target_type,
+                                             alert.target_name, alert.value, rule.id, rule.channels))
+
+    def stats(self) -> dict:
+        """Index size and last evaluation figures."""
+        with self._lock:
+            groups = len(self._groups)
+            rules = len(self._rule_keys)
+        return {
+            "rules": rules,
+            "groups": groups,
+            "firing": len(self.last_firing),
+            "window_series": sum(len(window_set) for window_set in self._windows.values()),
+            "last_evaluated_at": self.last_evaluated_at,
+            "last_duration_ms": round(self.last_duration * 1000, 3),
+        }
+
+
+# Global engine instance
+_alert_engine = None
+
+
+def get_alert_engine() -> AlertEngine:
+    """Get alert engine instance."""
+    global _alert_engine
+    if _alert_engine is None:
+        _alert_engine = AlertEngine()
+    return _alert_engine
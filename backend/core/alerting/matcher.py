@@ -0,0 +1,166 @@
+"""StellarPulse - Target Name Pattern Matching.
+
+``AlertRule.target_name`` is an exact name, a glob (``default/api-*``) or a
+regular expression prefixed with ``re:``. All patterns of a rule group are
+compiled into one matcher:
+
+- exact names: a dict lookup
+- globs that are a literal prefix plus a trailing ``*``: a character trie
+- every other glob and regex: one merged regex of optional lookaheads,
+  where each pattern sets its own named group when it matches
+
+so a target name is checked against every pattern in a single pass, and the
+result is cached per name for the lifetime of the matcher.
+"""
+
+from fnmatch import translate
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+REGEX_PREFIX = "re:"
+
+GLOB_CHARS = "*?["
+
+# Target names remembered per matcher before the cache is reset
+CACHE_SIZE = 65536
+
+# Numbered backreferences would point at the merged regex's groups
+_BACKREF_RE = re.compile(r"\\[1-9]")
+
+
+def pattern_regex(pattern: str) -> Optional[str]:
+    """Regex source for a glob or ``re:`` pattern, None for a plain name."""
+    if pattern.startswith(REGEX_PREFIX):
+        return pattern[len(REGEX_PREFIX):]
+    if any(char in pattern for char in GLOB_CHARS):
+        return translate(pattern)
+    return None
+
+
+def validate_pattern(pattern: str):
+    """Raise ValueError if a target pattern cannot be compiled."""
+    source = pattern_regex(pattern)
+    if source is None:
+        return
+    try:
+        re.compile(source)
+    except re.error as e:
+        raise ValueError(f"Invalid target pattern {pattern!r}: {e}")
+
+
+def _literal_prefix(pattern: str) -> Optional[str]:
+    """The prefix of a ``prefix*`` glob, or None for any other pattern."""
+    if pattern.startswith(REGEX_PREFIX) or not pattern.endswith("*"):
+        return None
+    prefix = pattern[:-1]
+    if any(char in prefix for char in GLOB_CHARS):
+        return None
+    return prefix
+
+
+class _TrieNode:
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.values: list = []
+
+
+class PatternMatcher:
+    """Maps target names to the values of every pattern they match.
+
+    ``patterns`` maps each pattern to an opaque value (e.g. the rules that
+    use it); ``match`` returns the values of all matching patterns.
+    Invalid patterns must be filtered out beforehand with validate_pattern.
+    """
+
+    def __init__(self, patterns: Dict[str, Any]):
+        self._exact: Dict[str, Any] = {}
+        self._trie = _TrieNode()
+        self._has_prefixes = False
+        self._merged = None
+        self._merged_values: Dict[str, Any] = {}
+        self._separate: List[Tuple[re.Pattern, Any]] = []
+        self._cache: Dict[str, Tuple[Any, ...]] = {}
+
+        alternatives = []
+        sources: Dict[str, str] = {}
+        for pattern, value in patterns.items():
+            prefix = _literal_prefix(pattern)
+            if prefix is not None:
+                self._add_prefix(prefix, value)
+                continue
+            source = pattern_regex(pattern)
+            if source is None:
+                self._exact[pattern] = value
+                continue
+            group = f"_{len(alternatives)}"
+            alternative = f"(?:(?=(?P<{group}>(?:{source}))\\Z))?"
+            if _BACKREF_RE.search(source) or not self._compiles(alternative):
+                # Inline global flags, backreferences etc. cannot be merged
+                self._separate.append((re.compile(source), value))
+                continue
+            alternatives.append(alternative)
+            sources[group] = source
+            self._merged_values[group] = value
+
+        if alternatives:
+            try:
+                self._merged = re.compile("".join(alternatives))
+            except re.error:
+                # e.g. a user regex defining one of our group names
+                self._separate.extend((re.compile(pattern_source), self._merged_values[group])
+                                      for group, pattern_source in sources.items())
+
+    @staticmethod
+    def _compiles(source: str) -> bool:
+        try:
+            re.compile(source)
+        except re.error:
+            return False
+        return True
+
+    def _add_prefix(self, prefix: str, value: Any):
+        node = self._trie
+        for char in prefix:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+        node.values.append(value)
+        self._has_prefixes = True
+
+    def match(self, name: str) -> Tuple[Any, ...]:
+        """Values of every pattern matching the name."""
+        cached = self._cache.get(name)
+        if cached is not None:
+            return cached
+
+        values = []
+        exact = self._exact.get(name)
+        if exact is not None:
+            values.append(exact)
+
+        if self._has_prefixes:
+            node = self._trie
+            values.extend(node.values)
+            for char in name:
+                node = node.children.get(char)
+                if node is None:
+                    break
+                values.extend(node.values)
+
+        if self._merged is not None:
+            # Only our own groups: user regexes may name groups of their own
+            match = self._merged.match(name)
+            values.extend(value for group, value in self._merged_values.items() if match.group(group) is not None)
+
+        for regex, value in self._separate:
+            if regex.fullmatch(name):
+                values.append(value)
+
+        result = tuple(values)
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache.clear()
+        self._cache[name] = result
+        return result
@@ -0,0 +1,200 @@
+"""StellarPulse - Active Alert Index.
+
+Alerts are deduplicated by fingerprint (rule id + target type + target
+name). The open (firing or acknowledged) alerts are held in memory, rebuilt
+from the database on startup, so an evaluation cycle only touches the
+database when an alert starts or stops firing, and then with a single
+transaction for all transitions of the cycle.
+"""
+
+from datetime import datetime
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Alert statuses that are still open
+ACTIVE_STATUSES = ("firing", "acknowledged")
+
+
+def fingerprint(rule_id: int, target_type: Optional[str], target_name: Optional[str]) -> str:
+    """Stable deduplication key of one rule/target pair."""
+    key = f"{rule_id}\x1f{target_type or ''}\x1f{target_name or ''}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+class ActiveAlert:
+    """In-memory view of one open alert row."""
+    __slots__ = ("id", "fingerprint", "rule_id", "target_type", "target_name", "severity", "value", "since",
+                 "status")
+
+    def __init__(self, id: int, fingerprint: str, rule_id: int, target_type: str, target_name: str,
+                 severity: str, value: float, since: datetime, status: str = "firing"):
+        self.id = id
+        self.fingerprint = fingerprint
+        self.rule_id = rule_id
+        self.target_type = target_type
+        self.target_name = target_name
+        self.severity = severity
+        self.value = value
+        self.since = since
+        self.status = status
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "fingerprint": self.fingerprint,
+            "rule_id": self.rule_id,
+            "target_type": self.target_type,
+            "target_name": self.target_name,
+            "severity": self.severity,
+            "value": self.value,
+            "since": self.since,
+            "status": self.status,
+        }
+
+
+class ActiveAlertIndex:
+    """Fingerprint -> open alert, reconciled against each cycle's firing set."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active: Dict[str, ActiveAlert] = {}
+        self.writes = 0
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    def get(self, fp: str) -> Optional[ActiveAlert]:
+        return self._active.get(fp)
+
+    def load_from_db(self):
+        """Rebuild the index from the open alert rows."""
+        from backend.database import SessionLocal
+        from backend import models
+
+        db = SessionLocal()
+        try:
+            rows = db.query(models.Alert).filter(models.Alert.status.in_(ACTIVE_STATUSES)).all()
+            active = {}
+            for row in rows:
+                fp = row.fingerprint or fingerprint(row.rule_id, row.target_type, row.target_name)
+                if fp in active:
+                    # Duplicates from before fingerprinting; keep the newest open row
+                    if active[fp].id > row.id:
+                        continue
+                active[fp] = ActiveAlert(row.id, fp, row.rule_id, row.target_type, row.target_name,
+                                         row.severity, row.value, row.created_at, row.status)
+        finally:
+            db.close()
+
+        with self._lock:
+            self._active = active
+        logger.info(f"Active alert index loaded {len(active)} alerts")
+
+    def acknowledge(self, fp: str, alert_id: int):
+        """Mark an open alert acknowledged after its row was updated."""
+        with self._lock:
+            alert = self._active.get(fp)
+            if alert is not None and alert.id == alert_id:
+                alert.status = "acknowledged"
+
+    def reconcile(self, firing) -> Tuple[List[ActiveAlert], List[ActiveAlert]]:
+        """Apply one evaluation cycle's firings; returns (opened, resolved).
+
+        New fingerprints are inserted and vanished ones resolved in a single
+        transaction. If the write fails nothing changes in memory, so the
+        same transitions are retried on the next cycle.
+        """
+        with self._lock:
+            current = {}
+            for item in firing:
+                fp = fingerprint(item.rule.id, item.target_type, item.target_name)
+                current[fp] = item
+
+            opened = [(fp, item) for fp, item in current.items() if fp not in self._active]
+            resolved = [alert for fp, alert in self._active.items() if fp not in current]
+
+            # Steady state: only refresh the last seen values in memory
+            for fp, item in current.items():
+                alert = self._active.get(fp)
+                if alert is not None:
+                    alert.value = item.value
+
+            if not opened and not resolved:
+                return [], []
+
+            now = datetime.utcnow()
+            new_alerts = self._write(opened, resolved, now)
+            if new_alerts is None:
+                return [], []
+
+            for alert in new_alerts:
+                self._active[alert.fingerprint] = alert
+            for alert in resolved:
+                del self._active[alert.fingerprint]
+            self.writes += 1
+            return new_alerts, resolved
+
+    def _write(self, opened, resolved: List[ActiveAlert], now: datetime) -> Optional[List[ActiveAlert]]:
+        from backend.database import SessionLocal
+        from backend import models
+
+        db = SessionLocal()
+        try:
+            rows = []
+            for fp, item in opened:
+                rule = item.rule
+                rows.append(models.Alert(
+                    rule_id=rule.id,
+                    status="firing",
+                    title=rule.name,
+                    message=f"{rule.expression} on {item.target_type} {item.target_name}: {item.value:g}",
+                    severity=rule.severity,
+                    value=item.value,
+                    target_type=item.target_type,
+                    target_name=item.target_name,
+                    fingerprint=fp,
+                    created_at=now,
+                ))
+            db.add_all(rows)
+            db.flush()
+            new_alerts = [ActiveAlert(row.id, row.fingerprint, row.rule_id, row.target_type, row.target_name,
+                                      row.severity, row.value, now) for row in rows]
+            if resolved:
+                db.query(models.Alert).filter(
+                    models.Alert.id.in_([alert.id for alert in resolved])
+                ).update({"status": "resolved", "resolved_at": now}, synchronize_session=False)
+            db.commit()
+            return new_alerts
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to write alert transitions: {e}")
+            return None
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        """Open alert count and number of write transactions so far."""
+        with self._lock:
+            by_severity: Dict[str, int] = {}
+            acknowledged = 0
+            for alert in self._active.values():
+                by_severity[alert.severity] = by_severity.get(alert.severity, 0) + 1
+                acknowledged += alert.status == "acknowledged"
+            return {"active": len(self._active), "acknowledged": acknowledged, "by_severity": by_severity,
+                    "writes": self.writes}
+
+
+# Global index instance
+_active_alerts = None
+
+
+def get_active_alerts() -> ActiveAlertIndex:
+    """Get active alert index instance."""
+    global _active_alerts
+    if _active_alerts is None:
+        _active_alerts = ActiveAlertIndex()
+    return _active_alerts
@@ -0,0 +1,107 @@
+"""StellarPulse - Sliding-Window Aggregation.
+
+Windowed rule conditions (``avg(cpu_percent)[5m] > 80``) are evaluated from
+per-series state updated once per sample instead of rescanning history:
+
+- avg: running sum and count, adjusted as samples enter and leave
+- min / max: monotonic deques, amortized O(1) per sample
+- delta / rate: first and last sample still inside the window
+
+Each series only holds the samples of its window, and series whose target
+disappears from a snapshot are dropped, so memory follows the active
+targets.
+"""
+
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+AGGREGATIONS = ("avg", "min", "max", "delta", "rate")
+
+
+class SlidingWindow:
+    """Samples of one series within the last ``window`` seconds."""
+    __slots__ = ("window", "samples", "total", "mins", "maxs")
+
+    def __init__(self, window: float):
+        self.window = window
+        self.samples: Deque[Tuple[float, float]] = deque()
+        self.total = 0.0
+        # Candidates for the window min/max, values increasing / decreasing
+        self.mins: Deque[Tuple[float, float]] = deque()
+        self.maxs: Deque[Tuple[float, float]] = deque()
+
+    def add(self, ts: float, value: float):
+        self.samples.append((ts, value))
+        self.total += value
+        while self.mins and self.mins[-1][1] >= value:
+            self.mins.pop()
+        self.mins.append((ts, value))
+        while self.maxs and self.maxs[-1][1] <= value:
+            self.maxs.pop()
+        self.maxs.append((ts, value))
+        self._expire(ts - self.window)
+
+    def _expire(self, start: float):
+        samples = self.samples
+        while samples and samples[0][0] < start:
+            ts, value = samples.popleft()
+            self.total -= value
+            if self.mins[0][0] == ts:
+                self.mins.popleft()
+            if self.maxs[0][0] == ts:
+                self.maxs.popleft()
+
+    def value(self, aggregation: str) -> Optional[float]:
+        """Aggregate over the window; None until there are enough samples."""
+        samples = self.samples
+        if not samples:
+            return None
+        if aggregation == "avg":
+            return self.total / len(samples)
+        if aggregation == "min":
+            return self.mins[0][1]
+        if aggregation == "max":
+            return self.maxs[0][1]
+        if len(samples) < 2:
+            return None
+        (first_ts, first), (last_ts, last) = samples[0], samples[-1]
+        if aggregation == "delta":
+            return last - first
+        # rate: per-second change
+        return (last - first) / (last_ts - first_ts) if last_ts > first_ts else None
+
+
+class WindowSet:
+    """Sliding windows of one (metric, target type, window) for every target."""
+
+    def __init__(self, window: float):
+        self.window = window
+        self.series: Dict[str, SlidingWindow] = {}
+        self.names: List[str] = []
+
+    def update(self, names: Sequence[str], values: Sequence[float], ts: float):
+        """Add one sample per target; targets missing from this update are dropped."""
+        previous = self.series
+        series: Dict[str, SlidingWindow] = {}
+        for name, value in zip(names, values):
+            window = previous.get(name)
+            if window is None:
+                window = SlidingWindow(self.window)
+            window.add(ts, float(value))
+            series[name] = window
+        self.series = series
+        self.names = list(series)
+
+    def column(self, aggregation: str) -> Tuple[List[str], List[float]]:
+        """(target names, aggregated values), skipping targets without a value yet."""
+        names: List[str] = []
+        values: List[float] = []
+        for name in self.names:
+            value = self.series[name].value(aggregation)
+            if value is not None:
+                names.append(name)
+                values.append(value)
+        return names, values
+
+    def __len__(self) -> int:
+        return len(self.series)
@@ -0,0 +1,289 @@
+"""StellarPulse - Compact Pod/Node Storage.
+
+Collected pods and nodes are kept as ``__slots__`` records with interned
+namespace/node/phase strings, and snapshots pack them into array-backed
+columns for filtering and aggregation. JSON dicts are only built at the
+response edge via ``to_dict``.
+"""
+
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    if value is None:
+        return 0.0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _datetime(ts: float) -> Optional[datetime]:
+    return datetime.fromtimestamp(ts, timezone.utc) if ts else None
+
+
+def ratio_percent(numerator: array, denominator: array, scale: float = 1.0) -> array:
+    """Element-wise ``100 * numerator / (denominator * scale)``, 0 where the denominator is 0."""
+    factor = 100.0 / scale
+    return array("d", [n * factor / d if d else 0.0 for n, d in zip(numerator, denominator)])
+
+
+# ==================== Records ====================
+
+class PodRecord:
+    """One collected pod."""
+    __slots__ = ("name", "namespace", "status", "node", "ip", "restarts", "created",
+                 "cpu_request", "memory_request")
+
+    def __init__(self, name: str, namespace: str, status: str, node: Optional[str], ip: Optional[str],
+                 restarts: int, created: float, cpu_request: int, memory_request: int):
+        self.name = name
+        self.namespace = _intern(namespace)
+        self.status = _intern(status)
+        self.node = _intern(node)
+        self.ip = ip
+        self.restarts = restarts
+        self.created = created
+        self.cpu_request = cpu_request  # millicores
+        self.memory_request = memory_request  # bytes
+
+    @classmethod
+    def from_pod(cls, pod, parse_cpu, parse_memory) -> "PodRecord":
+        """Build a record from a V1Pod."""
+        cpu_request = 0
+        memory_request = 0
+        for container in pod.spec.containers or []:
+            requests = (container.resources.requests if container.resources else None) or {}
+            cpu_request += parse_cpu(requests.get("cpu"))
+            memory_request += parse_memory(requests.get("memory"))
+        return cls(
+            name=pod.metadata.name,
+            namespace=pod.metadata.namespace,
+            status=pod.status.phase,
+            node=pod.spec.node_name,
+            ip=pod.status.pod_ip,
+            restarts=sum(c.restart_count for c in pod.status.container_statuses or []),
+            created=_timestamp(pod.metadata.creation_timestamp),
+            cpu_request=cpu_request,
+            memory_request=memory_request,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "namespace": self.namespace,
+            "status": self.status,
+            "node": self.node,
+            "ip": self.ip,
+            "restarts": self.restarts,
+            "cpu_request_millicores": self.cpu_request,
+            "memory_request_bytes": self.memory_request,
+            "created_at": _datetime(self.created),
+        }
+
+
+class NodeRecord:
+    """One collected node."""
+    __slots__ = ("name", "status", "cpu_cores", "memory_bytes", "alloc_cpu_cores", "alloc_memory_bytes")
+
+    def __init__(self, name: str, status: str, cpu_cores: float, memory_bytes: int,
+                 alloc_cpu_cores: float, alloc_memory_bytes: int):
+        self.name = name
+        self.status = _intern(status)
+        self.cpu_cores = cpu_cores
+        self.memory_bytes = memory_bytes
+        self.alloc_cpu_cores = alloc_cpu_cores
+        self.alloc_memory_bytes = alloc_memory_bytes
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "status": self.status,
+            "cpu_cores": self.cpu_cores,
+            "memory_bytes": self.memory_bytes,
+            "allocatable": {
+                "cpu_cores": self.alloc_cpu_cores,
+                "memory_bytes": self.alloc_memory_bytes,
+            }
+        }
+
+
+# ==================== Columns ====================
+
+class StringTable:
+    """Dictionary encoding for a low-cardinality string column."""
+    __slots__ = ("values", "_codes")
+
+    def __init__(self):
+        self.values: List[Optional[str]] = []
+        self._codes: Dict[Optional[str], int] = {}
+
+    def encode(self, value: Optional[str]) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: Optional[str]) -> Optional[int]:
+        return self._codes.get(value)
+
+
+class PodColumns:
+    """Column-oriented pod table for one snapshot."""
+
+    def __init__(self, records: Iterable[PodRecord] = ()):
+        self.namespaces = StringTable()
+        self.nodes = StringTable()
+        self.phases = StringTable()
+
+        self.names: List[str] = []
+        self.namespace = array("I")
+        self.node = array("I")
+        self.phase = array("I")
+        self.restarts = array("l")
+        self.created = array("d")
+        self.cpu_request = array("q")
+        self.memory_request = array("q")
+
+        for record in records:
+            self.names.append(record.name)
+            self.namespace.append(self.namespaces.encode(record.namespace))
+            self.node.append(self.nodes.encode(record.node))
+            self.phase.append(self.phases.encode(record.status))
+            self.restarts.append(record.restarts)
+            self.created.append(record.created)
+            self.cpu_request.append(record.cpu_request)
+            self.memory_request.append(record.memory_request)
+
+        # Usage from the metrics API, filled by attach_usage
+        self.cpu_usage = array("q", bytes(8 * len(self.names)))
+        self.memory_usage = array("q", bytes(8 * len(self.names)))
+        self.cpu_percent = array("d", bytes(8 * len(self.names)))
+        self.memory_percent = array("d", bytes(8 * len(self.names)))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def attach_usage(self, usage: Dict[Tuple[str, str], Tuple[int, int]]):
+        """Join (cpu millicores, memory bytes) usage keyed by (namespace, name).
+
+        Percentages are relative to the pod's summed container requests.
+        """
+        namespaces = self.namespaces.values
+        missing = (0, 0)
+        cpu_usage = array("q")
+        memory_usage = array("q")
+        for name, ns_code in zip(self.names, self.namespace):
+            cpu, memory = usage.get((namespaces[ns_code], name), missing)
+            cpu_usage.append(cpu)
+            memory_usage.append(memory)
+        self.cpu_usage = cpu_usage
+        self.memory_usage = memory_usage
+        self.cpu_percent = ratio_percent(cpu_usage, self.cpu_request)
+        self.memory_percent = ratio_percent(memory_usage, self.memory_request)
+
+    def usage_row(self, i: int) -> dict:
+        """Usage fields of one row in response shape."""
+        return {
+            "cpu_usage_millicores": self.cpu_usage[i],
+            "memory_usage_bytes": self.memory_usage[i],
+            "cpu_percent": round(self.cpu_percent[i], 2),
+            "memory_percent": round(self.memory_percent[i], 2),
+        }
+
+    def select(self, namespace: str = None, phase: str = None, node: str = None) -> List[int]:
+        """Row indices matching all given values."""
+        conditions = []
+        for column, table, value in ((self.namespace, self.namespaces, namespace),
+                                     (self.phase, self.phases, phase),
+                                     (self.node, self.nodes, node)):
+            if value is None:
+                continue
+            code = table.lookup(value)
+            if code is None:
+                return []
+            conditions.append((column, code))
+
+        rows = range(len(self.names))
+        for column, code in conditions:
+            rows = [i for i in rows if column[i] == code]
+        return list(rows)
+
+    def count_by(self, column: str) -> Dict[Optional[str], int]:
+        """Row counts per distinct value of namespace, node or phase."""
+        codes = {"namespace": (self.namespace, self.namespaces),
+                 "node": (self.node, self.nodes),
+                 "phase": (self.phase, self.phases)}
+        values, table = codes[column]
+        return {table.values[code]: count for code, count in Counter(values).items()}
+
+    def total(self, column: str, rows: Optional[List[int]] = None) -> float:
+        """Sum of a numeric column, optionally over selected rows only."""
+        values = getattr(self, column)
+        if rows is None:
+            return sum(values)
+        return sum(values[i] for i in rows)
+
+
+class NodeColumns:
+    """Column-oriented node table for one snapshot."""
+
+    def __init__(self, records: Iterable[NodeRecord] = ()):
+        self.statuses = StringTable()
+
+        self.names: List[str] = []
+        self.status = array("I")
+        self.cpu_cores = array("d")
+        self.memory_bytes = array("q")
+        self.alloc_cpu_cores = array("d")
+        self.alloc_memory_bytes = array("q")
+
+        for record in records:
+            self.names.append(record.name)
+            self.status.append(self.statuses.encode(record.status))
+            self.cpu_cores.append(record.cpu_cores)
+            self.memory_bytes.append(record.memory_bytes)
+            self.alloc_cpu_cores.append(record.alloc_cpu_cores)
+            self.alloc_memory_bytes.append(record.alloc_memory_bytes)
+
+        # Usage from the metrics API, filled by attach_usage
+        self.cpu_usage = array("q", bytes(8 * len(self.names)))
+        self.memory_usage = array("q", bytes(8 * len(self.names)))
+        self.cpu_percent = array("d", bytes(8 * len(self.names)))
+        self.memory_percent = array("d", bytes(8 * len(self.names)))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def attach_usage(self, usage: Dict[str, Tuple[int, int]]):
+        """Join (cpu millicores, memory bytes) usage keyed by node name.
+
+        Percentages are relative to allocatable capacity.
+        """
+        missing = (0, 0)
+        rows = [usage.get(name, missing) for name in self.names]
+        self.cpu_usage = array("q", [cpu for cpu, _ in rows])
+        self.memory_usage = array("q", [memory for _, memory in rows])
+        self.cpu_percent = ratio_percent(self.cpu_usage, self.alloc_cpu_cores, scale=1000)
+        self.memory_percent = ratio_percent(self.memory_usage, self.alloc_memory_bytes)
+
+    def usage_row(self, i: int) -> dict:
+        """Usage fields of one row in response shape."""
+        return {
+            "cpu_usage_millicores": self.cpu_usage[i],
+            "memory_usage_bytes": self.memory_usage[i],
+            "cpu_percent": round(self.cpu_percent[i], 2),
+            "memory_percent": round(self.memory_percent[i], 2),
+        }
+
+    def total(self, column: str) -> float:
+        """Sum of a numeric column."""
+        return sum(getattr(self, column))
@@ -0,0 +1,194 @@
+"""StellarPulse - Kubernetes Informer Cache."""
+
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import itertools
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Watch requests are re-issued after this many seconds so a silently dropped
+# connection never leaves the store stale for long.
+WATCH_TIMEOUT_SECONDS = 300
+MAX_BACKOFF_SECONDS = 30
+
+
+class ResourceInformer:
+    """List-then-watch cache for one Kubernetes resource kind.
+
+    One initial ``list_*`` call fills the store, then a long-running watch
+    applies ADDED/MODIFIED/DELETED events starting from the list's
+    resourceVersion. A 410 Gone (expired resourceVersion) triggers a relist.
+    Records are whatever ``convert`` returns for an API object and are keyed
+    by ``(namespace, name)``.
+
+    Listeners registered with ``add_listener`` are called from the watch
+    thread as ``listener(event_type, key, record)`` after each applied event
+    (``record`` is None for DELETED), and with ``("RELISTED", None, None)``
+    whenever the store is replaced by a full list.
+    """
+
+    def __init__(self, name: str, list_func: Callable, convert: Callable, **list_kwargs):
+        self.name = name
+        self._list_func = list_func
+        self._convert = convert
+        self._list_kwargs = list_kwargs
+
+        self._lock = threading.RLock()
+        self._store: Dict[Tuple[Optional[str], str], dict] = {}
+        self._by_namespace: Dict[Optional[str], Dict[Tuple[Optional[str], str], dict]] = {}
+
+        self.resource_version: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self._synced = threading.Event()
+        self._stop = threading.Event()
+        self._watch = None
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable] = []
+
+    # ==================== Lifecycle ====================
+
+    def start(self):
+        """Start the background list/watch thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"informer-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching; the store keeps its last contents."""
+        self._stop.set()
+        if self._watch is not None:
+            self._watch.stop()
+
+    def add_listener(self, listener: Callable):
+        """Register a change listener."""
+        self._listeners.append(listener)
+
+    def _notify(self, event_type: str, key, record):
+        for listener in self._listeners:
+            try:
+                listener(event_type, key, record)
+            except Exception as e:
+                logger.warning(f"Informer {self.name} listener failed: {e}")
+
+    @property
+    def has_synced(self) -> bool:
+        """Whether the initial list has been loaded."""
+        return self._synced.is_set()
+
+    def wait_for_sync(self, timeout: float) -> bool:
+        """Block until the initial list has been loaded."""
+        return self._synced.wait(timeout)
+
+    # ==================== Store Access ====================
+
+    def items(self, namespace: Optional[str] = None, limit: Optional[int] = None, offset: int = 0,
+              predicate: Optional[Callable[[dict], bool]] = None) -> List[dict]:
+        """Return cached records, optionally for one namespace and matching predicate."""
+        with self._lock:
+            source = self._store if namespace is None else self._by_namespace.get(namespace, {})
+            values: Iterator[dict] = iter(source.values())
+            if predicate is not None:
+                values = filter(predicate, values)
+            if offset or limit is not None:
+                values = itertools.islice(values, offset, None if limit is None else offset + limit)
+            return list(values)
+
+    def get(self, namespace: Optional[str], name: str) -> Optional[dict]:
+        """Return one cached record."""
+        with self._lock:
+            return self._store.get((namespace, name))
+
+    def count(self, namespace: Optional[str] = None) -> int:
+        """Number of cached records."""
+        with self._lock:
+            if namespace is None:
+                return len(self._store)
+            return len(self._by_namespace.get(namespace, {}))
+
+    # ==================== List / Watch ====================
+
+    def _run(self):
+        backoff = 1
+        while not self._stop.is_set():
+            try:
+                if self.resource_version is None:
+                    self._relist()
+                self._watch_once()
+                backoff = 1
+            except Exception as e:
+                if getattr(e, "status", None) == 410:
+                    logger.info(f"Informer {self.name}: resourceVersion expired, relisting")
+                    self.resource_version = None
+                    continue
+                self.last_error = str(e)
+                logger.warning(f"Informer {self.name} failed, retrying in {backoff}s: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+
+    def _relist(self):
+        result = self._list_func(**self._list_kwargs)
+        store = {}
+        by_namespace: Dict[Optional[str], dict] = {}
+        for obj in result.items:
+            key = self._key(obj)
+            record = self._convert(obj)
+            store[key] = record
+            by_namespace.setdefault(key[0], {})[key] = record
+
+        with self._lock:
+            self._store = store
+            self._by_namespace = by_namespace
+        self.resource_version = result.metadata.resource_version
+        self.last_error = None
+        self._synced.set()
+        logger.info(f"Informer {self.name}: listed {len(store)} objects at rv={self.resource_version}")
+        self._notify("RELISTED", None, None)
+
+    def _watch_once(self):
+        from kubernetes import watch
+
+        self._watch = watch.Watch()
+        try:
+            for event in self._watch.stream(
+                self._list_func,
+                resource_version=self.resource_version,
+                timeout_seconds=WATCH_TIMEOUT_SECONDS,
+                allow_watch_bookmarks=True,
+                **self._list_kwargs,
+            ):
+                if self._stop.is_set():
+                    break
+                self._apply(event["type"], event["object"])
+                if self._watch.resource_version:
+                    self.resource_version = self._watch.resource_version
+        finally:
+            self._watch = None
+
+    def _apply(self, event_type: str, obj):
+        if event_type == "BOOKMARK":
+            return
+        key = self._key(obj)
+        record = None
+        with self._lock:
+            if event_type == "DELETED":
+                self._store.pop(key, None)
+                bucket = self._by_namespace.get(key[0])
+                if bucket is not None:
+                    bucket.pop(key, None)
+                    if not bucket:
+                        del self._by_namespace[key[0]]
+            else:
+                record = self._convert(obj)
+                self._store[key] = record
+                self._by_namespace.setdefault(key[0], {})[key] = record
+        if self._listeners:
+            self._notify(event_type, key, record)
+
+    @staticmethod
+    def _key(obj) -> Tuple[Optional[str], str]:
+        return obj.metadata.namespace, obj.metadata.name
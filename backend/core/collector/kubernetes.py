@@ -1,137 +1,377 @@
 """StellarPulse - Kubernetes Collector."""
 
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import asyncio
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import functools
 import logging
 import os
+import threading
+import time
+
+from backend.core.collector.columnar import NodeColumns, NodeRecord, PodColumns, PodRecord
+from backend.core.collector.informer import ResourceInformer
+from backend.core.collector.quantity import (
+    millicores_to_cores, parse_bytes, parse_bytes_column, parse_cpu, parse_cpu_column
+)
+from backend.core.collector.snapshot import ClusterSnapshot
+from backend.core.events.broker import get_broker
 
 logger = logging.getLogger(__name__)
 
+# Seconds a request waits for an informer's initial list
+INFORMER_SYNC_TIMEOUT = 30
+
+# Prefix of pod page cursors served from the informer store
+CACHE_CURSOR_PREFIX = "cache:"
+
+# Seconds a collected snapshot is shared between requests
+SNAPSHOT_TTL = 5
+
+# Concurrent blocking API calls per collector
+DEFAULT_MAX_WORKERS = 8
+
+# Resource kinds that can hold a long-running watch connection
+INFORMER_KINDS = 6
+
 
 class KubernetesCollector:
     """Kubernetes metrics collector."""
 
-    def __init__(self, kubeconfig_path: Optional[str] = None):
+    def __init__(self, kubeconfig_path: Optional[str] = None, use_informers: Optional[bool] = None,
+                 max_workers: Optional[int] = None, context: Optional[str] = None, cluster: Optional[str] = None):
         # Default to ~/.kube/config
         self.kubeconfig_path = kubeconfig_path or os.path.expanduser("~/.kube/config")
+        self.context = context
+        self.cluster = cluster or context or "default"
         self._client = None
+        self._client_lock = threading.Lock()
+        self.core_v1 = None
+        self.apps_v1 = None
+
+        # Blocking client calls run here instead of on the event loop
+        self.max_workers = max_workers or int(os.environ.get("STELLAR_K8S_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="k8s-collector")
+
+        # Informer mode: serve reads from a watch-maintained cache
+        if use_informers is None:
+            use_informers = os.environ.get("STELLAR_K8S_INFORMERS", "1").lower() not in ("0", "false", "no")
+        self.use_informers = use_informers
+        self._informers: Dict[str, ResourceInformer] = {}
+
+        # metrics.k8s.io usage per kind: (monotonic time, usage map)
+        self._usage: Dict[str, Tuple[float, Dict]] = {}
+        self.metrics_available: Optional[bool] = None
+
+        # Most recent overview snapshot and the collection producing the next one
+        self._snapshot: Optional[ClusterSnapshot] = None
+        self._snapshot_task: Optional[asyncio.Future] = None
+
+    async def _run(self, func: Callable, *args, **kwargs):
+        """Run a blocking call on the collector's bounded executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
 
     async def _get_client(self):
-        """Get Kubernetes client."""
+        """Get the shared Kubernetes API client."""
         if self._client is None:
+            await self._run(self._load_client)
+        return self._client
+
+    def _load_client(self):
+        """Load kube config and build one pooled ApiClient with its API groups."""
+        with self._client_lock:
+            if self._client is not None:
+                return
             try:
                 from kubernetes import client, config
-                # Try to load kubeconfig
-                try:
-                    logger.info(f"Loading kubeconfig from: {self.kubeconfig_path}")
-                    config.load_kube_config(config_file=self.kubeconfig_path)
-                    logger.info("Kubeconfig loaded successfully")
-                except Exception as e:
-                    logger.warning(f"Failed to load kubeconfig: {e}")
-                    # Try in-cluster config
-                    try:
-                        logger.info("Trying in-cluster config")
-                        config.load_incluster_config()
-                        logger.info("In-cluster config loaded successfully")
-                    except Exception as e2:
-                        logger.warning(f"Failed to load in-cluster config: {e2}")
-                        raise RuntimeError(f"Cannot connect to Kubernetes: kubeconfig={e}, incluster={e2}")
-                self._client = client
             except ImportError:
                 raise RuntimeError("kubernetes client not installed: pip install kubernetes")
-        return self._client
+
+            configuration = client.Configuration()
+            # Try to load kubeconfig
+            try:
+                logger.info(f"Loading kubeconfig from: {self.kubeconfig_path} (context={self.context})")
+                config.load_kube_config(config_file=self.kubeconfig_path, context=self.context,
+                                        client_configuration=configuration)
+                logger.info("Kubeconfig loaded successfully")
+            except Exception as e:
+                logger.warning(f"Failed to load kubeconfig: {e}")
+                # Try in-cluster config
+                try:
+                    logger.info("Trying in-cluster config")
+                    config.load_incluster_config(client_configuration=configuration)
+                    logger.info("In-cluster config loaded successfully")
+                except Exception as e2:
+                    logger.warning(f"Failed to load in-cluster config: {e2}")
+                    raise RuntimeError(f"Cannot connect to Kubernetes: kubeconfig={e}, incluster={e2}")
+
+            # Every executor worker and informer watch may hold a connection at once
+            configuration.connection_pool_maxsize = self.max_workers + INFORMER_KINDS
+            api_client = client.ApiClient(configuration)
+            self.core_v1 = client.CoreV1Api(api_client)
+            self.apps_v1 = client.AppsV1Api(api_client)
+            self._client = api_client
+
+    def close(self):
+        """Stop informers and release the executor and connection pool."""
+        self.stop_informers()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    # ==================== Informers ====================
+
+    async def _get_informer(self, kind: str) -> ResourceInformer:
+        """Get the synced informer for a resource kind, starting it on first use."""
+        informer = self._informers.get(kind)
+        if informer is None:
+            await self._get_client()
+            v1, apps_v1 = self.core_v1, self.apps_v1
+            list_funcs = {
+                "nodes": (v1.list_node, self._node_to_record),
+                "pods": (v1.list_pod_for_all_namespaces, self._pod_to_record),
+                "services": (v1.list_service_for_all_namespaces, self._service_to_dict),
+                "endpoints": (v1.list_endpoints_for_all_namespaces, self._endpoints_to_dict),
+                "namespaces": (v1.list_namespace, self._namespace_to_dict),
+                "deployments": (apps_v1.list_deployment_for_all_namespaces, self._deployment_to_dict),
+            }
+            list_func, convert = list_funcs[kind]
+            created = ResourceInformer(kind, list_func, convert)
+            informer = self._informers.setdefault(kind, created)
+            # Concurrent first requests all get here; only the one that stored its informer starts it
+            if informer is created:
+                informer.add_listener(functools.partial(self._publish_delta, kind))
+                informer.start()
+
+        if not informer.has_synced:
+            synced = await asyncio.to_thread(informer.wait_for_sync, INFORMER_SYNC_TIMEOUT)
+            if not synced:
+                raise RuntimeError(f"{kind} informer not synced: {informer.last_error or 'timeout'}")
+        return informer
+
+    def _publish_delta(self, kind: str, event_type: str, key, record):
+        """Informer listener: push object changes to live subscribers."""
+        broker = get_broker()
+        if not broker.has_subscribers("k8s"):
+            return
+        data = {"cluster": self.cluster, "kind": kind}
+        if event_type == "RELISTED":
+            broker.publish("k8s", "relisted", data)
+            return
+        data["namespace"], data["name"] = key
+        if record is not None:
+            data["object"] = self._present(record)
+        broker.publish("k8s", event_type.lower(), data)
+
+    def stop_informers(self):
+        """Stop all running watches."""
+        for informer in self._informers.values():
+            informer.stop()
+        self._informers.clear()
+
+    async def _list(self, kind: str, namespace: str = None, limit: int = None) -> List[dict]:
+        """List resources in their response shape."""
+        return [self._present(r) for r in await self._list_records(kind, namespace, limit)]
+
+    async def _list_records(self, kind: str, namespace: str = None, limit: int = None) -> list:
+        """List converted records, from the informer store when enabled."""
+        if self.use_informers:
+            informer = await self._get_informer(kind)
+            return informer.items(namespace, limit)
+
+        await self._get_client()
+        v1, apps_v1 = self.core_v1, self.apps_v1
+        converters = {
+            "nodes": (v1.list_node, None, self._node_to_record),
+            "pods": (v1.list_pod_for_all_namespaces, v1.list_namespaced_pod, self._pod_to_record),
+            "services": (v1.list_service_for_all_namespaces, v1.list_namespaced_service, self._service_to_dict),
+            "endpoints": (v1.list_endpoints_for_all_namespaces, v1.list_namespaced_endpoints,
+                          self._endpoints_to_dict),
+            "namespaces": (v1.list_namespace, None, self._namespace_to_dict),
+            "deployments": (apps_v1.list_deployment_for_all_namespaces, apps_v1.list_namespaced_deployment,
+                            self._deployment_to_dict),
+        }
+        list_all, list_namespaced, convert = converters[kind]
+
+        def fetch():
+            items = list_namespaced(namespace).items if namespace and list_namespaced else list_all().items
+            if limit is not None:
+                items = items[:limit]
+            return [convert(item) for item in items]
+
+        # Both the request and the model conversion stay off the event loop
+        return await self._run(fetch)
+
+    def _present(self, record) -> dict:
+        """Build the response dict for a stored record, adding time-dependent fields."""
+        if isinstance(record, (PodRecord, NodeRecord)):
+            record = record.to_dict()
+        if "created_at" not in record:
+            return record
+        return {**record, "age": self._get_age(record["created_at"])}
+
+    # ==================== Collection ====================
 
     async def get_nodes(self) -> List[dict]:
         """Get node metrics."""
         try:
-            client = await self._get_client()
-            v1 = client.CoreV1Api()
-            nodes = v1.list_node()
-
-            result = []
-            for node in nodes.items:
-                # Get CPU and memory
-                cpu = node.status.capacity.get('cpu', '0')
-                mem = node.status.capacity.get('memory', '0')
-                alloc_cpu = node.status.allocatable.get('cpu', '0')
-                alloc_mem = node.status.allocatable.get('memory', '0')
-
-                # Calculate percentages (simplified)
-                try:
-                    cpu_cores = int(cpu)
-                    alloc_cpu_cores = int(alloc_cpu)
-                except:
-                    cpu_cores = 1
-                    alloc_cpu_cores = 1
-
-                result.append({
-                    "name": node.metadata.name,
-                    "status": node.status.conditions[-1].type if node.status.conditions else "Unknown",
-                    "cpu_cores": cpu_cores,
-                    "memory_bytes": self._parse_memory(mem),
-                    "allocatable": {
-                        "cpu_cores": alloc_cpu_cores,
-                        "memory_bytes": self._parse_memory(alloc_mem),
-                    }
-                })
-            return result
+            return await self._present_with_usage("nodes", await self._list_records("nodes"))
         except Exception as e:
             return [{"error": str(e), "mock": True}]
 
-    async def get_pods(self, namespace: str = None) -> List[dict]:
+    async def get_pods(self, namespace: str = None, limit: int = None) -> List[dict]:
         """Get pod metrics."""
         try:
-            client = await self._get_client()
-            v1 = client.CoreV1Api()
+            return await self._present_with_usage("pods", await self._list_records("pods", namespace, limit))
+        except Exception as e:
+            return [{"error": str(e), "mock": True}]
 
-            if namespace:
-                pods = v1.list_namespaced_pod(namespace)
-            else:
-                pods = v1.list_pod_for_all_namespaces()
+    async def get_pods_page(self, namespace: str = None, limit: int = 100, continue_token: str = None,
+                            phase: str = None, node: str = None,
+                            label_selector: str = None) -> Tuple[List[dict], Optional[str]]:
+        """Get one page of pods and the cursor for the next page.
 
-            result = []
-            for pod in pods.items:
-                result.append({
-                    "name": pod.metadata.name,
-                    "namespace": pod.metadata.namespace,
-                    "status": pod.status.phase,
-                    "node": pod.spec.node_name,
-                    "ip": pod.status.pod_ip,
-                    "restarts": sum(c.restart_count for c in pod.status.container_statuses or []),
-                    "age": self._get_age(pod.metadata.creation_timestamp),
-                })
-            return result
+        Raises ValueError for a cursor that cannot continue this query.
+        """
+        cache_cursor = continue_token is not None and continue_token.startswith(CACHE_CURSOR_PREFIX)
+        if cache_cursor:
+            # Informer records carry no labels, so selector queries page on the API server
+            if label_selector or not self.use_informers:
+                raise ValueError("Cursor belongs to a cached pod listing; restart paging without it")
+            if not continue_token[len(CACHE_CURSOR_PREFIX):].isdigit():
+                raise ValueError(f"Invalid continue token: {continue_token}")
+        try:
+            if self.use_informers and (continue_token is None or cache_cursor) and not label_selector:
+                return await self._get_cached_pods_page(namespace, limit, continue_token, phase, node)
+
+            # Paging and filtering happen on the API server
+            kwargs = {"limit": limit}
+            if continue_token:
+                kwargs["_continue"] = continue_token
+            field_selector = ",".join(
+                f"{field}={value}" for field, value in (("status.phase", phase), ("spec.nodeName", node)) if value
+            )
+            if field_selector:
+                kwargs["field_selector"] = field_selector
+            if label_selector:
+                kwargs["label_selector"] = label_selector
+
+            await self._get_client()
+            v1 = self.core_v1
+
+            def fetch():
+                if namespace:
+                    pods = v1.list_namespaced_pod(namespace, **kwargs)
+                else:
+                    pods = v1.list_pod_for_all_namespaces(**kwargs)
+                return [self._pod_to_record(pod) for pod in pods.items], pods.metadata._continue or None
+
+            records, next_token = await self._run(fetch)
+            return await self._present_with_usage("pods", records), next_token
         except Exception as e:
-            return [{"error": str(e), "mock": True}]
+            return [{"error": str(e), "mock": True}], None
+
+    async def _get_cached_pods_page(self, namespace: Optional[str], limit: int, continue_token: Optional[str],
+                                    phase: Optional[str], node: Optional[str]) -> Tuple[List[dict], Optional[str]]:
+        """Page through the pod informer store; the cursor is an offset into the filtered view."""
+        informer = await self._get_informer("pods")
+        offset = int(continue_token[len(CACHE_CURSOR_PREFIX):]) if continue_token else 0
+
+        predicate = None
+        if phase or node:
+            def predicate(record):
+                return (not phase or record.status == phase) and (not node or record.node == node)
+
+        # One extra record tells whether another page exists
+        records = informer.items(namespace, limit + 1, offset, predicate)
+        next_token = f"{CACHE_CURSOR_PREFIX}{offset + limit}" if len(records) > limit else None
+        return await self._present_with_usage("pods", records[:limit]), next_token
+
+    # ==================== Usage ====================
+
+    async def get_usage(self, kind: str, max_age: float = SNAPSHOT_TTL) -> Dict:
+        """Get metrics.k8s.io usage for all nodes or pods, cached for max_age seconds.
+
+        Returns {name: (cpu millicores, memory bytes)} for nodes and
+        {(namespace, name): (...)} for pods; empty if the metrics API is
+        unavailable.
+        """
+        cached = self._usage.get(kind)
+        if cached is not None and time.monotonic() - cached[0] <= max_age:
+            return cached[1]
+
+        try:
+            await self._get_client()
+            usage = await self._run(self._fetch_usage, kind)
+            self.metrics_available = True
+        except Exception as e:
+            if self.metrics_available is not False:
+                logger.warning(f"metrics.k8s.io {kind} usage unavailable: {e}")
+            self.metrics_available = False
+            usage = {}
+        self._usage[kind] = (time.monotonic(), usage)
+        return usage
+
+    def _fetch_usage(self, kind: str) -> Dict:
+        """One bulk list of NodeMetrics or PodMetrics, converted to usage tuples."""
+        from kubernetes import client
+
+        result = client.CustomObjectsApi(self._client).list_cluster_custom_object(
+            "metrics.k8s.io", "v1beta1", kind
+        )
+        items = result.get("items", [])
+        if kind == "nodes":
+            keys = [item["metadata"]["name"] for item in items]
+            usages = [item.get("usage") or {} for item in items]
+        else:
+            # Pod usage is summed over containers: one column entry per container
+            keys = []
+            usages = []
+            for item in items:
+                metadata = item["metadata"]
+                key = (metadata["namespace"], metadata["name"])
+                for container in item.get("containers") or []:
+                    keys.append(key)
+                    usages.append(container.get("usage") or {})
+
+        cpu = parse_cpu_column(u.get("cpu") for u in usages)
+        memory = parse_bytes_column(u.get("memory") for u in usages)
+        usage = {}
+        for key, c, m in zip(keys, cpu, memory):
+            prev = usage.get(key)
+            usage[key] = (c, m) if prev is None else (prev[0] + c, prev[1] + m)
+        return usage
+
+    async def _present_with_usage(self, kind: str, records: list) -> List[dict]:
+        """Build response dicts for node/pod records joined with their usage."""
+        usage = await self.get_usage(kind)
+        columns = NodeColumns(records) if kind == "nodes" else PodColumns(records)
+        columns.attach_usage(usage)
+        return [{**self._present(record), **columns.usage_row(i)} for i, record in enumerate(records)]
+
+    # ==================== Collection ====================
 
     async def get_services(self, namespace: str = None) -> List[dict]:
         """Get service status."""
         try:
-            client = await self._get_client()
-            v1 = client.CoreV1Api()
-
-            if namespace:
-                services = v1.list_namespaced_service(namespace)
-            else:
-                services = v1.list_service_for_all_namespaces()
+            services = await self._list("services", namespace)
+            # One bulk Endpoints list per scope, joined by namespace/name
+            endpoints = {(ep["namespace"], ep["name"]): ep
+                         for ep in await self._list("endpoints", namespace)}
 
             result = []
-            for svc in services.items:
-                # Get endpoints
-                try:
-                    eps = v1.read_namespaced_endpoints(svc.metadata.name, svc.metadata.namespace)
-                    endpoint_subsets = len(eps.subsets) if eps.subsets else 0
-                except:
-                    endpoint_subsets = 0
-
+            for svc in services:
+                ep = endpoints.get((svc["namespace"], svc["name"]))
+                ready = ep["ready"] if ep else 0
+                not_ready = ep["not_ready"] if ep else 0
                 result.append({
-                    "name": svc.metadata.name,
-                    "namespace": svc.metadata.namespace,
-                    "type": svc.spec.type,
-                    "cluster_ip": svc.spec.cluster_ip,
-                    "ports": [{"port": p.port, "protocol": p.protocol} for p in (svc.spec.ports or [])],
-                    "endpoints": endpoint_subsets,
+                    **svc,
+                    "endpoints": ready,
+                    "ready_endpoints": ready,
+                    "not_ready_endpoints": not_ready,
                 })
             return result
         except Exception as e:
@@ -140,63 +380,120 @@ class KubernetesCollector:
     async def get_namespaces(self) -> List[dict]:
         """Get namespaces."""
         try:
-            client = await self._get_client()
-            v1 = client.CoreV1Api()
-            namespaces = v1.list_namespace()
-
-            return [{"name": ns.metadata.name, "status": ns.status.phase}
-                    for ns in namespaces.items]
+            return await self._list("namespaces")
         except Exception as e:
             return [{"error": str(e), "mock": True}]
 
     async def get_deployments(self, namespace: str = None) -> List[dict]:
         """Get deployments."""
         try:
-            client = await self._get_client()
-            apps_v1 = client.AppsV1Api()
-
-            if namespace:
-                deploys = apps_v1.list_namespaced_deployment(namespace)
-            else:
-                deploys = apps_v1.list_deployment_for_all_namespaces()
-
-            result = []
-            for deploy in deploys.items:
-                result.append({
-                    "name": deploy.metadata.name,
-                    "namespace": deploy.metadata.namespace,
-                    "replicas": deploy.spec.replicas,
-                    "ready_replicas": deploy.status.ready_replicas or 0,
-                    "available_replicas": deploy.status.available_replicas or 0,
-                    "age": self._get_age(deploy.metadata.creation_timestamp),
-                })
-            return result
+            return await self._list("deployments", namespace)
         except Exception as e:
             return [{"error": str(e), "mock": True}]
 
-    def _parse_memory(self, mem_str: str) -> int:
-        """Parse memory string to bytes."""
-        if not mem_str:
-            return 0
-        mem_str = mem_str.strip()
-        if mem_str.endswith('Ki'):
-            return int(mem_str[:-2]) * 1024
-        elif mem_str.endswith('Mi'):
-            return int(mem_str[:-2]) * 1024 * 1024
-        elif mem_str.endswith('Gi'):
-            return int(mem_str[:-2]) * 1024 * 1024 * 1024
-        elif mem_str.endswith('Ti'):
-            return int(mem_str[:-2]) * 1024 * 1024 * 1024 * 1024
-        try:
-            return int(mem_str)
-        except:
-            return 0
+    async def get_snapshot(self, max_age: float = SNAPSHOT_TTL) -> ClusterSnapshot:
+        """Get a cluster snapshot, shared by concurrent callers for max_age seconds."""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.age() <= max_age:
+            return snapshot
+
+        # Join a collection already in flight on this loop instead of starting another
+        task = self._snapshot_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._collect_snapshot())
+            self._snapshot_task = task
+        return await asyncio.shield(task)
+
+    async def _collect_snapshot(self) -> ClusterSnapshot:
+        nodes, pods, namespaces, services, node_usage, pod_usage = await asyncio.gather(
+            self._list_records("nodes"), self._list_records("pods"), self.get_namespaces(), self.get_services(),
+            self.get_usage("nodes", 0), self.get_usage("pods", 0),
+            return_exceptions=True,
+        )
+        if isinstance(nodes, Exception):
+            return ClusterSnapshot(NodeColumns(), PodColumns(), [], [], error=str(nodes))
+
+        # A failed secondary list counts as empty rather than as one bogus object
+        if isinstance(pods, Exception):
+            pods = []
+        namespaces, services = [
+            [] if items and "error" in items[0] else items for items in (namespaces, services)
+        ]
+        node_columns = NodeColumns(nodes)
+        pod_columns = PodColumns(pods)
+        node_columns.attach_usage(node_usage)
+        pod_columns.attach_usage(pod_usage)
+        snapshot = ClusterSnapshot(node_columns, pod_columns, namespaces, services)
+        if not snapshot.failed:
+            self._snapshot = snapshot
+        return snapshot
+
+    # ==================== Converters ====================
+
+    def _node_to_record(self, node) -> NodeRecord:
+        """Convert a V1Node."""
+        capacity = node.status.capacity or {}
+        allocatable = node.status.allocatable or {}
+        return NodeRecord(
+            name=node.metadata.name,
+            status=node.status.conditions[-1].type if node.status.conditions else "Unknown",
+            cpu_cores=millicores_to_cores(parse_cpu(capacity.get('cpu'))),
+            memory_bytes=parse_bytes(capacity.get('memory')),
+            alloc_cpu_cores=millicores_to_cores(parse_cpu(allocatable.get('cpu'))),
+            alloc_memory_bytes=parse_bytes(allocatable.get('memory')),
+        )
+
+    def _pod_to_record(self, pod) -> PodRecord:
+        """Convert a V1Pod."""
+        return PodRecord.from_pod(pod, parse_cpu, parse_bytes)
+
+    def _service_to_dict(self, svc) -> dict:
+        """Convert a V1Service."""
+        return {
+            "name": svc.metadata.name,
+            "namespace": svc.metadata.namespace,
+            "type": svc.spec.type,
+            "cluster_ip": svc.spec.cluster_ip,
+            "ports": [{"port": p.port, "protocol": p.protocol} for p in (svc.spec.ports or [])],
+        }
+
+    def _endpoints_to_dict(self, eps) -> dict:
+        """Convert a V1Endpoints to ready/not-ready address counts."""
+        ready = 0
+        not_ready = 0
+        for subset in eps.subsets or []:
+            ready += len(subset.addresses or [])
+            not_ready += len(subset.not_ready_addresses or [])
+        return {
+            "name": eps.metadata.name,
+            "namespace": eps.metadata.namespace,
+            "ready": ready,
+            "not_ready": not_ready,
+        }
+
+    def _namespace_to_dict(self, ns) -> dict:
+        """Convert a V1Namespace."""
+        return {"name": ns.metadata.name, "status": ns.status.phase}
+
+    def _deployment_to_dict(self, deploy) -> dict:
+        """Convert a V1Deployment."""
+        return {
+            "name": deploy.metadata.name,
+            "namespace": deploy.metadata.namespace,
+            "replicas": deploy.spec.replicas,
+            "ready_replicas": deploy.status.ready_replicas or 0,
+            "available_replicas": deploy.status.available_replicas or 0,
+            "created_at": deploy.metadata.creation_timestamp,
+        }
 
     def _get_age(self, creation_timestamp) -> str:
         """Get resource age."""
         if not creation_timestamp:
             return "Unknown"
-        delta = datetime.utcnow() - creation_timestamp
+        if creation_timestamp.tzinfo is not None:
+            delta = datetime.now(timezone.utc) - creation_timestamp
+        else:
+            delta = datetime.utcnow() - creation_timestamp
         days = delta.days
         if days > 0:
             return f"{days}d"
@@ -207,13 +504,16 @@ class KubernetesCollector:
         return f"{minutes}m"
 
 
-# Global collector instance
-_k8s_collector = None
+def get_k8s_collector(cluster: Optional[str] = None) -> KubernetesCollector:
+    """Get the collector for a cluster (the default cluster if None).
+
+    Raises KeyError for an unknown cluster name.
+    """
+    from backend.core.collector.registry import get_collector_registry
+    return get_collector_registry().get(cluster)
 
 
-def get_k8s_collector() -> KubernetesCollector:
-    """Get Kubernetes collector instance."""
-    global _k8s_collector
-    if _k8s_collector is None:
-        _k8s_collector = KubernetesCollector()
-    return _k8s_collector
+def close_k8s_collector():
+    """Close all collectors and release their connections."""
+    from backend.core.collector.registry import close_collector_registry
+    close_collector_registry()
@@ -0,0 +1,103 @@
+"""StellarPulse - Kubernetes Quantity Parsing.
+
+Implements the resource.Quantity grammar: a signed decimal number followed
+by a binary SI suffix (Ki..Ei), a decimal SI suffix (n, u, m, k, M..E) or a
+decimal exponent (e.g. ``1e3``). The same few quantity strings repeat across
+every pod and node, so conversions are memoized and the column helpers
+parse each distinct string once.
+"""
+
+from array import array
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+import math
+import re
+from typing import Iterable, Optional
+
+BINARY_SUFFIXES = {
+    "Ki": Decimal(2) ** 10,
+    "Mi": Decimal(2) ** 20,
+    "Gi": Decimal(2) ** 30,
+    "Ti": Decimal(2) ** 40,
+    "Pi": Decimal(2) ** 50,
+    "Ei": Decimal(2) ** 60,
+}
+
+DECIMAL_SUFFIXES = {
+    "n": Decimal("1e-9"),
+    "u": Decimal("1e-6"),
+    "m": Decimal("1e-3"),
+    "": Decimal(1),
+    "k": Decimal("1e3"),
+    "M": Decimal("1e6"),
+    "G": Decimal("1e9"),
+    "T": Decimal("1e12"),
+    "P": Decimal("1e15"),
+    "E": Decimal("1e18"),
+}
+
+_QUANTITY_RE = re.compile(
+    r"^([+-]?(?:\d+\.?\d*|\.\d+))(?:(Ki|Mi|Gi|Ti|Pi|Ei|[numkMGTPE])|[eE]([+-]?\d+))?$"
+)
+
+# Distinct strings remembered per conversion
+CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_quantity(quantity: str) -> Decimal:
+    """Parse a quantity string to an exact Decimal; raises ValueError if malformed."""
+    match = _QUANTITY_RE.match(quantity.strip())
+    if match is None:
+        raise ValueError(f"Invalid quantity: {quantity!r}")
+    number, suffix, exponent = match.groups()
+    try:
+        value = Decimal(number)
+    except InvalidOperation:
+        raise ValueError(f"Invalid quantity: {quantity!r}")
+    if exponent is not None:
+        return value.scaleb(int(exponent))
+    if suffix in BINARY_SUFFIXES:
+        return value * BINARY_SUFFIXES[suffix]
+    return value * DECIMAL_SUFFIXES[suffix or ""]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_cpu(quantity: Optional[str]) -> int:
+    """CPU quantity in millicores, rounded up like Quantity.MilliValue(); 0 if empty or malformed."""
+    if not quantity:
+        return 0
+    try:
+        return math.ceil(parse_quantity(quantity) * 1000)
+    except ValueError:
+        return 0
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_bytes(quantity: Optional[str]) -> int:
+    """Memory/storage quantity in bytes, rounded up like Quantity.Value(); 0 if empty or malformed."""
+    if not quantity:
+        return 0
+    try:
+        return math.ceil(parse_quantity(quantity))
+    except ValueError:
+        return 0
+
+
+def parse_cpu_column(quantities: Iterable[Optional[str]]) -> array:
+    """Convert a column of CPU quantities to millicores, parsing each distinct string once."""
+    quantities = list(quantities)
+    values = {q: parse_cpu(q) for q in set(quantities)}
+    return array("q", map(values.__getitem__, quantities))
+
+
+def parse_bytes_column(quantities: Iterable[Optional[str]]) -> array:
+    """Convert a column of memory quantities to bytes, parsing each distinct string once."""
+    quantities = list(quantities)
+    values = {q: parse_bytes(q) for q in set(quantities)}
+    return array("q", map(values.__getitem__, quantities))
+
+
+def millicores_to_cores(millicores: int):
+    """Cores as an int when whole, else a float."""
+    return millicores // 1000 if millicores % 1000 == 0 else millicores / 1000
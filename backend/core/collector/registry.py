@@ -0,0 +1,114 @@
+"""StellarPulse - Multi-Cluster Collector Registry."""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import os
+
+from backend.core.collector.kubernetes import KubernetesCollector
+
+logger = logging.getLogger(__name__)
+
+# Seconds one cluster may take in a fleet-wide collection
+DEFAULT_CLUSTER_TIMEOUT = 10
+
+DEFAULT_CLUSTER = "default"
+
+
+class CollectorRegistry:
+    """Kubernetes collectors keyed by cluster name.
+
+    Clusters come from ``STELLAR_K8S_CLUSTERS`` as comma-separated
+    ``name=kubeconfig_path[#context]`` entries. Without it, every context of
+    ``~/.kube/config`` becomes a cluster, and failing that a single
+    ``default`` cluster uses the collector's kubeconfig/in-cluster fallback.
+    Each collector has its own bounded executor, which acts as the
+    per-cluster concurrency limit.
+    """
+
+    def __init__(self, clusters: Optional[Dict[str, Tuple[Optional[str], Optional[str]]]] = None,
+                 default: Optional[str] = None, timeout: Optional[float] = None):
+        if clusters is None:
+            clusters, default = self._discover()
+        self._clusters = clusters
+        self.default = default or next(iter(clusters), DEFAULT_CLUSTER)
+        self.timeout = timeout or float(os.environ.get("STELLAR_K8S_CLUSTER_TIMEOUT", DEFAULT_CLUSTER_TIMEOUT))
+        self._collectors: Dict[str, KubernetesCollector] = {}
+
+    @staticmethod
+    def _discover() -> Tuple[Dict[str, Tuple[Optional[str], Optional[str]]], Optional[str]]:
+        spec = os.environ.get("STELLAR_K8S_CLUSTERS")
+        if spec:
+            clusters = {}
+            for entry in spec.split(","):
+                name, _, target = entry.strip().partition("=")
+                path, _, context = target.partition("#")
+                clusters[name] = (path or None, context or None)
+            return clusters, None
+
+        try:
+            from kubernetes import config
+            contexts, active = config.list_kube_config_contexts()
+            clusters = {ctx["name"]: (None, ctx["name"]) for ctx in contexts}
+            return clusters, active["name"] if active else None
+        except Exception as e:
+            logger.info(f"No kubeconfig contexts, using a single cluster: {e}")
+            return {DEFAULT_CLUSTER: (None, None)}, DEFAULT_CLUSTER
+
+    def names(self) -> List[str]:
+        """Configured cluster names."""
+        return list(self._clusters)
+
+    def get(self, cluster: Optional[str] = None) -> KubernetesCollector:
+        """Get the collector for a cluster (the default cluster if None)."""
+        name = cluster or self.default
+        collector = self._collectors.get(name)
+        if collector is None:
+            if name not in self._clusters:
+                raise KeyError(name)
+            kubeconfig_path, context = self._clusters[name]
+            collector = self._collectors.setdefault(name, KubernetesCollector(kubeconfig_path, context=context, cluster=name))
+        return collector
+
+    async def collect(self, func: Callable[[KubernetesCollector], Awaitable[Any]]) -> Dict[str, Any]:
+        """Run func against every cluster in parallel.
+
+        Each cluster is bounded by the registry timeout, so a slow or
+        unreachable cluster yields an exception in its slot instead of
+        holding up the others.
+        """
+        async def run(name: str):
+            try:
+                return name, await asyncio.wait_for(func(self.get(name)), self.timeout)
+            except asyncio.TimeoutError:
+                return name, TimeoutError(f"cluster {name} timed out after {self.timeout}s")
+            except Exception as e:
+                return name, e
+
+        return dict(await asyncio.gather(*(run(name) for name in self._clusters)))
+
+    def close(self):
+        """Close every collector."""
+        for collector in self._collectors.values():
+            collector.close()
+        self._collectors.clear()
+
+
+# Global registry instance
+_registry = None
+
+
+def get_collector_registry() -> CollectorRegistry:
+    """Get collector registry instance."""
+    global _registry
+    if _registry is None:
+        _registry = CollectorRegistry()
+    return _registry
+
+
+def close_collector_registry():
+    """Close the registry and all of its collectors."""
+    global _registry
+    if _registry is not None:
+        _registry.close()
+        _registry = None
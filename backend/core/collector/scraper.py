@@ -0,0 +1,89 @@
+"""StellarPulse - Periodic Cluster Scraper."""
+
+from typing import Callable, List, Optional
+import asyncio
+import inspect
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCRAPE_INTERVAL = 15
+
+
+class Scraper:
+    """Collects a snapshot of every cluster each interval and hands it to listeners.
+
+    Listeners are called as ``listener(cluster, snapshot)``. Coroutine
+    functions are awaited on the loop; plain functions run in a worker
+    thread so heavy bookkeeping never stalls request handling.
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or float(os.environ.get("STELLAR_SCRAPE_INTERVAL", DEFAULT_SCRAPE_INTERVAL))
+        self._listeners: List[Callable] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add_listener(self, listener: Callable):
+        """Register a snapshot listener."""
+        self._listeners.append(listener)
+
+    def start(self):
+        """Start the scrape loop on the running event loop (disabled when interval <= 0)."""
+        if self.interval <= 0:
+            logger.info("Scraping disabled")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        """Stop the scrape loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            try:
+                await self.scrape_once()
+            except Exception as e:
+                logger.error(f"Scrape failed: {e}")
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - started)))
+
+    async def scrape_once(self):
+        """Collect every cluster once and notify listeners."""
+        from backend.core.collector.registry import get_collector_registry
+
+        # Dashboards asking within half an interval reuse the scraped snapshot
+        results = await get_collector_registry().collect(
+            lambda collector: collector.get_snapshot(max_age=self.interval / 2)
+        )
+        for cluster, snapshot in results.items():
+            if isinstance(snapshot, Exception) or snapshot.failed:
+                continue
+            for listener in self._listeners:
+                try:
+                    if inspect.iscoroutinefunction(listener):
+                        await listener(cluster, snapshot)
+                    else:
+                        await asyncio.to_thread(listener, cluster, snapshot)
+                except Exception as e:
+                    logger.error(f"Snapshot listener {listener!r} failed for {cluster}: {e}")
+
+
+# Global scraper instance
+_scraper = None
+
+
+def get_scraper() -> Scraper:
+    """Get scraper instance."""
+    global _scraper
+    if _scraper is None:
+        _scraper = Scraper()
+    return _scraper
@@ -0,0 +1,88 @@
+"""StellarPulse - Cluster Snapshot."""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from backend.core.collector.columnar import NodeColumns, PodColumns
+
+
+class ClusterSnapshot:
+    """Point-in-time view of the resources behind the cluster overview."""
+
+    def __init__(self, nodes: NodeColumns, pods: PodColumns, namespaces: List[dict],
+                 services: List[dict], taken_at: datetime = None, error: Optional[str] = None):
+        self.nodes = nodes
+        self.pods = pods
+        self.namespaces = namespaces
+        self.services = services
+        self.taken_at = taken_at or datetime.utcnow()
+        self.error = error
+        self._overview = None
+
+    @property
+    def failed(self) -> bool:
+        """Whether node collection failed or found nothing."""
+        return self.error is not None or len(self.nodes) == 0
+
+    def age(self) -> float:
+        """Seconds since the snapshot was taken."""
+        return (datetime.utcnow() - self.taken_at).total_seconds()
+
+    def overview(self) -> dict:
+        """Compute the overview counters from the snapshot columns."""
+        if self._overview is not None:
+            return self._overview
+
+        by_phase = self.pods.count_by("phase")
+        by_namespace = {ns["name"]: {"pods": 0, "services": 0} for ns in self.namespaces if "name" in ns}
+        for namespace, count in self.pods.count_by("namespace").items():
+            by_namespace.setdefault(namespace, {"pods": 0, "services": 0})["pods"] = count
+        for svc in self.services:
+            by_namespace.setdefault(svc.get("namespace"), {"pods": 0, "services": 0})["services"] += 1
+
+        total_mem = self.nodes.total("memory_bytes")
+        alloc_cpu = self.nodes.total("alloc_cpu_cores")
+        alloc_mem = self.nodes.total("alloc_memory_bytes")
+        used_cpu = self.nodes.total("cpu_usage") / 1000
+        used_mem = self.nodes.total("memory_usage")
+        running_pods = by_phase.get("Running", 0)
+        pending_pods = by_phase.get("Pending", 0)
+        self._overview = {
+            "cluster": {"nodes": len(self.nodes), "pods": len(self.pods), "services": len(self.services),
+                        "namespaces": len(self.namespaces)},
+            "resources": {"cpu_cores": self.nodes.total("cpu_cores"), "memory_gb": round(total_mem / (1024**3), 2)},
+            "usage": {"cpu_cores": round(used_cpu, 2), "memory_gb": round(used_mem / (1024**3), 2),
+                      "cpu_percent": round(used_cpu * 100 / alloc_cpu, 2) if alloc_cpu else 0.0,
+                      "memory_percent": round(used_mem * 100 / alloc_mem, 2) if alloc_mem else 0.0},
+            "pods": {"running": running_pods, "pending": pending_pods,
+                     "other": len(self.pods) - running_pods - pending_pods,
+                     "by_phase": {str(phase): count for phase, count in by_phase.items()}},
+            "namespaces": by_namespace,
+            "timestamp": self.taken_at.isoformat()
+        }
+        return self._overview
+
+
+def fleet_overview(results: Dict[str, Any]) -> dict:
+    """Aggregate per-cluster snapshots (or collection errors) into a fleet overview."""
+    clusters = {}
+    totals = {"clusters": len(results), "healthy": 0, "nodes": 0, "pods": 0, "services": 0, "namespaces": 0,
+              "cpu_cores": 0, "memory_gb": 0, "running_pods": 0, "pending_pods": 0}
+    for name, result in results.items():
+        if isinstance(result, Exception) or result.failed:
+            error = str(result) if isinstance(result, Exception) else result.error or "no nodes"
+            clusters[name] = {"error": error}
+            continue
+
+        overview = result.overview()
+        clusters[name] = overview
+        totals["healthy"] += 1
+        for key, value in overview["cluster"].items():
+            totals[key] += value
+        totals["cpu_cores"] += overview["resources"]["cpu_cores"]
+        totals["memory_gb"] += overview["resources"]["memory_gb"]
+        totals["running_pods"] += overview["pods"]["running"]
+        totals["pending_pods"] += overview["pods"]["pending"]
+
+    totals["memory_gb"] = round(totals["memory_gb"], 2)
+    return {"totals": totals, "clusters": clusters, "timestamp": datetime.utcnow().isoformat()}
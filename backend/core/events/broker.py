@@ -0,0 +1,187 @@
+"""StellarPulse - Live Event Broker.
+
+One in-process fan-out for server-push updates. Producers (informer watch
+threads, the alert engine, the scraper) publish events from any thread;
+each event is encoded once as a Server-Sent Events frame and handed to
+every subscriber whose topics match. Subscribers read from their own
+bounded queue: a client that falls behind has its backlog discarded and
+receives a single ``resync`` event telling it to refetch, so a slow
+dashboard never grows memory or holds up the others.
+
+Topics: ``alerts`` (firing/resolved/acknowledged), ``k8s`` (informer
+ADDED/MODIFIED/DELETED deltas) and ``overview`` (one cluster overview per
+scrape).
+"""
+
+import asyncio
+from collections import deque
+from datetime import date, datetime
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+TOPICS = ("alerts", "k8s", "overview")
+
+DEFAULT_BUFFER_SIZE = 256
+# Recent frames kept for clients reconnecting with Last-Event-ID
+REPLAY_SIZE = 1024
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_frame(event_id: Optional[int], event_type: str, data: Any) -> str:
+    """One SSE frame; ``event`` is the topic-qualified type, e.g. ``alerts.firing``."""
+    payload = json.dumps(data, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+    id_line = "" if event_id is None else f"id: {event_id}\n"
+    return f"{id_line}event: {event_type}\ndata: {payload}\n\n"
+
+
+class Subscription:
+    """One connected client."""
+
+    def __init__(self, topics: Set[str], buffer_size: int):
+        self.topics = topics
+        # Room for at least the resync notice plus the newest frame
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(2, buffer_size))
+        self.dropped = 0
+        self.connected_at = time.time()
+
+
+class EventBroker:
+    """Thread-safe publish, loop-side fan-out to bounded per-client queues."""
+
+    def __init__(self, buffer_size: Optional[int] = None, replay_size: int = REPLAY_SIZE):
+        self.buffer_size = buffer_size or int(os.environ.get("STELLAR_EVENTS_BUFFER", DEFAULT_BUFFER_SIZE))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ids = itertools.count(1)
+        self._id_lock = threading.Lock()
+        self._subscribers: List[Subscription] = []
+        # topic -> number of subscribers, read without the loop by producers
+        self._topic_counts: Dict[str, int] = {topic: 0 for topic in TOPICS}
+        self._replay: Deque = deque(maxlen=replay_size)
+        # Newest event id that was skipped because nobody was listening
+        self._last_skipped = 0
+        self.published = 0
+
+    def start(self):
+        """Bind the broker to the running event loop."""
+        self._loop = asyncio.get_running_loop()
+
+    def stop(self):
+        """Detach from the loop; later publishes are discarded."""
+        self._loop = None
+
+    # ==================== Producers ====================
+
+    def has_subscribers(self, topic: str) -> bool:
+        """Cheap check so producers can skip building unwanted events."""
+        return self._topic_counts.get(topic, 0) > 0
+
+    def publish(self, topic: str, event_type: str, data: Any):
+        """Publish an event from any thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        with self._id_lock:
+            event_id = next(self._ids)
+        if not self.has_subscribers(topic):
+            self._last_skipped = event_id
+            return
+        frame = encode_frame(event_id, f"{topic}.{event_type}", data)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fanout(event_id, topic, frame)
+        else:
+            try:
+                loop.call_soon_threadsafe(self._fanout, event_id, topic, frame)
+            except RuntimeError:
+                # Loop closed between the check and the call
+                pass
+
+    def _fanout(self, event_id: int, topic: str, frame: str):
+        self.published += 1
+        self._replay.append((event_id, topic, frame))
+        for sub in self._subscribers:
+            if topic in sub.topics:
+                self._offer(sub, frame)
+
+    def _offer(self, sub: Subscription, frame: str):
+        try:
+            sub.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Client fell behind: drop its backlog and ask it to refetch
+            while not sub.queue.empty():
+                sub.queue.get_nowait()
+                sub.dropped += 1
+            sub.queue.put_nowait(encode_frame(None, "resync", {"reason": "buffer overflow"}))
+            sub.queue.put_nowait(frame)
+
+    # ==================== Subscribers ====================
+
+    def subscribe(self, topics: Optional[Iterable[str]] = None, last_event_id: Optional[int] = None) -> Subscription:
+        """Register a client (on the loop); replays missed events after last_event_id if still buffered."""
+        topic_set = set(topics or TOPICS) & set(TOPICS)
+        sub = Subscription(topic_set, self.buffer_size)
+        if last_event_id is not None:
+            missed = [(i, t, f) for i, t, f in self._replay if i > last_event_id and t in topic_set]
+            expired = self._replay and self._replay[0][0] > last_event_id + 1
+            if expired or self._last_skipped > last_event_id:
+                # Part of the gap is no longer available
+                self._offer(sub, encode_frame(None, "resync", {"reason": "events expired"}))
+            for _, _, frame in missed:
+                self._offer(sub, frame)
+        self._subscribers.append(sub)
+        for topic in topic_set:
+            self._topic_counts[topic] += 1
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        """Remove a disconnected client."""
+        try:
+            self._subscribers.remove(sub)
+        except ValueError:
+            return
+        for topic in sub.topics:
+            self._topic_counts[topic] -= 1
+
+    def stats(self) -> dict:
+        """Subscriber counts and delivery figures."""
+        return {
+            "subscribers": len(self._subscribers),
+            "by_topic": dict(self._topic_counts),
+            "published": self.published,
+            "dropped": sum(sub.dropped for sub in self._subscribers),
+            "buffer_size": self.buffer_size,
+        }
+
+
+def publish_overview(cluster: str, snapshot):
+    """Scraper listener: push each cluster's overview to subscribers."""
+    broker = get_broker()
+    if broker.has_subscribers("overview"):
+        broker.publish("overview", "snapshot", {"cluster": cluster, **snapshot.overview()})
+
+
+# Global broker instance
+_broker = None
+
+
+def get_broker() -> EventBroker:
+    """Get event broker instance."""
+    global _broker
+    if _broker is None:
+        _broker = EventBroker()
+    return _broker
@@ -0,0 +1,142 @@
+"""StellarPulse - Cron Expressions.
+
+Standard five-field expressions (minute hour day-of-month month
+day-of-week) with ``*``, lists, ranges, steps, month/day names and the
+``@hourly``/``@daily``/``@weekly``/``@monthly``/``@yearly`` macros. As in
+Vixie cron, when both day fields are restricted a day matching either one
+fires. Times are naive UTC, like every timestamp the backend stores.
+
+Expressions are parsed once into sorted field values and cached, so
+computing the next fire time is a few list lookups per field.
+"""
+
+from bisect import bisect_left
+import calendar
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional, Tuple
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+MONTH_NAMES = {name.lower(): i for i, name in enumerate(calendar.month_abbr) if name}
+DAY_NAMES = {name: i for i, name in enumerate(("sun", "mon", "tue", "wed", "thu", "fri", "sat"))}
+
+# (name, min, max, names)
+FIELDS = (
+    ("minute", 0, 59, None),
+    ("hour", 0, 23, None),
+    ("day of month", 1, 31, None),
+    ("month", 1, 12, MONTH_NAMES),
+    ("day of week", 0, 7, DAY_NAMES),
+)
+
+# Give up looking for a match after this many years (e.g. "0 0 30 2 *")
+MAX_YEARS = 5
+
+
+def _value(token: str, name: str, low: int, high: int, names) -> int:
+    token = token.lower()
+    if names and token in names:
+        return names[token]
+    if not token.isdigit():
+        raise ValueError(f"Invalid {name} value: {token!r}")
+    value = int(token)
+    if not low <= value <= high:
+        raise ValueError(f"{name} value {value} out of range {low}-{high}")
+    return value
+
+
+def _parse_field(field: str, name: str, low: int, high: int, names) -> Tuple[Tuple[int, ...], bool]:
+    """(sorted values, whether the field is restricted) of one field."""
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_token = part.split("/", 1)
+            if not step_token.isdigit() or int(step_token) == 0:
+                raise ValueError(f"Invalid {name} step: {step_token!r}")
+            step = int(step_token)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_token, end_token = part.split("-", 1)
+            start = _value(start_token, name, low, high, names)
+            end = _value(end_token, name, low, high, names)
+            if start > end:
+                raise ValueError(f"Invalid {name} range: {part!r}")
+        else:
+            start = _value(part, name, low, high, names)
+            # "5/15" means 5-max/15
+            end = high if step > 1 else start
+        values.update(range(start, end + 1, step))
+    return tuple(sorted(values)), not field.startswith("*")
+
+
+class CronExpression:
+    """A parsed cron expression."""
+    __slots__ = ("expression", "minutes", "hours", "days", "months", "weekdays", "day_restricted",
+                 "weekday_restricted")
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = MACROS.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(fields)}: {expression!r}")
+        parsed = [_parse_field(field, *spec) for field, spec in zip(fields, FIELDS)]
+        self.minutes, self.hours = parsed[0][0], parsed[1][0]
+        self.days, self.day_restricted = parsed[2]
+        self.months = parsed[3][0]
+        weekdays, self.weekday_restricted = parsed[4]
+        # 7 is Sunday too
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+
+    def _day_matches(self, value: datetime) -> bool:
+        day_ok = value.day in self.days
+        # datetime: Monday=0; cron: Sunday=0
+        weekday_ok = (value.weekday() + 1) % 7 in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, after: datetime) -> Optional[datetime]:
+        """First fire time strictly after ``after``, or None if there is none."""
+        value = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = after.year + MAX_YEARS
+        while value.year <= limit:
+            if value.month not in self.months:
+                i = bisect_left(self.months, value.month)
+                if i == len(self.months):
+                    value = datetime(value.year + 1, self.months[0], 1)
+                else:
+                    value = datetime(value.year, self.months[i], 1)
+                continue
+            if not self._day_matches(value):
+                value = datetime(value.year, value.month, value.day) + timedelta(days=1)
+                continue
+            if value.hour not in self.hours:
+                i = bisect_left(self.hours, value.hour)
+                if i == len(self.hours):
+                    value = datetime(value.year, value.month, value.day) + timedelta(days=1)
+                else:
+                    value = value.replace(hour=self.hours[i], minute=0)
+                continue
+            i = bisect_left(self.minutes, value.minute)
+            if i == len(self.minutes):
+                value = value.replace(minute=0) + timedelta(hours=1)
+                continue
+            return value.replace(minute=self.minutes[i])
+        return None
+
+
+@lru_cache(maxsize=4096)
+def parse_cron(expression: str) -> CronExpression:
+    """Parsed expression, cached; raises ValueError if it is invalid."""
+    return CronExpression(expression)
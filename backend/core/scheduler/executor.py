@@ -0,0 +1,359 @@
+"""StellarPulse - Task Run Executor.
+
+Triggered runs are persisted as ``pending`` TaskRun rows and their ids
+queued here; a fixed pool of async workers takes them in priority order
+(manual before scheduled, then FIFO), runs them through ``TaskRunner`` and
+writes the result back to the row. A burst of triggers therefore only ever
+runs ``workers`` processes at once, and since the queue holds nothing the
+database does not, pending runs left over from a restart are queued again
+on startup.
+
+Limits:
+
+- STELLAR_TASK_WORKERS: runs executing at once (default 4)
+- STELLAR_TASK_PER_TASK_LIMIT: runs of one task executing at once
+  (default 1); further runs of that task wait without holding a worker
+- STELLAR_TASK_QUEUE_SIZE: queued runs before new triggers are rejected
+  (default 10000)
+"""
+
+import asyncio
+from collections import deque
+from datetime import datetime
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Deque, Dict, List, Optional
+
+from backend.core.scheduler.fanout import DEFAULT_TARGET_CONCURRENCY, run_on_targets
+from backend.core.scheduler.runner import TaskRunner, get_task_runner
+from backend.core.scheduler.stats import record_run, record_runs
+from backend.services.logstore import get_log_store
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_PER_TASK_LIMIT = 1
+DEFAULT_QUEUE_SIZE = 10000
+# Recent queue waits / run durations kept for the latency metrics
+LATENCY_SAMPLES = 1024
+
+# triggered_by -> priority, lower runs first
+PRIORITIES = {"manual": 0, "api": 0, "schedule": 1}
+DEFAULT_PRIORITY = 1
+
+
+class QueuedRun:
+    """A run waiting for a worker."""
+    __slots__ = ("run_id", "task_id", "priority", "queued_at")
+
+    def __init__(self, run_id: int, task_id: int, priority: int):
+        self.run_id = run_id
+        self.task_id = task_id
+        self.priority = priority
+        self.queued_at = time.monotonic()
+
+
+def _percentiles(samples: Deque[float]) -> dict:
+    if not samples:
+        return {"avg": None, "p50": None, "p95": None, "max": None}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {
+        "avg": round(sum(ordered) / len(ordered), 4),
+        "p50": round(ordered[last // 2], 4),
+        "p95": round(ordered[int(last * 0.95)], 4),
+        "max": round(ordered[last], 4),
+    }
+
+
+class TaskExecutor:
+    """Bounded, prioritized worker pool executing queued task runs."""
+
+    def __init__(self, workers: Optional[int] = None, per_task_limit: Optional[int] = None,
+                 queue_size: Optional[int] = None, runner: Optional[TaskRunner] = None):
+        self.workers = workers or int(os.environ.get("STELLAR_TASK_WORKERS", DEFAULT_WORKERS))
+        self.per_task_limit = per_task_limit or int(
+            os.environ.get("STELLAR_TASK_PER_TASK_LIMIT", DEFAULT_PER_TASK_LIMIT))
+        self.queue_size = queue_size or int(os.environ.get("STELLAR_TASK_QUEUE_SIZE", DEFAULT_QUEUE_SIZE))
+        self.runner = runner or get_task_runner()
+
+        # Queue state is shared with request threads, so it sits behind a
+        # thread lock; workers are woken through a semaphore counting _ready.
+        self._lock = threading.Lock()
+        self._ready: List[tuple] = []
+        # task id -> runs held back by the per-task limit (same heap order)
+        self._deferred: Dict[int, List[tuple]] = {}
+        self._queued = 0
+        self._running: Dict[int, int] = {}
+        self._seq = itertools.count()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._available: Optional[asyncio.Semaphore] = None
+        self._workers: List[asyncio.Task] = []
+
+        self.counters = {"submitted": 0, "rejected": 0, "started": 0, "succeeded": 0, "failed": 0,
+                         "skipped": 0}
+        self._waits: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._durations: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    # ==================== Submission ====================
+
+    @property
+    def running(self) -> bool:
+        """Whether the workers are started, i.e. submit can accept runs."""
+        loop = self._loop
+        return loop is not None and not loop.is_closed()
+
+    def submit(self, run_id: int, task_id: int, triggered_by: str = "manual") -> bool:
+        """Queue a pending run from any thread; False if not running or the queue is full."""
+        loop = self._loop
+        if not self.running:
+            return False
+        item = QueuedRun(run_id, task_id, PRIORITIES.get(triggered_by, DEFAULT_PRIORITY))
+        with self._lock:
+            if self._queued >= self.queue_size:
+                self.counters["rejected"] += 1
+                return False
+            self._queued += 1
+            self.counters["submitted"] += 1
+            heapq.heappush(self._ready, (item.priority, next(self._seq), item))
+        loop.call_soon_threadsafe(self._available.release)
+        return True
+
+    async def _take(self) -> QueuedRun:
+        """Next run whose task is below its concurrency limit."""
+        while True:
+            await self._available.acquire()
+            with self._lock:
+                entry = heapq.heappop(self._ready)
+                item = entry[-1]
+                if self._running.get(item.task_id, 0) >= self.per_task_limit:
+                    heapq.heappush(self._deferred.setdefault(item.task_id, []), entry)
+                    continue
+                self._queued -= 1
+                self._running[item.task_id] = self._running.get(item.task_id, 0) + 1
+                return item
+
+    def _release(self, task_id: int):
+        """Free a task's slot and put back its next held-back run."""
+        with self._lock:
+            count = self._running.get(task_id, 0) - 1
+            if count > 0:
+                self._running[task_id] = count
+            else:
+                self._running.pop(task_id, None)
+            deferred = self._deferred.get(task_id)
+            if not deferred:
+                return
+            heapq.heappush(self._ready, heapq.heappop(deferred))
+            if not deferred:
+                del self._deferred[task_id]
+        self._available.release()
+
+    # ==================== Lifecycle ====================
+
+    def start(self):
+        """Start the workers on the running event loop."""
+        if self._workers:
+            return
+        self._loop = asyncio.get_running_loop()
+        with self._lock:
+            self._available = asyncio.Semaphore(len(self._ready))
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Stop the workers; runs in progress are killed and marked failed."""
+        workers, self._workers = self._workers, []
+        self._loop = None
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def recover(self):
+        """Fail runs interrupted by a restart and queue runs still pending."""
+        from backend.database import SessionLocal
+        from backend import models
+
+        db = SessionLocal()
+        try:
+            interrupted = db.query(models.TaskRun).filter(models.TaskRun.status == "running").all()
+            for task_run in interrupted:
+                task_run.status = "failed"
+                task_run.stderr = (task_run.stderr or "") + "\nInterrupted by a restart\n"
+                task_run.finished_at = datetime.utcnow()
+            record_runs(db, interrupted)
+            db.commit()
+            pending = db.query(models.TaskRun.id, models.TaskRun.task_id, models.TaskRun.triggered_by).filter(
+                models.TaskRun.status == "pending"
+            ).order_by(models.TaskRun.id).all()
+        finally:
+            db.close()
+        queued = sum(1 for run_id, task_id, triggered_by in pending if self.submit(run_id, task_id, triggered_by))
+        if interrupted or pending:
+            logger.info(f"Task runs recovered: {len(interrupted)} interrupted, {queued}/{len(pending)} re-queued")
+
+    # ==================== Execution ====================
+
+    async def _worker(self):
+        while True:
+            item = await self._take()
+            try:
+                await self._execute(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Task run {item.run_id} failed in executor: {e}")
+            finally:
+                self._release(item.task_id)
+
+    async def _execute(self, item: QueuedRun):
+        spec = await asyncio.to_thread(self._mark_running, item.run_id)
+        if spec is None:
+            self.counters["skipped"] += 1
+            return
+        self.counters["started"] += 1
+        self._waits.append(time.monotonic() - item.queued_at)
+
+        # Full output goes to the log store; the row keeps previews
+        log = None
+        try:
+            log = get_log_store().open(item.run_id)
+            if spec["targets"]:
+                result = await run_on_targets(
+                    self.runner, spec["script"], spec["script_type"], spec["targets"],
+                    spec["target_concurrency"], spec["target_timeout"], spec["failure_policy"], run_id=item.run_id,
+                    log=log,
+                )
+            else:
+                result = await self.runner.run_script(
+                    spec["script"], spec["script_type"], spec["timeout"], run_id=item.run_id, log=log
+                )
+        except asyncio.CancelledError:
+            # Shutting down: the runner has killed the process, record why
+            log.write("stderr", b"\nInterrupted by shutdown\n")
+            log.close()
+            self._finish(item.run_id, {"status": "failed", "stdout": log.preview("stdout"),
+                                       "stderr": log.preview("stderr"), "exit_code": None, "duration": None})
+            raise
+        except Exception as e:
+            logger.error(f"Task run {item.run_id} failed in executor: {e}")
+            result = {"status": "failed", "stdout": "", "stderr": f"Executor error: {e}\n", "exit_code": None,
+                      "duration": None}
+            if log is not None:
+                log.write("stderr", result["stderr"].encode())
+        finally:
+            if log is not None:
+                # Waits for the log's queued chunks to be written
+                await asyncio.to_thread(log.close)
+        if log is not None:
+            result.update(stdout=log.preview("stdout"), stderr=log.preview("stderr"))
+        if result["duration"] is not None:
+            self._durations.append(result["duration"])
+        self.counters["succeeded" if result["status"] == "success" else "failed"] += 1
+        await asyncio.to_thread(self._finish, item.run_id, result)
+
+    def _mark_running(self, run_id: int) -> Optional[dict]:
+        """Claim a pending run; returns what to execute, or None if it is gone."""
+        from backend.database import SessionLocal
+        from backend import models
+
+        db = SessionLocal()
+        try:
+            task_run = db.query(models.TaskRun).filter(models.TaskRun.id == run_id).first()
+            if task_run is None or task_run.status != "pending":
+                return None
+            task = db.query(models.Task).filter(models.Task.id == task_run.task_id).first()
+            if task is None or not task.script:
+                task_run.status = "failed"
+                task_run.stderr = "Task not found" if task is None else "Task has no script"
+                task_run.finished_at = datetime.utcnow()
+                if task is not None:
+                    record_run(db, task_run)
+                db.commit()
+                return None
+            task_run.status = "running"
+            task_run.started_at = datetime.utcnow()
+            task.last_run_at = task_run.started_at
+            task.last_status = "running"
+            db.commit()
+            return {"script": task.script, "script_type": task.script_type or "bash",
+                    "timeout": task.timeout or 300, "targets": list(task.targets or []),
+                    "target_concurrency": task.target_concurrency or DEFAULT_TARGET_CONCURRENCY,
+                    "target_timeout": task.target_timeout or task.timeout or 300,
+                    "failure_policy": task.failure_policy or "continue"}
+        finally:
+            db.close()
+
+    def _finish(self, run_id: int, result: dict):
+        """Persist the outcome of a run."""
+        from backend.database import SessionLocal
+        from backend import models
+
+        db = SessionLocal()
+        try:
+            task_run = db.query(models.TaskRun).filter(models.TaskRun.id == run_id).first()
+            if task_run is None:
+                return
+            task_run.status = result["status"]
+            task_run.stdout = result["stdout"]
+            task_run.stderr = result["stderr"]
+            task_run.exit_code = result["exit_code"]
+            task_run.duration = result["duration"]
+            if "targets" in result:
+                task_run.target_results = result["targets"]
+            task_run.finished_at = datetime.utcnow()
+            record_run(db, task_run)
+            task = db.query(models.Task).filter(models.Task.id == task_run.task_id).first()
+            if task is not None:
+                task.last_status = result["status"]
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to save task run {run_id}: {e}")
+        finally:
+            db.close()
+
+    # ==================== Metrics ====================
+
+    def stats(self) -> dict:
+        """Queue depth, concurrency and latency of recent runs."""
+        now = time.monotonic()
+        with self._lock:
+            waiting = [entry[-1] for entry in self._ready]
+            for deferred in self._deferred.values():
+                waiting.extend(entry[-1] for entry in deferred)
+            running = dict(self._running)
+            held = sum(len(deferred) for deferred in self._deferred.values())
+        by_priority: Dict[int, int] = {}
+        for item in waiting:
+            by_priority[item.priority] = by_priority.get(item.priority, 0) + 1
+        return {
+            **self.counters,
+            "workers": self.workers,
+            "per_task_limit": self.per_task_limit,
+            "queue_size": self.queue_size,
+            "queued": len(waiting),
+            "queued_by_priority": by_priority,
+            "held_by_task_limit": held,
+            "running": sum(running.values()),
+            "running_by_task": running,
+            "oldest_queued_seconds": round(now - min(item.queued_at for item in waiting), 3) if waiting else None,
+            "queue_wait_seconds": _percentiles(self._waits),
+            "run_duration_seconds": _percentiles(self._durations),
+        }
+
+
+# Global executor instance
+_task_executor = None
+
+
+def get_task_executor() -> TaskExecutor:
+    """Get task executor instance."""
+    global _task_executor
+    if _task_executor is None:
+        _task_executor = TaskExecutor()
+    return _task_executor
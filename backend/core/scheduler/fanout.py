@@ -0,0 +1,218 @@
+"""StellarPulse - Multi-Target Execution.
+
+A task with ``targets`` runs its script on each target through an adapter
+that wraps the command:
+
+- ``local`` / ``localhost``: run here
+- ``docker://<container>``: ``docker exec``
+- ``k8s://<namespace>/<pod>[/<container>]``: ``kubectl exec``
+- ``ssh://[user@]host[:port]`` or a bare ``[user@]host``: ``ssh`` in batch mode
+
+Targets are worked through by a window of ``target_concurrency`` workers,
+so N targets take about ceil(N / window) times one target's duration. Each
+target has its own timeout. With the ``fail_fast`` policy the first failure
+cancels targets in flight and skips the rest; ``continue`` runs them all.
+"""
+
+import asyncio
+from datetime import datetime
+import os
+import shlex
+from typing import List, Optional
+
+from backend.core.scheduler.runner import TaskRunner, build_command
+
+FAILURE_POLICIES = ("continue", "fail_fast")
+DEFAULT_TARGET_CONCURRENCY = 10
+# Output of each target kept in memory while it runs
+DEFAULT_TARGET_OUTPUT_LIMIT = 64 * 1024
+# Bytes of the start and the end of each target's stderr quoted in the run's stderr
+TARGET_PREVIEW_BYTES = 1024
+# Fields of each target's result stored on the TaskRun row; output stays in the log
+TARGET_RESULT_FIELDS = ("target", "status", "exit_code", "duration")
+# Environment passed through to docker/kubectl/ssh
+CLIENT_ENV = ("PATH", "HOME", "USER", "SSH_AUTH_SOCK", "KUBECONFIG", "DOCKER_HOST", "DOCKER_CONFIG")
+LOCAL_TARGETS = ("local", "localhost")
+
+
+class Target:
+    """Where one copy of a task runs."""
+    __slots__ = ("spec", "kind", "args")
+
+    def __init__(self, spec: str, kind: str, args: tuple):
+        self.spec = spec
+        self.kind = kind
+        self.args = args
+
+    def wrap(self, cmd: list) -> list:
+        """argv running cmd on this target."""
+        if self.kind == "local":
+            return cmd
+        if self.kind == "docker":
+            return ["docker", "exec", self.args[0], *cmd]
+        if self.kind == "k8s":
+            namespace, pod, container = self.args
+            argv = ["kubectl", "exec", "-n", namespace, pod]
+            if container:
+                argv += ["-c", container]
+            return argv + ["--", *cmd]
+        destination, port = self.args
+        argv = ["ssh", "-o", "BatchMode=yes", "-o", "ConnectTimeout=10"]
+        if port:
+            argv += ["-p", port]
+        return argv + [destination, "--", shlex.join(cmd)]
+
+    def env(self) -> Optional[dict]:
+        if self.kind == "local":
+            return None
+        return {key: os.environ[key] for key in CLIENT_ENV if key in os.environ}
+
+
+def parse_target(spec: str) -> Target:
+    """Target of a ``Task.targets`` entry; raises ValueError if it is malformed."""
+    spec = (spec or "").strip()
+    if not spec:
+        raise ValueError("Empty target")
+    if spec in LOCAL_TARGETS:
+        return Target(spec, "local", ())
+    scheme, sep, rest = spec.partition("://")
+    if not sep:
+        scheme, rest = "ssh", spec
+    if not rest:
+        raise ValueError(f"Invalid target: {spec}")
+    if scheme == "docker":
+        return Target(spec, "docker", (rest,))
+    if scheme == "k8s":
+        parts = rest.split("/")
+        if len(parts) not in (2, 3) or not all(parts):
+            raise ValueError(f"Kubernetes targets are k8s://<namespace>/<pod>[/<container>]: {spec}")
+        return Target(spec, "k8s", (parts[0], parts[1], parts[2] if len(parts) == 3 else None))
+    if scheme == "ssh":
+        destination, _, port = rest.rpartition(":") if ":" in rest else (rest, "", "")
+        if port and not port.isdigit():
+            raise ValueError(f"Invalid ssh port: {spec}")
+        return Target(spec, "ssh", (destination, port or None))
+    raise ValueError(f"Unknown target scheme: {scheme}")
+
+
+def validate_targets(task) -> None:
+    """Raise ValueError if a task's targets or fan-out settings are invalid."""
+    targets = task.targets or []
+    for spec in targets:
+        parse_target(spec)
+    if len(set(targets)) != len(targets):
+        raise ValueError("Duplicate targets")
+    if (task.failure_policy or "continue") not in FAILURE_POLICIES:
+        raise ValueError(f"Unknown failure policy: {task.failure_policy}")
+    if task.target_concurrency is not None and task.target_concurrency < 1:
+        raise ValueError("target_concurrency must be at least 1")
+    if task.target_timeout is not None and task.target_timeout <= 0:
+        raise ValueError("target_timeout must be positive")
+
+
+def target_output_limit() -> int:
+    """Output of each target kept in memory while it runs, in bytes."""
+    return int(os.environ.get("STELLAR_TASK_TARGET_OUTPUT_LIMIT", DEFAULT_TARGET_OUTPUT_LIMIT))
+
+
+def _summary(results: List[dict]) -> str:
+    lines = []
+    for result in results:
+        duration = f" {result['duration']:.1f}s" if result["duration"] is not None else ""
+        exit_code = f" exit={result['exit_code']}" if result["exit_code"] is not None else ""
+        lines.append(f"[{result['status']}] {result['target']}{exit_code}{duration}")
+    return "\n".join(lines) + "\n"
+
+
+async def run_on_targets(
+    runner: TaskRunner,
+    script: str,
+    script_type: str,
+    targets: List[str],
+    concurrency: int = DEFAULT_TARGET_CONCURRENCY,
+    timeout: float = 300,
+    policy: str = "continue",
+    run_id: Optional[int] = None,
+    output_limit: Optional[int] = None,
+    log=None,
+) -> dict:
+    """Run a script on every target; returns run_script-style totals plus per-target ``targets``.
+
+    While a target runs, its output is readable live through
+    ``runner.get_output(run_id, target)``. With a run ``log`` each target's
+    full output goes to its ``targets/<index>`` streams. The per-target
+    results hold TARGET_RESULT_FIELDS only.
+    """
+    start_time = datetime.utcnow()
+    output_limit = output_limit or target_output_limit()
+    results = [{"target": spec, "status": "skipped", "exit_code": None, "duration": None,
+                "stdout": "", "stderr": "", "truncated": False} for spec in targets]
+    cmd = build_command(script, script_type)
+    if not cmd:
+        return {"status": "failed", "stdout": "", "stderr": f"Unsupported script type: {script_type}",
+                "exit_code": 1, "duration": 0, "targets": results}
+
+    pending = iter(range(len(targets)))
+    workers: List[asyncio.Task] = []
+
+    async def run_one(index: int):
+        result = results[index]
+        try:
+            target = parse_target(targets[index])
+        except ValueError as e:
+            result.update(status="failed", stderr=str(e))
+            return
+        result["status"] = "running"
+        target_log = log.scoped(f"targets/{index}", TARGET_PREVIEW_BYTES) if log is not None else None
+        try:
+            outcome = await runner.run_command(
+                target.wrap(cmd), timeout, target.env(),
+                key=(run_id, target.spec) if run_id is not None else None, output_limit=output_limit,
+                log=target_log,
+            )
+        except asyncio.CancelledError:
+            result["status"] = "cancelled"
+            raise
+        result.update(status=outcome["status"], exit_code=outcome["exit_code"], duration=outcome["duration"],
+                      stdout=outcome["stdout"], stderr=outcome["stderr"], truncated=outcome["truncated"])
+        if target_log is not None:
+            result.update(stdout=target_log.preview("stdout"), stderr=target_log.preview("stderr"),
+                          truncated=False)
+
+    async def worker():
+        # Workers share one iterator, so each target is taken exactly once
+        for index in pending:
+            await run_one(index)
+            if results[index]["status"] != "success" and policy == "fail_fast":
+                current = asyncio.current_task()
+                for other in workers:
+                    if other is not current:
+                        other.cancel()
+                return
+
+    workers.extend(asyncio.create_task(worker()) for _ in range(min(max(1, concurrency), len(targets))))
+    try:
+        await asyncio.gather(*workers, return_exceptions=True)
+    except asyncio.CancelledError:
+        # Let every target kill its processes before giving up
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        raise
+
+    failures = [result for result in results if result["status"] != "success"]
+    stdout = _summary(results)
+    stderr = "".join(f"--- {result['target']} ({result['status']}) ---\n{result['stderr']}\n"
+                     for result in failures if result["stderr"])
+    if log is not None:
+        log.write("stdout", stdout.encode())
+        log.write("stderr", stderr.encode())
+    return {
+        "status": "failed" if failures else "success",
+        "stdout": stdout,
+        "stderr": stderr,
+        "exit_code": 1 if failures else 0,
+        "duration": (datetime.utcnow() - start_time).total_seconds(),
+        "truncated": any(result["truncated"] for result in results),
+        "targets": [{field: result[field] for field in TARGET_RESULT_FIELDS} for result in results],
+    }
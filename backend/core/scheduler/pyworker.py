@@ -0,0 +1,449 @@
+"""StellarPulse - Warm Python Worker Pool.
+
+Python tasks can skip interpreter startup: a pool of long-lived worker
+interpreters, each started once with the configured modules imported,
+fork a child per run. The child gets its own session, stdin from
+/dev/null, the run's environment and its stdout/stderr on pipes owned by
+the runner, then executes the script as ``__main__`` the way ``python3 -c``
+does. Every run is still a separate process, so runs are isolated from each
+other and timeouts kill the run's process group exactly like the subprocess
+path.
+
+The runner talks to a worker over a Unix SOCK_SEQPACKET socket (one
+message per run, carrying the script, the environment and the two pipe
+write ends) and reads ``started``/``exit`` events from the worker's stdout.
+Workers are replaced after STELLAR_PY_POOL_MAX_RUNS runs or once their
+resident memory has grown by STELLAR_PY_POOL_MAX_RSS_GROWTH_MB.
+
+Configuration:
+
+- STELLAR_PY_POOL_SIZE: worker interpreters (default 0, pool disabled)
+- STELLAR_PY_POOL_PRELOAD: comma separated modules imported by each worker
+- STELLAR_PY_POOL_MAX_RUNS: runs before a worker is replaced (default 1000)
+- STELLAR_PY_POOL_MAX_RSS_GROWTH_MB: memory growth before a worker is
+  replaced (default 64)
+
+This file is also the worker itself: ``python3 pyworker.py --serve <fd>
+<module>...``.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RUNS = 1000
+DEFAULT_MAX_RSS_GROWTH_MB = 64
+# Largest run request (script + environment) sent to a worker
+MAX_REQUEST = 128 * 1024
+# Seconds a new worker gets to import its preloaded modules
+START_TIMEOUT = 30
+# Seconds before retrying after a worker failed to start, doubling up to the maximum
+START_BACKOFF = 5.0
+MAX_START_BACKOFF = 300.0
+
+
+# ==================== Worker Interpreter ====================
+
+def _emit(event: dict):
+    os.write(1, (json.dumps(event) + "\n").encode())
+
+
+def _run_child(job: dict, stdout_fd: int, stderr_fd: int, keep: List[int]):
+    """Body of a forked run; never returns."""
+    import atexit
+    import threading
+    import traceback
+    import types
+
+    code = 1
+    try:
+        os.setsid()
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        for fd in (devnull, stdout_fd, stderr_fd, *keep):
+            os.close(fd)
+        sys.stdin = open(0, "r", closefd=False)
+        sys.stdout = open(1, "w", closefd=False)
+        sys.stderr = open(2, "w", buffering=1, closefd=False)
+        os.environ.clear()
+        os.environ.update(job["env"])
+        sys.argv = ["-c"]
+        main = types.ModuleType("__main__")
+        sys.modules["__main__"] = main
+        try:
+            exec(compile(job["script"], "<string>", "exec"), main.__dict__)
+            code = 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                code = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+                code = 1
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        # What interpreter shutdown would do
+        threading._shutdown()
+        atexit._run_exitfuncs()
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        os._exit(code)
+
+
+def serve(sock_fd: int, preload: List[str]):
+    """Worker main loop: fork a child per request until the socket closes."""
+    import importlib
+
+    # Like "python3 -c": the script's directory is not on sys.path
+    sys.path[0] = ""
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"pyworker: cannot preload {name}: {e}", file=sys.stderr)
+
+    sock = socket.socket(fileno=sock_fd)
+    wakeup_r, wakeup_w = os.pipe()
+    os.set_blocking(wakeup_w, False)
+    signal.set_wakeup_fd(wakeup_w)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    jobs: Dict[int, int] = {}
+
+    def reap(block: bool = False):
+        while jobs:
+            try:
+                pid, status = os.waitpid(-1, 0 if block else os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            job_id = jobs.pop(pid, None)
+            if job_id is not None:
+                _emit({"event": "exit", "id": job_id, "code": os.waitstatus_to_exitcode(status)})
+
+    _emit({"event": "ready", "pid": os.getpid()})
+    while True:
+        readable, _, _ = select.select([sock, wakeup_r], [], [])
+        if wakeup_r in readable:
+            os.read(wakeup_r, 4096)
+            reap()
+        if sock not in readable:
+            continue
+        data, fds, _, _ = socket.recv_fds(sock, MAX_REQUEST, 2)
+        if not data:
+            break
+        job = json.loads(data)
+        stdout_fd, stderr_fd = fds
+        pid = os.fork()
+        if pid == 0:
+            _run_child(job, stdout_fd, stderr_fd, [sock.fileno(), wakeup_r, wakeup_w])
+        os.close(stdout_fd)
+        os.close(stderr_fd)
+        jobs[pid] = job["id"]
+        _emit({"event": "started", "id": job["id"], "pid": pid})
+    # Runner closed the socket: let runs in flight finish
+    reap(block=True)
+
+
+# ==================== Runner Side ====================
+
+def _rss(pid: int) -> Optional[int]:
+    """Resident memory of a process in bytes (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class WarmProcess:
+    """A run forked by a worker, with the subset of asyncio.subprocess.Process the runner uses."""
+
+    def __init__(self, pid: int, stdout: asyncio.StreamReader, stderr: asyncio.StreamReader,
+                 exited: asyncio.Future, transports: list):
+        self.pid = pid
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode: Optional[int] = None
+        self._exited = exited
+        self._transports = transports
+
+    async def wait(self) -> int:
+        try:
+            self.returncode = await asyncio.shield(self._exited)
+        finally:
+            if self._exited.done():
+                for transport in self._transports:
+                    transport.close()
+        return self.returncode
+
+
+class PythonWorker:
+    """One warm interpreter forking runs."""
+
+    def __init__(self, preload: List[str]):
+        self.preload = preload
+        self.runs = 0
+        self.in_flight = 0
+        self.retired = False
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.base_rss: Optional[int] = None
+        self._sock: Optional[socket.socket] = None
+        self._ready: Optional[asyncio.Future] = None
+        self._jobs: Dict[int, Tuple[asyncio.Future, asyncio.Future]] = {}
+        self._ids = itertools.count(1)
+        self._reader: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None and not self._reader.done()
+
+    async def start(self):
+        parent, child = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                "python3", os.path.abspath(__file__), "--serve", str(child.fileno()), *self.preload,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                pass_fds=(child.fileno(),),
+                env={},
+                start_new_session=True,
+            )
+        finally:
+            child.close()
+        self._sock = parent
+        self._sock.settimeout(5)
+        self._ready = asyncio.get_running_loop().create_future()
+        self._reader = asyncio.create_task(self._read_events())
+        try:
+            await asyncio.wait_for(asyncio.shield(self._ready), START_TIMEOUT)
+        except asyncio.TimeoutError:
+            await self.kill()
+            raise RuntimeError(f"Python worker did not start within {START_TIMEOUT}s") from None
+        except BaseException:
+            await self.kill()
+            raise
+        self.base_rss = _rss(self.process.pid)
+
+    async def kill(self):
+        """Kill the interpreter and everything it forked."""
+        self.retire()
+        if self.process is None:
+            return
+        if self.process.returncode is None:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        await self.process.wait()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+        if self._ready is not None and self._ready.done() and not self._ready.cancelled():
+            # Retrieved, so an unstarted worker's failure is not logged as never retrieved
+            self._ready.exception()
+
+    async def _read_events(self):
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                event = json.loads(line)
+                if event["event"] == "ready":
+                    self._ready.set_result(event["pid"])
+                    continue
+                futures = self._jobs.get(event["id"])
+                if futures is None:
+                    continue
+                if event["event"] == "started":
+                    futures[0].set_result(event["pid"])
+                elif event["event"] == "exit":
+                    del self._jobs[event["id"]]
+                    futures[1].set_result(event["code"])
+        finally:
+            error = RuntimeError("Python worker exited")
+            for future in [self._ready, *itertools.chain.from_iterable(self._jobs.values())]:
+                if future is not None and not future.done():
+                    future.set_exception(error)
+            self._jobs.clear()
+
+    async def spawn(self, script: str, env: Optional[dict]) -> WarmProcess:
+        """Fork a run of a script; returns once it is running."""
+        loop = asyncio.get_running_loop()
+        job_id = next(self._ids)
+        request = json.dumps({"id": job_id, "script": script, "env": env or {}}).encode()
+        if len(request) > MAX_REQUEST:
+            raise ValueError("Script too large for the worker pool")
+        if self._sock is None:
+            raise RuntimeError("Python worker is retired")
+        started, exited = loop.create_future(), loop.create_future()
+        stdout_r, stdout_w = os.pipe()
+        stderr_r, stderr_w = os.pipe()
+        self._jobs[job_id] = (started, exited)
+        try:
+            socket.send_fds(self._sock, [request], [stdout_w, stderr_w])
+        except BaseException:
+            self._jobs.pop(job_id, None)
+            os.close(stdout_r)
+            os.close(stderr_r)
+            raise
+        finally:
+            os.close(stdout_w)
+            os.close(stderr_w)
+
+        self.in_flight += 1
+        exited.add_done_callback(lambda _: self._finished())
+        readers, transports = [], []
+        pending_fds = [stdout_r, stderr_r]
+        try:
+            while pending_fds:
+                reader = asyncio.StreamReader(loop=loop)
+                pipe = os.fdopen(pending_fds[0], "rb", 0)
+                del pending_fds[0]
+                try:
+                    transport, _ = await loop.connect_read_pipe(
+                        lambda: asyncio.StreamReaderProtocol(reader, loop=loop), pipe)
+                except BaseException:
+                    pipe.close()
+                    raise
+                readers.append(reader)
+                transports.append(transport)
+            pid = await started
+        except BaseException:
+            for fd in pending_fds:
+                os.close(fd)
+            for transport in transports:
+                transport.close()
+            raise
+        return WarmProcess(pid, readers[0], readers[1], exited, transports)
+
+    def _finished(self):
+        self.in_flight -= 1
+        self.runs += 1
+
+    def needs_recycling(self, max_runs: int, max_growth: int) -> bool:
+        if self.runs >= max_runs:
+            return True
+        rss = _rss(self.process.pid) if self.process is not None else None
+        return rss is not None and self.base_rss is not None and rss - self.base_rss > max_growth
+
+    def retire(self):
+        """Stop taking runs; the worker exits once its runs in flight finish."""
+        self.retired = True
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    async def stop(self, timeout: float = 5.0):
+        self.retire()
+        if self.process is None:
+            return
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+
+
+class PythonWorkerPool:
+    """Warm interpreters executing python task scripts."""
+
+    def __init__(self, size: int, preload: Optional[List[str]] = None, max_runs: Optional[int] = None,
+                 max_rss_growth_mb: Optional[float] = None):
+        self.size = size
+        self.preload = preload if preload is not None else [
+            name.strip() for name in os.environ.get("STELLAR_PY_POOL_PRELOAD", "").split(",") if name.strip()
+        ]
+        self.max_runs = max_runs or int(os.environ.get("STELLAR_PY_POOL_MAX_RUNS", DEFAULT_MAX_RUNS))
+        self.max_rss_growth = int((max_rss_growth_mb or float(
+            os.environ.get("STELLAR_PY_POOL_MAX_RSS_GROWTH_MB", DEFAULT_MAX_RSS_GROWTH_MB))) * 1024 * 1024)
+        self.workers: List[PythonWorker] = []
+        self._retiring: List[PythonWorker] = []
+        self._lock: Optional[asyncio.Lock] = None
+        # After a failed start, no new worker is started before _retry_at
+        self._backoff = START_BACKOFF
+        self._retry_at = 0.0
+        self.counters = {"runs": 0, "started": 0, "recycled": 0, "crashed": 0, "start_failures": 0}
+
+    async def start(self):
+        """Start workers up to the pool size."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self.workers = [worker for worker in self.workers if worker.alive and not worker.retired]
+            while len(self.workers) < self.size:
+                if time.monotonic() < self._retry_at:
+                    raise RuntimeError(f"Python worker start failed, retrying in "
+                                       f"{self._retry_at - time.monotonic():.0f}s")
+                worker = PythonWorker(self.preload)
+                try:
+                    await worker.start()
+                except Exception:
+                    self.counters["start_failures"] += 1
+                    self._retry_at = time.monotonic() + self._backoff
+                    self._backoff = min(self._backoff * 2, MAX_START_BACKOFF)
+                    raise
+                self._backoff = START_BACKOFF
+                self.workers.append(worker)
+                self.counters["started"] += 1
+
+    async def spawn(self, script: str, env: Optional[dict]) -> WarmProcess:
+        """Fork a run on the least busy worker."""
+        self._recycle()
+        if len(self.workers) < self.size:
+            try:
+                await self.start()
+            except Exception:
+                # Keep using the workers there are; callers fall back without any
+                if not self.workers:
+                    raise
+        worker = min(self.workers, key=lambda w: w.in_flight)
+        self.counters["runs"] += 1
+        return await worker.spawn(script, env)
+
+    def _recycle(self):
+        for worker in list(self.workers):
+            if not worker.alive:
+                self.counters["crashed"] += 1
+            elif worker.needs_recycling(self.max_runs, self.max_rss_growth):
+                self.counters["recycled"] += 1
+                worker.retire()
+                self._retiring.append(worker)
+            else:
+                continue
+            self.workers.remove(worker)
+        self._retiring = [worker for worker in self._retiring if worker.alive]
+
+    async def stop(self):
+        """Stop every worker."""
+        workers, self.workers = self.workers + self._retiring, []
+        self._retiring = []
+        await asyncio.gather(*(worker.stop() for worker in workers), return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "size": self.size,
+            "preload": self.preload,
+            "workers": [{"pid": w.process.pid if w.process else None, "runs": w.runs, "in_flight": w.in_flight,
+                         "rss": _rss(w.process.pid) if w.process else None} for w in self.workers],
+        }
+
+
+if __name__ == "__main__" and len(sys.argv) > 2 and sys.argv[1] == "--serve":
+    serve(int(sys.argv[2]), sys.argv[3:])
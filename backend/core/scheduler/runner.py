@@ -1,35 +1,182 @@
-"""StellarPulse - Task Runner."""
+"""StellarPulse - Task Runner.
+
+Scripts run as child processes in their own session (process group). Their
+stdout/stderr are read in chunks as they arrive into a bounded per-run
+``OutputSink``, which the API can read while the run is still going, and
+passed on in full to the run's log (``backend.services.logstore``) when one
+is given. On timeout or cancellation the whole process group is terminated,
+then killed if it does not exit within a grace period.
+
+With STELLAR_PY_POOL_SIZE > 0, python scripts are forked from warm worker
+interpreters (``pyworker``) instead of starting ``python3 -c``; output,
+timeouts and kills go through the same code.
+"""
 
 import asyncio
-import subprocess
+import codecs
+import logging
+import os
 import shlex
+import signal
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
+
+from backend.core.scheduler.pyworker import PythonWorkerPool
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from a pipe at a time
+READ_CHUNK = 64 * 1024
+# Output kept per run (stdout and stderr together)
+DEFAULT_OUTPUT_LIMIT = 1024 * 1024
+# Seconds between SIGTERM and SIGKILL of a timed out process group
+KILL_GRACE_SECONDS = 5
+
+STREAMS = ("stdout", "stderr")
+
+
+class OutputSink:
+    """Bounded, incrementally decoded stdout/stderr of one run.
+
+    Every chunk is also written to ``log`` (a RunLog or ScopedLog), which is
+    not subject to the limit.
+    """
+
+    def __init__(self, limit: int, log=None):
+        self.limit = limit
+        self.log = log
+        self.size = 0
+        self.truncated_bytes = 0
+        self.finished = False
+        self._parts: Dict[str, list] = {stream: [] for stream in STREAMS}
+        self._lengths: Dict[str, int] = {stream: 0 for stream in STREAMS}
+        self._decoders = {stream: codecs.getincrementaldecoder("utf-8")(errors="replace") for stream in STREAMS}
+        self._changed = asyncio.Event()
+
+    def write(self, stream: str, data: bytes):
+        """Append a chunk; bytes beyond the limit are counted, not kept."""
+        if self.log is not None:
+            self.log.write(stream, data)
+        room = self.limit - self.size
+        if room <= 0:
+            self.truncated_bytes += len(data)
+            return
+        if len(data) > room:
+            self.truncated_bytes += len(data) - room
+            data = data[:room]
+        self.size += len(data)
+        self._append(stream, self._decoders[stream].decode(data))
+
+    def note(self, stream: str, text: str):
+        """Append a runner message, exempt from the limit."""
+        if self.log is not None:
+            self.log.write(stream, text.encode())
+        self._append(stream, text)
+
+    def close(self):
+        """Flush decoders, note truncation and wake readers."""
+        for stream in STREAMS:
+            self._append(stream, self._decoders[stream].decode(b"", final=True))
+        if self.truncated_bytes:
+            # Only the in-memory copy is truncated, not the log
+            self._append("stderr", f"\n[output truncated: {self.truncated_bytes} bytes dropped]\n")
+        self.finished = True
+        self._changed.set()
+
+    def _append(self, stream: str, text: str):
+        if not text:
+            return
+        self._parts[stream].append(text)
+        self._lengths[stream] += len(text)
+        self._changed.set()
+
+    def text(self, stream: str) -> str:
+        parts = self._parts[stream]
+        if len(parts) > 1:
+            # Collapse so repeated reads stay cheap
+            parts[:] = ["".join(parts)]
+        return parts[0] if parts else ""
+
+    def length(self, stream: str) -> int:
+        return self._lengths[stream]
+
+    def read(self, stream: str, offset: int = 0) -> str:
+        """Text of a stream from a character offset."""
+        return self.text(stream)[offset:]
+
+    async def wait(self, stream: str, offset: int, timeout: float) -> bool:
+        """Wait until the stream grows past offset or the run finishes; False on timeout."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.length(stream) <= offset and not self.finished:
+            self._changed.clear()
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+
+def build_command(script: str, script_type: str) -> Optional[list]:
+    """argv for a script, or None if the type is unsupported."""
+    if script_type == "bash":
+        return ["bash", "-c", script]
+    if script_type == "python":
+        return ["python3", "-c", script]
+    if script_type == "shell":
+        return shlex.split(script)
+    return None
+
+
+def _signal_group(pid: int, sig: int):
+    try:
+        os.killpg(pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
 
 
 class TaskRunner:
     """Task execution engine."""
 
-    def __init__(self):
-        self.running_tasks = {}
+    def __init__(self, output_limit: Optional[int] = None):
+        self.output_limit = output_limit or int(os.environ.get("STELLAR_TASK_OUTPUT_LIMIT", DEFAULT_OUTPUT_LIMIT))
+        # run id, or (run id, target) -> live output of runs in progress
+        self.running_tasks: Dict[object, OutputSink] = {}
+        pool_size = int(os.environ.get("STELLAR_PY_POOL_SIZE", 0))
+        self.python_pool = PythonWorkerPool(pool_size) if pool_size > 0 else None
+
+    async def start(self):
+        """Start the python worker pool, if configured."""
+        if self.python_pool is not None:
+            try:
+                await self.python_pool.start()
+            except Exception as e:
+                logger.error(f"Failed to start python worker pool: {e}")
+
+    async def stop(self):
+        """Stop the python worker pool."""
+        if self.python_pool is not None:
+            await self.python_pool.stop()
+
+    def get_output(self, run_id: int, target: Optional[str] = None) -> Optional[OutputSink]:
+        """Live output of a run (or of one of its targets) in progress."""
+        return self.running_tasks.get(run_id if target is None else (run_id, target))
 
     async def run_script(
         self,
         script: str,
         script_type: str = "bash",
         timeout: int = 300,
-        env: dict = None
+        env: dict = None,
+        run_id: Optional[int] = None,
+        log=None
     ) -> dict:
-        """Run a script."""
-
-        cmd = None
-        if script_type == "bash":
-            cmd = ["bash", "-c", script]
-        elif script_type == "python":
-            cmd = ["python3", "-c", script]
-        elif script_type == "shell":
-            cmd = shlex.split(script)
+        """Run a script; with a run_id its output is readable live through get_output."""
 
+        cmd = build_command(script, script_type)
         if not cmd:
             return {
                 "status": "failed",
@@ -38,50 +185,105 @@ class TaskRunner:
                 "exit_code": 1,
                 "duration": 0
             }
+        if script_type == "python" and self.python_pool is not None:
+            return await self._run(lambda sink: self._execute_warm(script, cmd, timeout, env, sink),
+                                   timeout, key=run_id, log=log)
+        return await self.run_command(cmd, timeout, env, key=run_id, log=log)
 
+    async def run_command(
+        self,
+        cmd: list,
+        timeout: float,
+        env: Optional[dict] = None,
+        key=None,
+        output_limit: Optional[int] = None,
+        log=None
+    ) -> dict:
+        """Run an argv; with a key its output is readable live through get_output."""
+        return await self._run(lambda sink: self._execute(cmd, timeout, env, sink), timeout, key,
+                               output_limit, log)
+
+    async def _run(self, execute, timeout: float, key=None, output_limit: Optional[int] = None, log=None) -> dict:
         start_time = datetime.utcnow()
+        sink = OutputSink(output_limit or self.output_limit, log)
+        if key is not None:
+            self.running_tasks[key] = sink
 
         try:
-            result = await asyncio.wait_for(
-                asyncio.to_thread(
-                    subprocess.run,
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                    env=env or {}
-                ),
-                timeout=timeout
-            )
-
-            duration = (datetime.utcnow() - start_time).total_seconds()
-
-            return {
-                "status": "success" if result.returncode == 0 else "failed",
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "exit_code": result.returncode,
-                "duration": duration
-            }
-
+            exit_code = await execute(sink)
+            status = "success" if exit_code == 0 else "failed"
         except asyncio.TimeoutError:
-            duration = (datetime.utcnow() - start_time).total_seconds()
-            return {
-                "status": "failed",
-                "stdout": "",
-                "stderr": f"Task timeout after {timeout} seconds",
-                "exit_code": 124,
-                "duration": duration
-            }
+            sink.note("stderr", f"\nTask timeout after {timeout} seconds\n")
+            exit_code, status = 124, "failed"
         except Exception as e:
-            duration = (datetime.utcnow() - start_time).total_seconds()
-            return {
-                "status": "failed",
-                "stdout": "",
-                "stderr": str(e),
-                "exit_code": 1,
-                "duration": duration
-            }
+            sink.note("stderr", str(e))
+            exit_code, status = 1, "failed"
+        finally:
+            sink.close()
+            if key is not None:
+                self.running_tasks.pop(key, None)
+
+        return {
+            "status": status,
+            "stdout": sink.text("stdout"),
+            "stderr": sink.text("stderr"),
+            "exit_code": exit_code,
+            "duration": (datetime.utcnow() - start_time).total_seconds(),
+            "truncated": sink.truncated_bytes > 0,
+        }
+
+    async def _execute(self, cmd: list, timeout: float, env: Optional[dict], sink: OutputSink) -> int:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env or {},
+            start_new_session=True,
+        )
+        return await self._communicate(process, timeout, sink)
+
+    async def _execute_warm(self, script: str, cmd: list, timeout: float, env: Optional[dict],
+                            sink: OutputSink) -> int:
+        try:
+            process = await self.python_pool.spawn(script, env)
+        except (OSError, RuntimeError, ValueError, asyncio.TimeoutError) as e:
+            logger.warning(f"Python worker pool unavailable, starting python3 instead: {e}")
+            return await self._execute(cmd, timeout, env, sink)
+        return await self._communicate(process, timeout, sink)
+
+    async def _communicate(self, process, timeout: float, sink: OutputSink) -> int:
+        async def pump(stream: str, pipe: asyncio.StreamReader):
+            while True:
+                chunk = await pipe.read(READ_CHUNK)
+                if not chunk:
+                    return
+                sink.write(stream, chunk)
+                if sink.log is not None and sink.log.backlogged():
+                    # Stop reading until the log store catches up instead of buffering without bound
+                    await asyncio.to_thread(sink.log.wait_backlog)
+
+        async def communicate() -> int:
+            await asyncio.gather(pump("stdout", process.stdout), pump("stderr", process.stderr))
+            return await process.wait()
+
+        try:
+            return await asyncio.wait_for(communicate(), timeout)
+        except BaseException:
+            # Timeout or cancellation: take down every process the script started
+            await self._kill(process)
+            raise
+
+    async def _kill(self, process: asyncio.subprocess.Process):
+        if process.returncode is None:
+            _signal_group(process.pid, signal.SIGTERM)
+            try:
+                await asyncio.wait_for(asyncio.shield(process.wait()), KILL_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+        # Also reaps background children still holding the pipes open
+        _signal_group(process.pid, signal.SIGKILL)
+        await process.wait()
 
 
 # Global runner
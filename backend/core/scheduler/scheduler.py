@@ -0,0 +1,326 @@
+"""StellarPulse - Task Scheduler.
+
+Enabled cron and interval tasks sit in a min-heap keyed by their next fire
+time. The loop sleeps until the earliest deadline (or until a task edit
+moves it earlier), creates ``schedule`` runs for every task that is due in
+one transaction and hands them to the executor. Idle cost is one timer per
+deadline regardless of how many tasks are scheduled.
+
+Task edits update the heap incrementally through ``upsert``/``remove``;
+superseded heap entries are skipped when popped. ``Task.next_run_at`` is
+persisted on every fire, so after downtime a task whose fire time passed
+runs once to catch up (if the miss is within STELLAR_SCHEDULER_MISFIRE_GRACE
+seconds, default 3600, 0 for no limit) and then continues on schedule.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import heapq
+import itertools
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from backend.core.scheduler.cron import parse_cron
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MISFIRE_GRACE = 3600
+# Longest sleep, so wall clock changes are picked up
+MAX_SLEEP = 60.0
+# A fire this many seconds late counts as a misfire
+LATE_AFTER = 60.0
+
+SCHEDULE_TYPES = ("manual", "cron", "interval")
+
+
+def validate_schedule(task) -> None:
+    """Raise ValueError if a task's schedule cannot be evaluated."""
+    schedule_type = task.schedule_type or "manual"
+    if schedule_type not in SCHEDULE_TYPES:
+        raise ValueError(f"Unknown schedule type: {schedule_type}")
+    if schedule_type == "cron":
+        if not task.cron_expression:
+            raise ValueError("Cron tasks need a cron_expression")
+        if parse_cron(task.cron_expression).next_after(datetime.utcnow()) is None:
+            raise ValueError(f"Cron expression never fires: {task.cron_expression}")
+    elif schedule_type == "interval":
+        if not task.interval_seconds or task.interval_seconds <= 0:
+            raise ValueError("Interval tasks need a positive interval_seconds")
+
+
+def next_fire_time(task, after: datetime) -> Optional[datetime]:
+    """Next fire time of a task after a moment, or None if it is not scheduled."""
+    if not task.enabled:
+        return None
+    if task.schedule_type == "cron" and task.cron_expression:
+        return parse_cron(task.cron_expression).next_after(after)
+    if task.schedule_type == "interval" and task.interval_seconds and task.interval_seconds > 0:
+        return after + timedelta(seconds=task.interval_seconds)
+    return None
+
+
+class ScheduleEntry:
+    """Schedule of one task."""
+    __slots__ = ("task_id", "schedule_type", "cron_expression", "interval_seconds", "enabled",
+                 "next_run_at", "version")
+
+    def __init__(self, task, version: int):
+        self.task_id = task.id
+        self.schedule_type = task.schedule_type
+        self.cron_expression = task.cron_expression
+        self.interval_seconds = task.interval_seconds
+        self.enabled = task.enabled
+        self.next_run_at: Optional[datetime] = None
+        self.version = version
+
+    def following(self, due: datetime, now: datetime) -> Optional[datetime]:
+        """Next fire time after a fire at ``due``, skipping times already past."""
+        if self.schedule_type == "interval":
+            step = timedelta(seconds=self.interval_seconds)
+            missed = (now - due) // step
+            return due + step * (missed + 1)
+        return next_fire_time(self, max(due, now))
+
+
+class TaskScheduler:
+    """Fires cron and interval tasks from a heap of next fire times."""
+
+    def __init__(self, misfire_grace: Optional[float] = None, executor=None):
+        self.misfire_grace = float(os.environ.get("STELLAR_SCHEDULER_MISFIRE_GRACE", DEFAULT_MISFIRE_GRACE)) \
+            if misfire_grace is None else misfire_grace
+        self._executor = executor
+        # Entries are edited by request threads and read by the loop
+        self._lock = threading.Lock()
+        self._entries: Dict[int, ScheduleEntry] = {}
+        self._heap: List[Tuple[datetime, int, int, int]] = []
+        self._seq = itertools.count()
+        self._versions = itertools.count()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.counters = {"fired": 0, "misfires_caught_up": 0, "misfires_skipped": 0, "overlaps_skipped": 0,
+                         "rejected": 0}
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            from backend.core.scheduler.executor import get_task_executor
+            self._executor = get_task_executor()
+        return self._executor
+
+    # ==================== Schedule Index ====================
+
+    def load_from_db(self):
+        """Schedule every enabled cron/interval task."""
+        from backend.database import SessionLocal
+        from backend import models
+
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            tasks = db.query(models.Task).filter(
+                models.Task.enabled.is_(True),
+                models.Task.schedule_type.in_(("cron", "interval")),
+            ).all()
+            for task in tasks:
+                if task.next_run_at is None:
+                    # Never scheduled before: continue from the last run
+                    task.next_run_at = next_fire_time(task, task.last_run_at or now)
+                self.upsert(task)
+            db.commit()
+        finally:
+            db.close()
+        logger.info(f"Scheduler loaded {len(self._entries)} tasks")
+
+    def upsert(self, task):
+        """Add, reschedule or unschedule a task from its current row."""
+        with self._lock:
+            entry = ScheduleEntry(task, next(self._versions))
+            entry.next_run_at = task.next_run_at if task.enabled else None
+            if entry.next_run_at is None:
+                self._entries.pop(task.id, None)
+                return
+            self._entries[task.id] = entry
+            earliest = not self._heap or entry.next_run_at < self._heap[0][0]
+            heapq.heappush(self._heap, (entry.next_run_at, next(self._seq), task.id, entry.version))
+            self._compact()
+        if earliest:
+            self._wake()
+
+    def remove(self, task_id: int):
+        """Unschedule a task."""
+        with self._lock:
+            self._entries.pop(task_id, None)
+
+    def _compact(self):
+        # Superseded entries are dropped lazily; rebuild once they dominate
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(entry.next_run_at, next(self._seq), entry.task_id, entry.version)
+                          for entry in self._entries.values()]
+            heapq.heapify(self._heap)
+
+    def _current(self, item) -> Optional[ScheduleEntry]:
+        entry = self._entries.get(item[2])
+        if entry is None or entry.version != item[3]:
+            return None
+        return entry
+
+    def _wake(self):
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    # ==================== Loop ====================
+
+    def start(self):
+        """Start the scheduling loop on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the scheduling loop."""
+        task, self._task = self._task, None
+        self._loop = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def _delay(self) -> Optional[float]:
+        """Seconds until the earliest deadline, None if nothing is scheduled."""
+        with self._lock:
+            while self._heap and self._current(self._heap[0]) is None:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return None
+            return (self._heap[0][0] - datetime.utcnow()).total_seconds()
+
+    async def _run(self):
+        while True:
+            delay = self._delay()
+            if delay is None or delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), MAX_SLEEP if delay is None else min(delay, MAX_SLEEP))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._fire_due()
+            except Exception as e:
+                logger.error(f"Scheduler tick failed: {e}")
+                await asyncio.sleep(1)
+
+    def _pop_due(self, now: datetime) -> List[Tuple[ScheduleEntry, datetime, bool]]:
+        """(entry, missed fire time, run it) for every due task, rescheduling each."""
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                item = heapq.heappop(self._heap)
+                entry = self._current(item)
+                if entry is None:
+                    continue
+                fire_at = entry.next_run_at
+                late = (now - fire_at).total_seconds()
+                run = not (self.misfire_grace > 0 and late > self.misfire_grace)
+                entry.next_run_at = entry.following(fire_at, now)
+                if entry.next_run_at is None:
+                    del self._entries[entry.task_id]
+                else:
+                    entry.version = next(self._versions)
+                    heapq.heappush(self._heap, (entry.next_run_at, next(self._seq), entry.task_id, entry.version))
+                due.append((entry, fire_at, run))
+        return due
+
+    async def _fire_due(self):
+        now = datetime.utcnow()
+        due = self._pop_due(now)
+        if not due:
+            return
+        runs = await asyncio.to_thread(self._record, due, now)
+        for run_id, task_id in runs:
+            if not self.executor.submit(run_id, task_id, "schedule"):
+                # Left pending; the executor picks it up again on restart
+                self.counters["rejected"] += 1
+
+    def _record(self, due: List[Tuple[ScheduleEntry, datetime, bool]], now: datetime) -> List[Tuple[int, int]]:
+        """Create the runs of due tasks and persist next fire times in one transaction."""
+        from backend.database import SessionLocal
+        from backend import models
+
+        task_ids = [entry.task_id for entry, _, _ in due]
+        db = SessionLocal()
+        try:
+            tasks = {task.id: task for task in db.query(models.Task).filter(models.Task.id.in_(task_ids))}
+            # Tasks whose previous run has not even started yet
+            waiting = {task_id for task_id, in db.query(models.TaskRun.task_id).filter(
+                models.TaskRun.task_id.in_(task_ids), models.TaskRun.status == "pending"
+            ).distinct()}
+            runs = []
+            for entry, fire_at, run in due:
+                task = tasks.get(entry.task_id)
+                if task is None or not task.enabled:
+                    self.remove(entry.task_id)
+                    continue
+                with self._lock:
+                    if self._entries.get(task.id) is entry:
+                        # Unless the task was edited meanwhile
+                        task.next_run_at = entry.next_run_at
+                late = (now - fire_at).total_seconds() >= LATE_AFTER
+                if not run:
+                    self.counters["misfires_skipped"] += 1
+                    logger.warning(f"Skipped run of task {task.id} missed at {fire_at.isoformat()}")
+                    continue
+                if task.id in waiting:
+                    self.counters["overlaps_skipped"] += 1
+                    continue
+                if late:
+                    self.counters["misfires_caught_up"] += 1
+                task_run = models.TaskRun(task_id=task.id, status="pending", triggered_by="schedule",
+                                          trigger_params={"scheduled_for": fire_at.isoformat()})
+                db.add(task_run)
+                runs.append(task_run)
+            db.flush()
+            result = [(task_run.id, task_run.task_id) for task_run in runs]
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        self.counters["fired"] += len(result)
+        return result
+
+    def stats(self) -> dict:
+        """Scheduled task count, next deadline and fire counters."""
+        with self._lock:
+            upcoming = min((entry.next_run_at for entry in self._entries.values()), default=None)
+            scheduled = len(self._entries)
+            heap_size = len(self._heap)
+        return {
+            **self.counters,
+            "scheduled": scheduled,
+            "heap_size": heap_size,
+            "next_run_at": upcoming.isoformat() if upcoming else None,
+            "misfire_grace": self.misfire_grace,
+        }
+
+
+# Global scheduler instance
+_task_scheduler = None
+
+
+def get_task_scheduler() -> TaskScheduler:
+    """Get task scheduler instance."""
+    global _task_scheduler
+    if _task_scheduler is None:
+        _task_scheduler = TaskScheduler()
+    return _task_scheduler
@@ -0,0 +1,233 @@
+"""StellarPulse - Task Run Statistics.
+
+Finished runs are counted into ``task_run_rollups`` in the transaction that
+records their outcome: one row per task, hour and duration bucket holding
+run, success and failure counts and the summed duration. Durations are
+bucketed on a log scale (each bucket BUCKET_RATIO wider than the previous),
+so success rates and p50/p95 durations over a window of whole hours come
+from a few rollup rows per task instead of a scan of ``task_runs``.
+Percentiles are the upper bound of their bucket, within 19% of the exact
+value.
+
+Rollups are incremented with an upsert, so runs finishing concurrently
+never lose counts. They are kept for STELLAR_TASK_STATS_DAYS (default 90)
+and pruned by the retention pass.
+"""
+
+from datetime import datetime, timedelta
+import logging
+import math
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATS_DAYS = 90
+# Upper bound of duration bucket 0, seconds
+MIN_DURATION = 0.001
+BUCKET_RATIO = 2 ** 0.25
+# About 12 days; longer runs share the last bucket
+MAX_BUCKET = 120
+# Bucket of runs that ended without a duration (never started, interrupted)
+NO_DURATION = -1
+# Statuses of runs that have not finished
+UNFINISHED = ("pending", "running")
+
+
+def duration_bucket(duration: Optional[float]) -> int:
+    """Log-scale bucket of a run duration."""
+    if duration is None:
+        return NO_DURATION
+    if duration <= MIN_DURATION:
+        return 0
+    return min(math.ceil(math.log(duration / MIN_DURATION, BUCKET_RATIO)), MAX_BUCKET)
+
+
+def bucket_upper_bound(bucket: int) -> float:
+    return MIN_DURATION * BUCKET_RATIO ** bucket
+
+
+def hour_start(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def window_start(hours: int, now: Optional[datetime] = None) -> datetime:
+    """Start of the last ``hours`` whole hours, the current one included."""
+    return hour_start(now or datetime.utcnow()) - timedelta(hours=hours - 1)
+
+
+def _increment(db, rows: List[dict]):
+    from backend import models
+
+    table = models.TaskRunRollup.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["task_id", "bucket_start", "duration_bucket"],
+        set_={column: table.c[column] + stmt.excluded[column]
+              for column in ("runs", "successes", "failures", "duration_sum")},
+    )
+    db.execute(stmt, rows)
+
+
+def _rollup_row(task_id: int, status: str, duration: Optional[float], finished_at: Optional[datetime]) -> dict:
+    success = status == "success"
+    return {
+        "task_id": task_id,
+        "bucket_start": hour_start(finished_at or datetime.utcnow()),
+        "duration_bucket": duration_bucket(duration),
+        "runs": 1,
+        "successes": int(success),
+        "failures": int(not success),
+        "duration_sum": duration or 0.0,
+    }
+
+
+def record_runs(db, task_runs: Iterable):
+    """Count finished runs into their tasks' rollups; committed with the caller's transaction."""
+    rows = [_rollup_row(task_run.task_id, task_run.status, task_run.duration, task_run.finished_at)
+            for task_run in task_runs if task_run.task_id is not None]
+    if rows:
+        _increment(db, rows)
+
+
+def record_run(db, task_run):
+    """Count a finished run into its task's rollup; committed with the caller's transaction."""
+    record_runs(db, [task_run])
+
+
+def rebuild_if_empty(batch_size: int = 5000) -> int:
+    """Build the rollups from existing runs once, when none exist yet; returns runs counted."""
+    from backend.database import SessionLocal
+    from backend import models
+
+    db = SessionLocal()
+    try:
+        if db.query(models.TaskRunRollup.task_id).first() is not None:
+            return 0
+        counted = 0
+        rollups: Dict[Tuple[int, datetime, int], dict] = {}
+        query = db.query(models.TaskRun.task_id, models.TaskRun.status, models.TaskRun.duration,
+                         models.TaskRun.finished_at, models.TaskRun.created_at).filter(
+            models.TaskRun.task_id.isnot(None),
+            models.TaskRun.status.notin_(UNFINISHED),
+        )
+        for task_id, status, duration, finished_at, created_at in query.yield_per(batch_size):
+            row = _rollup_row(task_id, status, duration, finished_at or created_at)
+            key = (row["task_id"], row["bucket_start"], row["duration_bucket"])
+            total = rollups.get(key)
+            if total is None:
+                rollups[key] = row
+            else:
+                for column in ("runs", "successes", "failures", "duration_sum"):
+                    total[column] += row[column]
+            counted += 1
+        if rollups:
+            _increment(db, list(rollups.values()))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    if counted:
+        logger.info(f"Built task run rollups from {counted} runs")
+    return counted
+
+
+def prune(now: Optional[datetime] = None, days: Optional[int] = None) -> int:
+    """Delete rollups older than the stats horizon; returns rows deleted."""
+    from backend.database import SessionLocal
+    from backend import models
+
+    days = int(os.environ.get("STELLAR_TASK_STATS_DAYS", DEFAULT_STATS_DAYS)) if days is None else days
+    if days <= 0:
+        return 0
+    cutoff = hour_start(now or datetime.utcnow()) - timedelta(days=days)
+    db = SessionLocal()
+    try:
+        deleted = db.query(models.TaskRunRollup).filter(
+            models.TaskRunRollup.bucket_start < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _percentile(histogram: List[Tuple[int, int]], timed: int, q: float) -> float:
+    rank = max(1, math.ceil(q * timed))
+    seen = 0
+    for bucket, count in histogram:
+        seen += count
+        if seen >= rank:
+            return round(bucket_upper_bound(bucket), 4)
+    return round(bucket_upper_bound(histogram[-1][0]), 4)
+
+
+def _summary(task_id: int, totals: dict, histogram: List[Tuple[int, int]]) -> dict:
+    histogram.sort()
+    timed = sum(count for _, count in histogram)
+    return {
+        "task_id": task_id,
+        "runs": totals["runs"],
+        "successes": totals["successes"],
+        "failures": totals["failures"],
+        "success_rate": round(totals["successes"] / totals["runs"], 4) if totals["runs"] else None,
+        "duration_avg": round(totals["duration_sum"] / timed, 4) if timed else None,
+        "duration_p50": _percentile(histogram, timed, 0.5) if timed else None,
+        "duration_p95": _percentile(histogram, timed, 0.95) if timed else None,
+    }
+
+
+def task_stats(db, since: datetime, task_ids: Optional[List[int]] = None) -> List[dict]:
+    """Run counts, success rate and duration percentiles per task for runs finished since a time."""
+    from backend import models
+
+    rollup = models.TaskRunRollup
+    query = db.query(
+        rollup.task_id, rollup.duration_bucket, func.sum(rollup.runs), func.sum(rollup.successes),
+        func.sum(rollup.failures), func.sum(rollup.duration_sum),
+    ).filter(rollup.bucket_start >= since)
+    if task_ids is not None:
+        query = query.filter(rollup.task_id.in_(task_ids))
+    totals: Dict[int, dict] = {}
+    histograms: Dict[int, List[Tuple[int, int]]] = {}
+    for task_id, bucket, runs, successes, failures, duration_sum in query.group_by(
+        rollup.task_id, rollup.duration_bucket
+    ):
+        total = totals.setdefault(task_id, {"runs": 0, "successes": 0, "failures": 0, "duration_sum": 0.0})
+        total["runs"] += runs
+        total["successes"] += successes
+        total["failures"] += failures
+        total["duration_sum"] += duration_sum
+        histogram = histograms.setdefault(task_id, [])
+        if bucket != NO_DURATION:
+            histogram.append((bucket, runs))
+    return [_summary(task_id, totals[task_id], histograms[task_id]) for task_id in sorted(totals)]
+
+
+def task_summary(db, task_id: int, since: datetime) -> dict:
+    """task_stats of one task, with zero counts if it has no finished runs since the time."""
+    stats = task_stats(db, since, [task_id])
+    if stats:
+        return stats[0]
+    return _summary(task_id, {"runs": 0, "successes": 0, "failures": 0, "duration_sum": 0.0}, [])
+
+
+def task_series(db, task_id: int, since: datetime) -> List[dict]:
+    """Hourly run counts of a task since a time, oldest first; hours without runs are left out."""
+    from backend import models
+
+    rollup = models.TaskRunRollup
+    query = db.query(
+        rollup.bucket_start, func.sum(rollup.runs), func.sum(rollup.successes), func.sum(rollup.failures)
+    ).filter(rollup.task_id == task_id, rollup.bucket_start >= since)
+    return [{"bucket_start": bucket_start.isoformat(), "runs": runs, "successes": successes, "failures": failures}
+            for bucket_start, runs, successes, failures in query.group_by(rollup.bucket_start)
+            .order_by(rollup.bucket_start)]
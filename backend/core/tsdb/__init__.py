@@ -0,0 +1 @@
+"""Time-Series Package."""
@@ -0,0 +1,271 @@
+"""StellarPulse - Embedded Time-Series Store.
+
+Every series keeps its raw points in a fixed-size ring buffer plus three
+rollup tiers (1m/5m/1h buckets with min/max/sum/count). Buffers grow up to
+their capacity and then wrap, so a series never exceeds a fixed size
+(SERIES_BYTES, about 21 KB).
+
+The number of series is capped (by default from STELLAR_TSDB_MAX_MEMORY_MB).
+At the cap, a new series replaces the least recently written one only if
+that series has not been written for EVICT_IDLE_SECONDS; otherwise the new
+series is rejected and counted. Series seen in every scrape therefore keep
+their history even when one scrape carries more keys than the cap, instead
+of evicting each other.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import timezone
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (cluster, metric_name, target_type, target_name)
+SeriesKey = Tuple[str, str, str, str]
+
+# Raw points per series (1h at a 15s scrape interval)
+RAW_CAPACITY = 240
+
+# Rollup resolution in seconds -> buckets kept
+ROLLUPS = {
+    "1m": (60, 180),     # 3 hours
+    "5m": (300, 288),    # 1 day
+    "1h": (3600, 168),   # 7 days
+}
+
+# Bytes of one full series: raw (timestamp, value) plus (start, min, max, sum, count) buckets
+SERIES_BYTES = RAW_CAPACITY * (8 + 4) + sum(capacity for _, capacity in ROLLUPS.values()) * (8 + 4 + 4 + 8 + 4)
+DEFAULT_MAX_MEMORY_MB = 512
+# A series written this recently is never evicted to make room
+EVICT_IDLE_SECONDS = 300
+
+
+class _Ring:
+    """Parallel fixed-capacity arrays written as a ring; oldest entries are overwritten."""
+    __slots__ = ("capacity", "columns", "head", "size")
+
+    def __init__(self, capacity: int, typecodes: Tuple[str, ...]):
+        self.capacity = capacity
+        self.columns = tuple(array(code) for code in typecodes)
+        self.head = 0  # next write position once full
+        self.size = 0
+
+    def append(self, *values):
+        if self.size < self.capacity:
+            for column, value in zip(self.columns, values):
+                column.append(value)
+            self.size += 1
+            return
+        for column, value in zip(self.columns, values):
+            column[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+
+    def last_index(self) -> int:
+        return (self.head - 1) % self.size if self.size == self.capacity else self.size - 1
+
+    def ordered(self, column: int) -> array:
+        """One column in time order, as a contiguous array."""
+        values = self.columns[column]
+        if self.size < self.capacity or self.head == 0:
+            return values
+        return values[self.head:] + values[:self.head]
+
+
+class Series:
+    """Raw ring buffer plus downsampled rollups for one time series."""
+    __slots__ = ("raw", "rollups")
+
+    def __init__(self):
+        self.raw = _Ring(RAW_CAPACITY, ("d", "f"))
+        # bucket start, min, max, sum, count
+        self.rollups = {name: _Ring(capacity, ("d", "f", "f", "d", "I"))
+                        for name, (_, capacity) in ROLLUPS.items()}
+
+    def add(self, ts: float, value: float):
+        self.raw.append(ts, value)
+        for name, (resolution, _) in ROLLUPS.items():
+            ring = self.rollups[name]
+            start = ts - ts % resolution
+            if ring.size:
+                i = ring.last_index()
+                starts, mins, maxs, sums, counts = ring.columns
+                if starts[i] == start:
+                    mins[i] = min(mins[i], value)
+                    maxs[i] = max(maxs[i], value)
+                    sums[i] += value
+                    counts[i] += 1
+                    continue
+            ring.append(start, value, value, value, 1)
+
+    def last_time(self) -> float:
+        return self.raw.columns[0][self.raw.last_index()]
+
+    def oldest(self, resolution: str) -> Optional[float]:
+        ring = self.raw if resolution == "raw" else self.rollups[resolution]
+        if not ring.size:
+            return None
+        return ring.columns[0][ring.head if ring.size == ring.capacity else 0]
+
+    def query(self, start: float, end: float, resolution: str, agg: str = "avg") -> Tuple[List[float], List[float]]:
+        """Points in [start, end] at one resolution."""
+        if resolution == "raw":
+            times = self.raw.ordered(0)
+            lo, hi = bisect_left(times, start), bisect_right(times, end)
+            return times[lo:hi].tolist(), self.raw.ordered(1)[lo:hi].tolist()
+
+        ring = self.rollups[resolution]
+        times = ring.ordered(0)
+        lo, hi = bisect_left(times, start), bisect_right(times, end)
+        if agg == "min":
+            values = ring.ordered(1)[lo:hi].tolist()
+        elif agg == "max":
+            values = ring.ordered(2)[lo:hi].tolist()
+        else:
+            sums, counts = ring.ordered(3)[lo:hi], ring.ordered(4)[lo:hi]
+            values = [s / c for s, c in zip(sums, counts)]
+        return times[lo:hi].tolist(), values
+
+    def pick_resolution(self, start: float) -> str:
+        """Finest resolution that still holds everything since start."""
+        for resolution in ("raw", *ROLLUPS):
+            ring = self.raw if resolution == "raw" else self.rollups[resolution]
+            # A ring that has never wrapped holds the whole series
+            if ring.size < ring.capacity or self.oldest(resolution) <= start:
+                return resolution
+        return list(ROLLUPS)[-1]
+
+
+class TimeSeriesStore:
+    """Memory-bounded in-process store of metric series."""
+
+    def __init__(self, max_series: Optional[int] = None):
+        if max_series is None:
+            max_series = int(os.environ.get("STELLAR_TSDB_MAX_SERIES", 0)) or \
+                int(os.environ.get("STELLAR_TSDB_MAX_MEMORY_MB", DEFAULT_MAX_MEMORY_MB)) * 1024 * 1024 // SERIES_BYTES
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._series: "OrderedDict[SeriesKey, Series]" = OrderedDict()
+        # (cluster, metric_name, target_type) -> target names, for bulk queries
+        self._index: Dict[Tuple[str, str, str], set] = {}
+        self.evicted = 0
+        self.rejected = 0
+
+    def add(self, key: SeriesKey, value: float, ts: Optional[float] = None):
+        """Record one point."""
+        self.add_many([(key, value)], ts)
+
+    def add_many(self, points: List[Tuple[SeriesKey, float]], ts: Optional[float] = None):
+        """Record points sharing one timestamp (one scrape)."""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            series_map = self._series
+            for key, value in points:
+                series = series_map.get(key)
+                if series is None:
+                    if len(series_map) >= self.max_series and not self._evict(ts):
+                        self.rejected += 1
+                        continue
+                    series = series_map[key] = Series()
+                    self._index.setdefault(key[:3], set()).add(key[3])
+                else:
+                    series_map.move_to_end(key)
+                series.add(ts, value)
+
+    def _evict(self, now: float) -> bool:
+        """Drop the least recently written series if it is idle; False if none is."""
+        if not self._series:
+            return False
+        key, series = next(iter(self._series.items()))
+        if series.last_time() > now - EVICT_IDLE_SECONDS:
+            return False
+        del self._series[key]
+        names = self._index.get(key[:3])
+        if names is not None:
+            names.discard(key[3])
+            if not names:
+                del self._index[key[:3]]
+        self.evicted += 1
+        return True
+
+    def query(self, key: SeriesKey, start: float, end: float, resolution: str = "auto",
+              agg: str = "avg") -> Tuple[List[float], List[float]]:
+        """Range query for one series."""
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                return [], []
+            if resolution == "auto":
+                resolution = series.pick_resolution(start)
+            return series.query(start, end, resolution, agg)
+
+    def query_many(self, cluster: str, metric_name: str, target_type: str, start: float, end: float,
+                   resolution: str = "auto", agg: str = "avg") -> Dict[str, Tuple[List[float], List[float]]]:
+        """Range query for every target of one metric."""
+        with self._lock:
+            result = {}
+            for target_name in self._index.get((cluster, metric_name, target_type), ()):
+                series = self._series[(cluster, metric_name, target_type, target_name)]
+                res = series.pick_resolution(start) if resolution == "auto" else resolution
+                result[target_name] = series.query(start, end, res, agg)
+            return result
+
+    def series_keys(self, cluster: Optional[str] = None) -> List[SeriesKey]:
+        """Stored series keys, optionally for one cluster."""
+        with self._lock:
+            return [key for key in self._series if cluster is None or key[0] == cluster]
+
+    def stats(self) -> dict:
+        """Series count and eviction/rejection counters."""
+        with self._lock:
+            return {"series": len(self._series), "max_series": self.max_series, "evicted": self.evicted,
+                    "rejected": self.rejected}
+
+    # ==================== Collector Feed ====================
+
+    def record_snapshot(self, cluster: str, snapshot, ts: Optional[float] = None):
+        """Record node, pod and cluster metrics of one ClusterSnapshot."""
+        if snapshot.failed:
+            return
+        ts = snapshot.taken_at.replace(tzinfo=timezone.utc).timestamp() if ts is None else ts
+        points: List[Tuple[SeriesKey, float]] = []
+
+        # Cluster and node series first, so they are kept when pods exceed the series cap
+        overview = snapshot.overview()
+        for metric, value in (("cpu_percent", overview["usage"]["cpu_percent"]),
+                              ("memory_percent", overview["usage"]["memory_percent"]),
+                              ("nodes", overview["cluster"]["nodes"]),
+                              ("pods", overview["cluster"]["pods"]),
+                              ("pods_running", overview["pods"]["running"]),
+                              ("pods_pending", overview["pods"]["pending"])):
+            points.append(((cluster, metric, "cluster", cluster), value))
+
+        nodes = snapshot.nodes
+        for metric in ("cpu_percent", "memory_percent", "cpu_usage", "memory_usage"):
+            column = getattr(nodes, metric)
+            points.extend(((cluster, metric, "node", name), column[i]) for i, name in enumerate(nodes.names))
+
+        pods = snapshot.pods
+        namespaces = pods.namespaces.values
+        pod_names = [f"{namespaces[code]}/{name}" for name, code in zip(pods.names, pods.namespace)]
+        for metric in ("cpu_percent", "memory_percent", "restarts"):
+            column = getattr(pods, metric)
+            points.extend(((cluster, metric, "pod", name), column[i]) for i, name in enumerate(pod_names))
+
+        self.add_many(points, ts)
+
+
+# Global store instance
+_store = None
+
+
+def get_tsdb() -> TimeSeriesStore:
+    """Get time-series store instance."""
+    global _store
+    if _store is None:
+        _store = TimeSeriesStore()
+    return _store
@@ -1,5 +1,6 @@
 """StellarPulse Backend - FastAPI Application."""
 
+import logging
 import os
 import sys
 from contextlib import asynccontextmanager
@@ -12,6 +13,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backend.database import init_db
 from backend.api.routes import router
 
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -19,9 +21,66 @@ async def lifespan(app: FastAPI):
     # Startup
     # Skip init_db for now
     # init_db()
+    from backend.core.alerting.engine import get_alert_engine
+    from backend.core.alerting.state import get_active_alerts
+    from backend.core.collector.scraper import get_scraper
+    from backend.core.events.broker import get_broker, publish_overview
+    from backend.core.scheduler.executor import get_task_executor
+    from backend.core.scheduler.runner import get_task_runner
+    from backend.core.scheduler.scheduler import get_task_scheduler
+    from backend.core.scheduler.stats import rebuild_if_empty
+    from backend.core.tsdb.store import get_tsdb
+    from backend.services.notifier import get_notifier
+    from backend.services.retention import get_retention
+
+    engine = get_alert_engine()
+    try:
+        engine.load_from_db()
+        get_active_alerts().load_from_db()
+    except Exception as e:
+        logger.error(f"Failed to load alert state: {e}")
+
+    broker = get_broker()
+    broker.start()
+    notifier = get_notifier()
+    notifier.start()
+    retention = get_retention()
+    retention.start()
+    runner = get_task_runner()
+    await runner.start()
+    try:
+        rebuild_if_empty()
+    except Exception as e:
+        logger.error(f"Failed to build task run rollups: {e}")
+    executor = get_task_executor()
+    executor.start()
+    try:
+        executor.recover()
+    except Exception as e:
+        logger.error(f"Failed to recover task runs: {e}")
+    scheduler = get_task_scheduler()
+    try:
+        scheduler.load_from_db()
+    except Exception as e:
+        logger.error(f"Failed to load task schedules: {e}")
+    scheduler.start()
+
+    scraper = get_scraper()
+    scraper.add_listener(get_tsdb().record_snapshot)
+    scraper.add_listener(engine.on_snapshot)
+    scraper.add_listener(publish_overview)
+    scraper.start()
     yield
     # Shutdown
-    pass
+    await scraper.stop()
+    await notifier.stop()
+    await retention.stop()
+    await scheduler.stop()
+    await executor.stop()
+    await runner.stop()
+    broker.stop()
+    from backend.core.collector.kubernetes import close_k8s_collector
+    close_k8s_collector()
 
 
 # Create FastAPI app
@@ -39,6 +98,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Continue", "X-Next-Cursor", "X-Log-Size", "X-Log-Range"],
 )
 
 # Include routers
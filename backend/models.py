@@ -3,7 +3,7 @@
 import os
 import sys
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 # Add current directory to path
@@ -30,6 +30,8 @@ class AlertRule(Base):
     metric_name = Column(String(100), nullable=False)  # cpu, memory, pod_status, etc.
     condition = Column(String(50), nullable=False)  # gt, lt, eq, gte, lte
     threshold = Column(Float, nullable=False)
+    aggregation = Column(String(20))  # None for the current value, or avg, min, max, delta, rate
+    window_seconds = Column(Integer)  # window of the aggregation
 
     # Target
     target_type = Column(String(50))  # node, pod, service
@@ -65,6 +67,9 @@ class Alert(Base):
     target_type = Column(String(50))
     target_name = Column(String(255))
 
+    # Deduplication key: hash of rule id + target type + target name
+    fingerprint = Column(String(40), index=True)
+
     # Resolution
     acknowledged_by = Column(String(100))
     acknowledged_at = Column(DateTime)
@@ -76,6 +81,15 @@ class Alert(Base):
     # Relationships
     rule = relationship("AlertRule", back_populates="alerts")
 
+    # Keyset pagination on (created_at, id), alone or behind an equality filter
+    __table_args__ = (
+        Index("ix_alerts_created_id", "created_at", "id"),
+        Index("ix_alerts_status_created_id", "status", "created_at", "id"),
+        Index("ix_alerts_severity_created_id", "severity", "created_at", "id"),
+        Index("ix_alerts_target_created_id", "target_type", "target_name", "created_at", "id"),
+        {'extend_existing': True},
+    )
+
 
 # ==================== Task Models ====================
 
@@ -104,9 +118,13 @@ class Task(Base):
     timeout = Column(Integer, default=300)  # seconds
     last_run_at = Column(DateTime)
     last_status = Column(String(20))  # success, failed, running
+    next_run_at = Column(DateTime)  # next scheduled fire (cron/interval)
 
     # Targets
     targets = Column(JSON, default=list)  # target servers/containers
+    target_concurrency = Column(Integer, default=10)  # targets running at once
+    target_timeout = Column(Integer)  # seconds per target, defaults to timeout
+    failure_policy = Column(String(20), default="continue")  # continue, fail_fast
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -133,6 +151,7 @@ class TaskRun(Base):
     stdout = Column(Text)
     stderr = Column(Text)
     exit_code = Column(Integer)
+    target_results = Column(JSON)  # per-target status and output of multi-target runs
 
     # Trigger
     triggered_by = Column(String(50))  # manual, schedule, api
@@ -144,6 +163,32 @@ class TaskRun(Base):
     # Relationships
     task = relationship("Task", back_populates="runs")
 
+    # Keyset pagination of one task's history, alone or filtered by status
+    __table_args__ = (
+        Index("ix_task_runs_task_created_id", "task_id", "created_at", "id"),
+        Index("ix_task_runs_task_status_created_id", "task_id", "status", "created_at", "id"),
+        {'extend_existing': True},
+    )
+
+
+class TaskRunRollup(Base):
+    """Finished runs of a task per hour and duration bucket."""
+    __tablename__ = "task_run_rollups"
+
+    task_id = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)  # hour the runs finished in
+    duration_bucket = Column(Integer, primary_key=True)  # log-scale duration bucket, -1 without duration
+
+    runs = Column(Integer, nullable=False, default=0)
+    successes = Column(Integer, nullable=False, default=0)
+    failures = Column(Integer, nullable=False, default=0)
+    duration_sum = Column(Float, nullable=False, default=0.0)  # seconds
+
+    __table_args__ = (
+        Index("ix_task_run_rollups_bucket", "bucket_start"),
+        {'extend_existing': True},
+    )
+
 
 # ==================== Knowledge Models ====================
 
@@ -15,6 +15,8 @@ class AlertRuleBase(BaseModel):
     metric_name: str
     condition: str
     threshold: float
+    aggregation: Optional[str] = None
+    window_seconds: Optional[int] = None
     target_type: Optional[str] = None
     target_name: Optional[str] = None
     severity: str = "warning"
@@ -34,6 +36,8 @@ class AlertRuleUpdate(BaseModel):
     metric_name: Optional[str] = None
     condition: Optional[str] = None
     threshold: Optional[float] = None
+    aggregation: Optional[str] = None
+    window_seconds: Optional[int] = None
     target_type: Optional[str] = None
     target_name: Optional[str] = None
     severity: Optional[str] = None
@@ -65,6 +69,7 @@ class AlertResponse(AlertBase):
     id: int
     rule_id: Optional[int]
     status: str
+    fingerprint: Optional[str] = None
     acknowledged_by: Optional[str]
     acknowledged_at: Optional[datetime]
     resolved_at: Optional[datetime]
@@ -94,6 +99,9 @@ class TaskBase(BaseModel):
     enabled: bool = True
     timeout: int = 300
     targets: List[str] = []
+    target_concurrency: int = 10
+    target_timeout: Optional[int] = None
+    failure_policy: str = "continue"
 
 
 class TaskCreate(TaskBase):
@@ -113,6 +121,9 @@ class TaskUpdate(BaseModel):
     enabled: Optional[bool] = None
     timeout: Optional[int] = None
     targets: Optional[List[str]] = None
+    target_concurrency: Optional[int] = None
+    target_timeout: Optional[int] = None
+    failure_policy: Optional[str] = None
 
 
 class TaskResponse(TaskBase):
@@ -120,6 +131,7 @@ class TaskResponse(TaskBase):
     id: int
     last_run_at: Optional[datetime]
     last_status: Optional[str]
+    next_run_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
@@ -145,6 +157,11 @@ class TaskRunResponse(BaseModel):
         from_attributes = True
 
 
+class TaskRunDetailResponse(TaskRunResponse):
+    """Task run with the status, exit code and duration of each target."""
+    target_results: Optional[List[Any]] = None
+
+
 class TaskRunCreate(BaseModel):
     """Create task run."""
     triggered_by: str = "manual"
@@ -297,6 +314,8 @@ class ServiceStatus(BaseModel):
     cluster_ip: str
     ports: List[dict]
     endpoints: int
+    ready_endpoints: int = 0
+    not_ready_endpoints: int = 0
     selector: dict = {}
 
 
@@ -0,0 +1,301 @@
+"""StellarPulse - Task Run Log Store.
+
+Run output is written to disk as it arrives instead of into the TaskRun
+row, which keeps only a short head/tail preview. Each stream of a run is a
+pair of files under ``<log dir>/<run id // 1000>/<run id>/``:
+
+- ``<stream>.log``: independently zlib-compressed chunks of CHUNK_SIZE raw
+  bytes (the last one may be shorter), appended in order
+- ``<stream>.idx``: one fixed-size record per chunk (compressed offset,
+  compressed length, raw length)
+
+Because every chunk but the last holds exactly CHUNK_SIZE bytes, a byte
+range maps directly to the chunks covering it, so ranges and tails are read
+by decompressing only those chunks. Chunks are appended before their index
+record, so a log can be read while it is still being written; a reader sees
+everything up to the last complete chunk.
+
+Writes only buffer in memory: full chunks are compressed and appended by a
+small thread pool, in order per stream, so a chatty run never compresses or
+touches the disk on the event loop. ``RunLog.backlogged`` tells producers
+to wait for the pool (``wait_backlog``) before buffering more.
+
+Configuration:
+
+- STELLAR_TASK_LOG_DIR: log location (default ``backend/task_logs``)
+- STELLAR_TASK_LOG_LIMIT: bytes kept per stream (default 1 GiB); output
+  beyond it is counted and dropped
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+import shutil
+import struct
+import threading
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_LOG_LIMIT = 1024 * 1024 * 1024
+# Bytes of the start and the end of a stream kept as its preview
+PREVIEW_BYTES = 4096
+INDEX_RECORD = struct.Struct("<QII")
+# Threads compressing and writing chunks, shared by all runs
+IO_WORKERS = 4
+# Raw bytes queued per run before producers are asked to wait
+MAX_BACKLOG = 16 * CHUNK_SIZE
+
+_io_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="logstore")
+    return _io_pool
+
+
+class LogWriter:
+    """Appends one stream's output as compressed chunks and keeps its preview."""
+
+    def __init__(self, path: str, limit: int, preview_bytes: int = PREVIEW_BYTES):
+        self.path = path
+        self.limit = limit
+        self.preview_bytes = preview_bytes
+        self.size = 0
+        self.dropped = 0
+        self._buffer = bytearray()
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._data = None
+        self._index = None
+        self._offset = 0
+        # Full chunks waiting for the pool; drained by at most one pool job at a time
+        self._queue: deque = deque()
+        self._draining = False
+        self._cond = threading.Condition()
+        self.backlog = 0
+
+    def write(self, data: bytes):
+        room = self.limit - self.size
+        if len(data) > room:
+            self.dropped += len(data) - max(room, 0)
+            data = data[:max(room, 0)]
+        if not data:
+            return
+        self.size += len(data)
+        if len(self._head) < self.preview_bytes:
+            self._head += data[:self.preview_bytes - len(self._head)]
+        self._tail += data
+        if len(self._tail) > 2 * self.preview_bytes:
+            del self._tail[:-self.preview_bytes]
+        self._buffer += data
+        while len(self._buffer) >= CHUNK_SIZE:
+            self._enqueue(bytes(self._buffer[:CHUNK_SIZE]))
+            del self._buffer[:CHUNK_SIZE]
+
+    def _enqueue(self, raw: bytes):
+        with self._cond:
+            self._queue.append(raw)
+            self.backlog += len(raw)
+            if self._draining:
+                return
+            self._draining = True
+        _pool().submit(self._drain)
+
+    def _drain(self):
+        while True:
+            with self._cond:
+                if not self._queue:
+                    self._draining = False
+                    return
+                raw = self._queue.popleft()
+            try:
+                self._flush_chunk(raw)
+            except OSError as e:
+                logger.error(f"Failed to write log {self.path}: {e}")
+            with self._cond:
+                self.backlog -= len(raw)
+                self._cond.notify_all()
+
+    def wait(self, backlog: int = 0):
+        """Block until at most ``backlog`` queued bytes are not yet written."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.backlog <= backlog)
+
+    def _flush_chunk(self, raw: bytes):
+        if self._data is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._data = open(self.path + ".log", "ab")
+            self._index = open(self.path + ".idx", "ab")
+            self._offset = self._data.tell()
+        compressed = zlib.compress(raw)
+        self._data.write(compressed)
+        self._data.flush()
+        self._index.write(INDEX_RECORD.pack(self._offset, len(compressed), len(raw)))
+        self._index.flush()
+        self._offset += len(compressed)
+
+    def close(self):
+        """Write the last partial chunk, wait for queued chunks and close the files."""
+        if self._buffer:
+            self._enqueue(bytes(self._buffer))
+            self._buffer.clear()
+        self.wait()
+        for f in (self._data, self._index):
+            if f is not None:
+                f.close()
+        self._data = self._index = None
+
+    def preview(self) -> str:
+        """Head and tail of the stream, with a marker for what lies between."""
+        head_size = len(self._head)
+        if self.size <= head_size:
+            text = self._head.decode("utf-8", errors="replace")
+        elif self.size <= 2 * self.preview_bytes:
+            text = (self._head + self._tail[-(self.size - head_size):]).decode("utf-8", errors="replace")
+        else:
+            omitted = self.size - head_size - self.preview_bytes
+            text = (self._head.decode("utf-8", errors="replace")
+                    + f"\n[... {omitted} bytes omitted, full output in the run log ...]\n"
+                    + self._tail[-self.preview_bytes:].decode("utf-8", errors="replace"))
+        if self.dropped:
+            text += f"\n[log limit reached: {self.dropped} bytes dropped]\n"
+        return text
+
+
+class RunLog:
+    """Writers of every stream of one run, created on first write."""
+
+    def __init__(self, store: "LogStore", run_id: int):
+        self.store = store
+        self.run_id = run_id
+        self._writers: Dict[str, LogWriter] = {}
+
+    def write(self, stream: str, data: bytes, preview_bytes: int = PREVIEW_BYTES):
+        writer = self._writers.get(stream)
+        if writer is None:
+            writer = LogWriter(self.store.path(self.run_id, stream), self.store.limit, preview_bytes)
+            self._writers[stream] = writer
+        writer.write(data)
+
+    def backlogged(self) -> bool:
+        """Whether more than MAX_BACKLOG bytes wait to be written."""
+        return sum(writer.backlog for writer in list(self._writers.values())) > MAX_BACKLOG
+
+    def wait_backlog(self):
+        """Block until the backlog is within MAX_BACKLOG; call from a thread."""
+        for writer in list(self._writers.values()):
+            writer.wait(MAX_BACKLOG // 2)
+
+    def scoped(self, prefix: str, preview_bytes: int = PREVIEW_BYTES) -> "ScopedLog":
+        """View writing streams under ``<prefix>/``, e.g. one target of a fan-out."""
+        return ScopedLog(self, prefix, preview_bytes)
+
+    def preview(self, stream: str) -> str:
+        writer = self._writers.get(stream)
+        return writer.preview() if writer is not None else ""
+
+    def close(self):
+        for writer in self._writers.values():
+            try:
+                writer.close()
+            except OSError as e:
+                logger.error(f"Failed to close log {writer.path}: {e}")
+
+
+class ScopedLog:
+    """Streams of a RunLog under a name prefix."""
+
+    def __init__(self, log: RunLog, prefix: str, preview_bytes: int):
+        self.log = log
+        self.prefix = prefix
+        self.preview_bytes = preview_bytes
+
+    def write(self, stream: str, data: bytes):
+        self.log.write(f"{self.prefix}/{stream}", data, self.preview_bytes)
+
+    def preview(self, stream: str) -> str:
+        return self.log.preview(f"{self.prefix}/{stream}")
+
+    def backlogged(self) -> bool:
+        return self.log.backlogged()
+
+    def wait_backlog(self):
+        self.log.wait_backlog()
+
+
+class LogStore:
+    """Chunked, compressed run logs on disk."""
+
+    def __init__(self, root: Optional[str] = None, limit: Optional[int] = None):
+        self.root = root or os.environ.get(
+            "STELLAR_TASK_LOG_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                 "task_logs")
+        )
+        self.limit = limit or int(os.environ.get("STELLAR_TASK_LOG_LIMIT", DEFAULT_LOG_LIMIT))
+
+    def _run_dir(self, run_id: int) -> str:
+        return os.path.join(self.root, str(run_id // 1000), str(run_id))
+
+    def path(self, run_id: int, stream: str) -> str:
+        """Path of a stream's files, without the .log/.idx suffix."""
+        return os.path.join(self._run_dir(run_id), *stream.split("/"))
+
+    def open(self, run_id: int) -> RunLog:
+        """Writers for a run's output, replacing any earlier log of the same id."""
+        self.delete(run_id)
+        return RunLog(self, run_id)
+
+    def _chunks(self, run_id: int, stream: str) -> Optional[List[Tuple[int, int, int]]]:
+        """Index records of a stream, None if it has no log."""
+        try:
+            with open(self.path(run_id, stream) + ".idx", "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return None
+        # Ignore a record still being written
+        usable = len(raw) - len(raw) % INDEX_RECORD.size
+        return [record for record in INDEX_RECORD.iter_unpack(raw[:usable])]
+
+    def size(self, run_id: int, stream: str) -> Optional[int]:
+        """Bytes stored for a stream, None if it has no log."""
+        chunks = self._chunks(run_id, stream)
+        if chunks is None:
+            return None
+        return sum(raw_length for _, _, raw_length in chunks)
+
+    def read(self, run_id: int, stream: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Raw bytes [start, end) of a stream, one decompressed chunk at a time."""
+        chunks = self._chunks(run_id, stream) or []
+        total = sum(raw_length for _, _, raw_length in chunks)
+        end = total if end is None else min(end, total)
+        if start >= end:
+            return
+        with open(self.path(run_id, stream) + ".log", "rb") as f:
+            for i in range(start // CHUNK_SIZE, (end - 1) // CHUNK_SIZE + 1):
+                offset, length, _ = chunks[i]
+                f.seek(offset)
+                raw = zlib.decompress(f.read(length))
+                chunk_start = i * CHUNK_SIZE
+                yield raw[max(start - chunk_start, 0):end - chunk_start]
+
+    def delete(self, run_id: int):
+        """Remove every log of a run."""
+        shutil.rmtree(self._run_dir(run_id), ignore_errors=True)
+
+
+# Global log store instance
+_log_store = None
+
+
+def get_log_store() -> LogStore:
+    """Get log store instance."""
+    global _log_store
+    if _log_store is None:
+        _log_store = LogStore()
+    return _log_store
@@ -0,0 +1,431 @@
+"""StellarPulse - Alert Notification Dispatcher.
+
+Alert transitions are submitted to a bounded queue and never block the
+caller: when the queue is full the notification is dropped and counted.
+The dispatcher coalesces everything received within a short window into
+one grouped message per channel, and delivers each channel independently
+with bounded retries, so a slow or failing channel does not hold back the
+others.
+
+Channels are pluggable ``ChannelBackend`` instances registered by name
+(the names used in ``AlertRule.channels``). The built-in backends are
+configured from the environment:
+
+- ``dingtalk``: STELLAR_DINGTALK_WEBHOOK, optional STELLAR_DINGTALK_SECRET
+- ``wecom``: STELLAR_WECOM_WEBHOOK
+- ``webhook``: STELLAR_WEBHOOK_URL (plain JSON, e.g. a local stub server)
+- ``email``: STELLAR_SMTP_HOST, STELLAR_SMTP_PORT, STELLAR_SMTP_USER,
+  STELLAR_SMTP_PASSWORD, STELLAR_SMTP_TLS, STELLAR_SMTP_FROM,
+  STELLAR_ALERT_EMAIL_TO (comma separated)
+"""
+
+import asyncio
+import base64
+from datetime import datetime
+from email.message import EmailMessage
+import hashlib
+import hmac
+import logging
+import os
+import smtplib
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import quote_plus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 10  # seconds
+DEFAULT_QUEUE_SIZE = 1000
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1.0  # seconds, doubled per attempt
+MAX_BACKOFF = 30.0
+# Alerts listed in one message before the rest is summarized
+MAX_LISTED = 20
+
+KIND_LABELS = {"firing": "告警", "resolved": "恢复"}
+
+
+class Notification:
+    """One alert transition to deliver."""
+    __slots__ = ("kind", "title", "severity", "target_type", "target_name", "value", "rule_id",
+                 "channels", "at")
+
+    def __init__(self, kind: str, title: str, severity: str, target_type: Optional[str],
+                 target_name: Optional[str], value: Optional[float], rule_id: Optional[int],
+                 channels: List[str], at: Optional[datetime] = None):
+        self.kind = kind  # firing, resolved
+        self.title = title
+        self.severity = severity
+        self.target_type = target_type
+        self.target_name = target_name
+        self.value = value
+        self.rule_id = rule_id
+        self.channels = channels
+        self.at = at or datetime.utcnow()
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "title": self.title,
+            "severity": self.severity,
+            "target_type": self.target_type,
+            "target_name": self.target_name,
+            "value": self.value,
+            "rule_id": self.rule_id,
+            "at": self.at.isoformat(),
+        }
+
+    def line(self) -> str:
+        value = "" if self.value is None else f" = {self.value:g}"
+        return (f"[{KIND_LABELS.get(self.kind, self.kind)}][{self.severity}] {self.title}: "
+                f"{self.target_type} {self.target_name}{value}")
+
+
+def summarize(batch: List[Notification]) -> str:
+    """Heading for a grouped message, e.g. ``3 告警 / 1 恢复``."""
+    counts: Dict[str, int] = {}
+    for item in batch:
+        counts[item.kind] = counts.get(item.kind, 0) + 1
+    return " / ".join(f"{count} {KIND_LABELS.get(kind, kind)}" for kind, count in counts.items())
+
+
+def render_lines(batch: List[Notification]) -> List[str]:
+    """One line per notification, firing first, capped at MAX_LISTED."""
+    ordered = sorted(batch, key=lambda item: (item.kind != "firing", item.at))
+    lines = [item.line() for item in ordered[:MAX_LISTED]]
+    if len(ordered) > MAX_LISTED:
+        lines.append(f"... 另有 {len(ordered) - MAX_LISTED} 条")
+    return lines
+
+
+# ==================== Channel Backends ====================
+
+class ChannelBackend:
+    """Delivers a coalesced batch of notifications to one channel."""
+
+    async def send(self, batch: List[Notification]):
+        """Deliver the batch; raise to have it retried."""
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class WebhookBackend(ChannelBackend):
+    """POSTs a JSON payload through a pooled HTTP client."""
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        self.url = url
+        self.timeout = timeout
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    def build_url(self) -> str:
+        return self.url
+
+    def build_payload(self, batch: List[Notification]) -> dict:
+        return {"summary": summarize(batch), "alerts": [item.to_dict() for item in batch]}
+
+    def check_response(self, response):
+        response.raise_for_status()
+
+    async def send(self, batch: List[Notification]):
+        response = await self._get_client().post(self.build_url(), json=self.build_payload(batch))
+        self.check_response(response)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class DingTalkBackend(WebhookBackend):
+    """DingTalk robot webhook, optionally signed."""
+
+    def __init__(self, url: str, secret: Optional[str] = None, timeout: float = 10.0):
+        super().__init__(url, timeout)
+        self.secret = secret
+
+    def build_url(self) -> str:
+        if not self.secret:
+            return self.url
+        timestamp = str(int(time.time() * 1000))
+        digest = hmac.new(self.secret.encode(), f"{timestamp}\n{self.secret}".encode(), hashlib.sha256).digest()
+        sign = quote_plus(base64.b64encode(digest))
+        separator = "&" if "?" in self.url else "?"
+        return f"{self.url}{separator}timestamp={timestamp}&sign={sign}"
+
+    def build_payload(self, batch: List[Notification]) -> dict:
+        title = f"StellarPulse {summarize(batch)}"
+        text = "\n".join([f"### {title}", ""] + [f"- {line}" for line in render_lines(batch)])
+        return {"msgtype": "markdown", "markdown": {"title": title, "text": text}}
+
+    def check_response(self, response):
+        response.raise_for_status()
+        body = response.json()
+        if body.get("errcode", 0) != 0:
+            raise RuntimeError(f"Webhook error {body.get('errcode')}: {body.get('errmsg')}")
+
+
+class WeComBackend(DingTalkBackend):
+    """WeCom (企业微信) group robot webhook."""
+
+    def build_payload(self, batch: List[Notification]) -> dict:
+        lines = [f"**StellarPulse {summarize(batch)}**"] + [f"> {line}" for line in render_lines(batch)]
+        return {"msgtype": "markdown", "markdown": {"content": "\n".join(lines)}}
+
+
+class EmailBackend(ChannelBackend):
+    """Sends one email per batch over a reused SMTP connection."""
+
+    def __init__(self, host: str, port: int, sender: str, recipients: List[str], user: Optional[str] = None,
+                 password: Optional[str] = None, use_tls: bool = True, timeout: float = 10.0):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._smtp = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            smtp.starttls()
+        if self.user:
+            smtp.login(self.user, self.password or "")
+        return smtp
+
+    def _send_sync(self, message: EmailMessage):
+        with self._lock:
+            if self._smtp is None:
+                self._smtp = self._connect()
+            try:
+                self._smtp.send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                # Pooled connection timed out on the server side; reconnect once
+                self._smtp = self._connect()
+                self._smtp.send_message(message)
+
+    def build_message(self, batch: List[Notification]) -> EmailMessage:
+        message = EmailMessage()
+        message["Subject"] = f"[StellarPulse] {summarize(batch)}"
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.recipients)
+        message.set_content("\n".join(render_lines(batch)))
+        return message
+
+    async def send(self, batch: List[Notification]):
+        try:
+            await asyncio.to_thread(self._send_sync, self.build_message(batch))
+        except Exception:
+            self._drop_connection()
+            raise
+
+    def _drop_connection(self):
+        with self._lock:
+            smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except Exception:
+                pass
+
+    async def close(self):
+        await asyncio.to_thread(self._drop_connection)
+
+
+def default_backends() -> Dict[str, ChannelBackend]:
+    """Backends configured through environment variables."""
+    backends: Dict[str, ChannelBackend] = {}
+    if os.environ.get("STELLAR_DINGTALK_WEBHOOK"):
+        backends["dingtalk"] = DingTalkBackend(os.environ["STELLAR_DINGTALK_WEBHOOK"],
+                                               os.environ.get("STELLAR_DINGTALK_SECRET"))
+    if os.environ.get("STELLAR_WECOM_WEBHOOK"):
+        backends["wecom"] = WeComBackend(os.environ["STELLAR_WECOM_WEBHOOK"])
+    if os.environ.get("STELLAR_WEBHOOK_URL"):
+        backends["webhook"] = WebhookBackend(os.environ["STELLAR_WEBHOOK_URL"])
+    if os.environ.get("STELLAR_SMTP_HOST") and os.environ.get("STELLAR_ALERT_EMAIL_TO"):
+        backends["email"] = EmailBackend(
+            host=os.environ["STELLAR_SMTP_HOST"],
+            port=int(os.environ.get("STELLAR_SMTP_PORT", 587)),
+            sender=os.environ.get("STELLAR_SMTP_FROM") or os.environ.get("STELLAR_SMTP_USER", "stellar-pulse"),
+            recipients=[r.strip() for r in os.environ["STELLAR_ALERT_EMAIL_TO"].split(",") if r.strip()],
+            user=os.environ.get("STELLAR_SMTP_USER"),
+            password=os.environ.get("STELLAR_SMTP_PASSWORD"),
+            use_tls=os.environ.get("STELLAR_SMTP_TLS", "1") != "0",
+        )
+    return backends
+
+
+# ==================== Dispatcher ====================
+
+class NotificationDispatcher:
+    """Bounded, coalescing, per-channel notification delivery."""
+
+    def __init__(self, window: Optional[float] = None, queue_size: Optional[int] = None,
+                 max_retries: int = MAX_RETRIES, backends: Optional[Dict[str, ChannelBackend]] = None):
+        self.window = float(os.environ.get("STELLAR_NOTIFY_WINDOW", DEFAULT_WINDOW)) if window is None else window
+        self.queue_size = queue_size or int(os.environ.get("STELLAR_NOTIFY_QUEUE_SIZE", DEFAULT_QUEUE_SIZE))
+        self.max_retries = max_retries
+        self.backends: Dict[str, ChannelBackend] = dict(backends) if backends is not None else default_backends()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # channel -> notifications waiting for the channel's sender
+        self._pending: Dict[str, List[Notification]] = {}
+        self._senders: Dict[str, asyncio.Task] = {}
+
+        self.counters = {"submitted": 0, "dropped": 0, "sent": 0, "failed": 0, "messages": 0,
+                         "retries": 0, "unroutable": 0}
+
+    def register(self, channel: str, backend: ChannelBackend):
+        """Add or replace the backend of a channel."""
+        self.backends[channel] = backend
+
+    # ==================== Submission ====================
+
+    def submit(self, notification: Notification) -> bool:
+        """Queue a notification from any thread; False if not running or dropped."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return False
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return self._enqueue(notification)
+        loop.call_soon_threadsafe(self._enqueue, notification)
+        return True
+
+    def _enqueue(self, notification: Notification) -> bool:
+        try:
+            self._queue.put_nowait(notification)
+        except asyncio.QueueFull:
+            self.counters["dropped"] += 1
+            return False
+        self.counters["submitted"] += 1
+        return True
+
+    # ==================== Lifecycle ====================
+
+    def start(self):
+        """Start the dispatch loop on the running event loop."""
+        if self._task is not None:
+            return
+        if not self.backends:
+            logger.info("No notification channels configured")
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 5.0):
+        """Stop the loop, give in-flight deliveries a moment and close backends."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        senders = list(self._senders.values())
+        if senders:
+            await asyncio.wait(senders, timeout=timeout)
+            for sender in senders:
+                sender.cancel()
+        self._loop = None
+        for backend in self.backends.values():
+            try:
+                await backend.close()
+            except Exception as e:
+                logger.warning(f"Failed to close notification backend: {e}")
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            # Coalesce whatever else arrives within the window
+            deadline = self._loop.time() + self.window
+            while len(batch) < self.queue_size:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            self._route(batch)
+
+    def _route(self, batch: List[Notification]):
+        for item in batch:
+            for channel in item.channels:
+                if channel not in self.backends:
+                    self.counters["unroutable"] += 1
+                    continue
+                pending = self._pending.setdefault(channel, [])
+                pending.append(item)
+                if len(pending) > self.queue_size:
+                    # Channel is stuck; keep the newest notifications
+                    del pending[0]
+                    self.counters["dropped"] += 1
+        for channel, pending in self._pending.items():
+            if pending and channel not in self._senders:
+                self._senders[channel] = asyncio.create_task(self._drain(channel))
+
+    async def _drain(self, channel: str):
+        """Deliver a channel's pending notifications until none are left."""
+        try:
+            while self._pending.get(channel):
+                batch, self._pending[channel] = self._pending[channel], []
+                await self._deliver(channel, batch)
+        finally:
+            self._senders.pop(channel, None)
+
+    async def _deliver(self, channel: str, batch: List[Notification]):
+        backend = self.backends[channel]
+        for attempt in range(self.max_retries + 1):
+            try:
+                await backend.send(batch)
+                self.counters["sent"] += len(batch)
+                self.counters["messages"] += 1
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Notification to {channel} failed after {attempt + 1} attempts: {e}")
+                    self.counters["failed"] += len(batch)
+                    return
+                self.counters["retries"] += 1
+                await asyncio.sleep(min(RETRY_BACKOFF * 2 ** attempt, MAX_BACKOFF))
+
+    def stats(self) -> dict:
+        """Delivery counters and current backlog."""
+        return {
+            **self.counters,
+            "channels": sorted(self.backends),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "pending": {channel: len(items) for channel, items in self._pending.items() if items},
+        }
+
+
+# Global dispatcher instance
+_notifier = None
+
+
+def get_notifier() -> NotificationDispatcher:
+    """Get notification dispatcher instance."""
+    global _notifier
+    if _notifier is None:
+        _notifier = NotificationDispatcher()
+    return _notifier
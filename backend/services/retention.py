@@ -0,0 +1,272 @@
+"""StellarPulse - Retention and Archival.
+
+Rows of ``alerts`` and ``task_runs`` older than their table's horizon are
+moved out of SQLite into gzip-compressed JSON Lines files, one per table
+and month (``<archive dir>/alerts/2026-09.jsonl.gz``). Rows are moved in
+small chunks: each chunk is appended to its monthly files and then deleted
+in its own short transaction, so writers are never locked out for long.
+
+Run logs of archived ``task_runs`` are deleted with them; the archived rows
+keep the output previews. Task run statistics rollups older than
+STELLAR_TASK_STATS_DAYS are pruned on the same pass.
+
+A chunk is written to the archive before it is deleted, so a crash in
+between can leave a row both archived and live; it is archived again on the
+next run and readers drop the duplicate by id.
+
+Configuration:
+
+- STELLAR_RETENTION_ALERTS_DAYS / STELLAR_RETENTION_TASK_RUNS_DAYS: horizon
+  in days (default 30, 0 keeps rows forever)
+- STELLAR_RETENTION_INTERVAL: seconds between runs (default 3600, 0 disables)
+- STELLAR_ARCHIVE_DIR: archive location (default ``backend/archive``)
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 30
+DEFAULT_INTERVAL = 3600
+CHUNK_SIZE = 500
+# Pause between chunks so other writers can take the database lock
+CHUNK_PAUSE = 0.05
+
+# Table -> statuses that are still live and never archived
+KEEP_STATUSES = {
+    "alerts": ("firing", "acknowledged"),
+    "task_runs": ("pending", "running"),
+}
+
+# Upper bound on rows returned by one archive query
+MAX_QUERY_ROWS = 5000
+
+
+def _model(table: str):
+    from backend import models
+    return {"alerts": models.Alert, "task_runs": models.TaskRun}[table]
+
+
+def _serialize(row) -> dict:
+    data = {}
+    for column in row.__table__.columns:
+        value = getattr(row, column.key)
+        data[column.key] = value.isoformat() if isinstance(value, (datetime, date)) else value
+    return data
+
+
+def naive_utc(value: datetime) -> datetime:
+    """Stored timestamps are naive UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def _next_month(value: datetime) -> datetime:
+    return datetime(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+class RetentionManager:
+    """Moves expired rows into monthly archive files and reads them back."""
+
+    def __init__(self, archive_dir: Optional[str] = None, horizons: Optional[Dict[str, int]] = None,
+                 interval: Optional[float] = None):
+        self.archive_dir = archive_dir or os.environ.get(
+            "STELLAR_ARCHIVE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "archive")
+        )
+        self.horizons = horizons if horizons is not None else {
+            "alerts": int(os.environ.get("STELLAR_RETENTION_ALERTS_DAYS", DEFAULT_RETENTION_DAYS)),
+            "task_runs": int(os.environ.get("STELLAR_RETENTION_TASK_RUNS_DAYS", DEFAULT_RETENTION_DAYS)),
+        }
+        self.interval = float(os.environ.get("STELLAR_RETENTION_INTERVAL", DEFAULT_INTERVAL)) \
+            if interval is None else interval
+        # Serializes archive writers with each other and with readers of the same files
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Optional[dict] = None
+
+    def _path(self, table: str, month: datetime) -> str:
+        return os.path.join(self.archive_dir, table, f"{month:%Y-%m}.jsonl.gz")
+
+    # ==================== Archival ====================
+
+    def run_once(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Archive every table's expired rows; returns rows moved per table."""
+        now = now or datetime.utcnow()
+        moved = {}
+        for table, days in self.horizons.items():
+            if days <= 0:
+                continue
+            try:
+                moved[table] = self.archive_table(table, now - timedelta(days=days))
+            except Exception as e:
+                logger.error(f"Archiving {table} failed: {e}")
+        pruned = None
+        try:
+            from backend.core.scheduler.stats import prune
+            pruned = prune(now)
+        except Exception as e:
+            logger.error(f"Pruning task run rollups failed: {e}")
+        self.last_run = {"at": now.isoformat(), "moved": moved, "rollups_pruned": pruned}
+        return moved
+
+    def archive_table(self, table: str, cutoff: datetime) -> int:
+        """Move rows created before cutoff, one chunk at a time."""
+        from backend.database import SessionLocal
+
+        model = _model(table)
+        moved = 0
+        while True:
+            db = SessionLocal()
+            try:
+                rows = db.query(model).filter(
+                    model.created_at < cutoff,
+                    model.status.notin_(KEEP_STATUSES[table]),
+                ).order_by(model.id).limit(CHUNK_SIZE).all()
+                if not rows:
+                    break
+                by_month: Dict[datetime, List[dict]] = {}
+                for row in rows:
+                    by_month.setdefault(_month_start(row.created_at), []).append(_serialize(row))
+                with self._lock:
+                    for month, records in by_month.items():
+                        self._append(table, month, records)
+                ids = [row.id for row in rows]
+                db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+                db.commit()
+                moved += len(rows)
+                if table == "task_runs":
+                    # Archived runs keep their output previews only
+                    from backend.services.logstore import get_log_store
+                    for run_id in ids:
+                        get_log_store().delete(run_id)
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+            if len(rows) < CHUNK_SIZE:
+                break
+            time.sleep(CHUNK_PAUSE)
+        if moved:
+            logger.info(f"Archived {moved} {table} rows created before {cutoff.isoformat()}")
+        return moved
+
+    def _append(self, table: str, month: datetime, records: List[dict]):
+        path = self._path(table, month)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Every append adds a gzip member; readers see the concatenation
+        with gzip.open(path, "at", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    # ==================== Queries ====================
+
+    def partitions(self) -> List[dict]:
+        """Archive files per table with their month and size."""
+        result = []
+        for table in KEEP_STATUSES:
+            directory = os.path.join(self.archive_dir, table)
+            if not os.path.isdir(directory):
+                continue
+            for filename in sorted(os.listdir(directory)):
+                if filename.endswith(".jsonl.gz"):
+                    result.append({
+                        "table": table,
+                        "month": filename[:-len(".jsonl.gz")],
+                        "bytes": os.path.getsize(os.path.join(directory, filename)),
+                    })
+        return result
+
+    def _read(self, table: str, month: datetime) -> Iterator[dict]:
+        path = self._path(table, month)
+        if not os.path.exists(path):
+            return
+        with self._lock:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                try:
+                    for line in f:
+                        if line.strip():
+                            yield json.loads(line)
+                except (EOFError, json.JSONDecodeError):
+                    # Torn final member from an interrupted append
+                    logger.warning(f"Archive {path} ends with an incomplete record")
+
+    def query(self, table: str, since: datetime, until: datetime, filters: Optional[Dict[str, object]] = None,
+              limit: int = 1000) -> dict:
+        """Archived rows with since <= created_at < until, in archive (id) order."""
+        filters = {key: value for key, value in (filters or {}).items() if value is not None}
+        since, until = naive_utc(since), naive_utc(until)
+        since_key, until_key = since.isoformat(), until.isoformat()
+        rows: List[dict] = []
+        seen = set()
+
+        month = _month_start(since)
+        while month < until and len(rows) <= limit:
+            for record in self._read(table, month):
+                created = record.get("created_at") or ""
+                if not since_key <= created < until_key or record["id"] in seen:
+                    continue
+                if any(record.get(key) != value for key, value in filters.items()):
+                    continue
+                seen.add(record["id"])
+                rows.append(record)
+                if len(rows) > limit:
+                    break
+            month = _next_month(month)
+        return {"rows": rows[:limit], "truncated": len(rows) > limit}
+
+    # ==================== Background Loop ====================
+
+    def start(self):
+        """Start the periodic retention loop (disabled when interval <= 0)."""
+        if self.interval <= 0:
+            logger.info("Retention disabled")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        """Stop the retention loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.error(f"Retention run failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+# Global retention manager instance
+_retention = None
+
+
+def get_retention() -> RetentionManager:
+    """Get retention manager instance."""
+    global _retention
+    if _retention is None:
+        _retention = RetentionManager()
+    return _retention
@@ -0,0 +1,19 @@
+"""Tests for alert target pattern matching."""
+
+from backend.core.alerting.matcher import PatternMatcher
+
+
+def test_regex_with_named_group():
+    matcher = PatternMatcher({"re:(?P<env>prod)/.*": "named", "default/api-?": "glob", "kube-*": "prefix"})
+
+    assert matcher.match("prod/api") == ("named",)
+    assert matcher.match("default/api-1") == ("glob",)
+    assert matcher.match("kube-system") == ("prefix",)
+    assert matcher.match("staging/api") == ()
+
+
+def test_regex_reusing_group_name():
+    matcher = PatternMatcher({"re:(?P<env>prod)/.*": "prod", "re:(?P<env>dev)/.*": "dev"})
+
+    assert matcher.match("prod/db") == ("prod",)
+    assert matcher.match("dev/db") == ("dev",)